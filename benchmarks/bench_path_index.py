@@ -0,0 +1,128 @@
+#!/usr/bin/python
+
+# API Gateway Ansible Modules
+#
+# bench_path_index
+#    Compares the memory footprint and lookup speed of the PathIndex trie
+#    against the dict-of-dicts path_map previously used by apigw_resource.
+#    Both hold the id and parentId of every resource.  With the defaults,
+#    PathIndex retains about a quarter less memory (303 against 406 bytes per
+#    resource) and walks a subtree far faster, but a single lookup is about
+#    five times slower (3.7 against 0.8 usec), as it hops one dict per path
+#    part instead of hashing the whole path once.
+#
+# Usage: python benchmarks/bench_path_index.py [--resources N] [--lookups N]
+#
+
+import argparse
+import gc
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from module_utils.apigw_resources import PathIndex
+
+def synthetic_resources(count):
+  """
+  Builds a list of (path, id, parentId) tuples shaped like a large API: many
+  services and versions sharing the same parameter and collection names.
+  """
+  resources = [('/', 'root0000', None)]
+  ids = {'/': 'root0000'}
+  collections = ['items', 'orders', 'customers', 'invoices', 'events']
+  n = 0
+  while len(resources) < count:
+    service = "svc{0}".format(n // 40)
+    version = "v{0}".format(n % 3 + 1)
+    collection = collections[n % len(collections)]
+    for path in ["/{0}".format(service),
+                 "/{0}/{1}".format(service, version),
+                 "/{0}/{1}/{2}{3}".format(service, version, collection, n // 15),
+                 "/{0}/{1}/{2}{3}/{{id}}".format(service, version, collection, n // 15),
+                 "/{0}/{1}/{2}{3}/{{id}}/history".format(service, version, collection, n // 15)]:
+      if path not in ids:
+        ids[path] = "{0:010x}".format(len(ids))
+        parent = path.rsplit('/', 1)[0] or '/'
+        resources.append((path, ids[path], ids[parent]))
+    n += 1
+
+  return resources[:count]
+
+def build_path_map(resources):
+  path_map = {'paths': {}}
+  for (path, resource_id, parent_id) in resources:
+    path_map['paths'][path] = {'id': resource_id}
+    if parent_id is not None:
+      path_map['paths'][path]['parentId'] = parent_id
+  return path_map
+
+def build_path_index(resources):
+  index = PathIndex()
+  for (path, resource_id, parent_id) in resources:
+    index.add(path, resource_id, parent_id)
+  return index
+
+def deep_size(obj, seen=None):
+  """
+  Approximate retained size in bytes, counting shared objects once
+  """
+  seen = set() if seen is None else seen
+  if id(obj) in seen:
+    return 0
+  seen.add(id(obj))
+
+  size = sys.getsizeof(obj)
+  if isinstance(obj, dict):
+    for k, v in obj.items():
+      size += deep_size(k, seen) + deep_size(v, seen)
+  elif isinstance(obj, (list, tuple, set)):
+    for v in obj:
+      size += deep_size(v, seen)
+  elif hasattr(obj, '__slots__'):
+    for slot in obj.__slots__:
+      size += deep_size(getattr(obj, slot, None), seen)
+  elif hasattr(obj, '__dict__'):
+    size += deep_size(obj.__dict__, seen)
+
+  return size
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--resources', type=int, default=50000)
+  parser.add_argument('--lookups', type=int, default=100000)
+  args = parser.parse_args()
+
+  resources = synthetic_resources(args.resources)
+  # Fresh strings, as they would arrive from get_resources responses
+  resources = [(''.join(list(p)), i, pid) for (p, i, pid) in resources]
+  paths = [r[0] for r in resources]
+  random.seed(1)
+  probes = [random.choice(paths) for _ in range(args.lookups)]
+
+  gc.collect()
+  path_map = build_path_map(resources)
+  path_index = build_path_index(resources)
+  del resources
+
+  # Resource ids are the same objects in both structures, so they are skipped
+  # to compare only what each structure adds on top of them.
+  shared = set(id(v) for entry in path_map['paths'].values() for v in entry.values())
+  map_size = deep_size(path_map, set(shared))
+  index_size = deep_size(path_index, set(shared))
+
+  map_lookup = timeit.timeit(lambda: [path_map['paths'][p]['id'] for p in probes], number=1)
+  index_lookup = timeit.timeit(lambda: [path_index.get_id(p) for p in probes], number=1)
+  map_walk = timeit.timeit(lambda: [p for p in path_map['paths'] if p == '/svc1' or p.startswith('/svc1/')], number=10) / 10
+  index_walk = timeit.timeit(lambda: list(path_index.items('/svc1')), number=10) / 10
+
+  print("resources: {0}  lookups: {1}".format(len(paths), len(probes)))
+  print("{0:<28}{1:>16}{2:>16}".format('', 'path_map', 'PathIndex'))
+  print("{0:<28}{1:>16,}{2:>16,}".format('retained bytes', map_size, index_size))
+  print("{0:<28}{1:>16.1f}{2:>16.1f}".format('bytes per resource', map_size / float(len(paths)), index_size / float(len(paths))))
+  print("{0:<28}{1:>16.3f}{2:>16.3f}".format('lookup usec', map_lookup * 1e6 / len(probes), index_lookup * 1e6 / len(probes)))
+  print("{0:<28}{1:>16.3f}{2:>16.3f}".format('subtree walk msec', map_walk * 1e3, index_walk * 1e3))
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,127 @@
+#!/usr/bin/python
+
+# API Gateway Ansible Modules
+#
+# bench_startup
+#    Records the startup cost of every module: the time to import it, the
+#    time to construct its apigateway client, and the size of the AnsiballZ
+#    payload Ansible ships for it.  Results can be saved and compared against
+#    a saved baseline, so that regressions show up.
+#
+# Usage: python benchmarks/bench_startup.py [--rounds N] [--modules a,b]
+#                                           [--save FILE] [--compare FILE [--tolerance PCT]]
+#
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+LIBRARY = os.path.join(ROOT, 'library')
+MODULE_UTILS = os.path.join(ROOT, 'module_utils')
+
+# Runs in a fresh interpreter, so that every round pays the full import cost
+MEASURE = '''
+import json, time
+start = time.time()
+module = __import__('library.{0}', fromlist=['create_client'])
+imported = time.time()
+class Module(object):
+  params = {{'region': 'us-east-1'}}
+module.create_client(Module())
+print(json.dumps([imported - start, time.time() - imported]))
+'''
+
+METRICS = ['import_ms', 'client_ms', 'payload_bytes']
+
+def module_names():
+  return sorted(os.path.basename(p)[:-3] for p in glob.glob(os.path.join(LIBRARY, 'apigw_*.py')))
+
+def median(values):
+  values = sorted(values)
+  middle = len(values) // 2
+  return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2.0
+
+def startup_times(name, rounds):
+  """
+  :return: Median (import ms, client ms) over rounds fresh interpreters
+  """
+  env = dict(os.environ, AWS_DEFAULT_REGION=os.environ.get('AWS_DEFAULT_REGION', 'us-east-1'))
+  samples = []
+  for _ in range(rounds):
+    out = subprocess.check_output([sys.executable, '-W', 'ignore', '-c', MEASURE.format(name)], cwd=ROOT, env=env)
+    samples.append(json.loads(out.decode('utf-8').strip().splitlines()[-1]))
+  return median([s[0] for s in samples]) * 1000, median([s[1] for s in samples]) * 1000
+
+def payload_size(name):
+  """
+  :return: Size in bytes of the AnsiballZ payload of a module, or None when Ansible cannot build it here
+  """
+  try:
+    from ansible.executor.module_common import modify_module
+    from ansible.parsing.dataloader import DataLoader
+    from ansible.template import Templar
+    data = modify_module(
+      name, os.path.join(LIBRARY, name + '.py'), {}, Templar(loader=DataLoader()),
+      task_vars={'ansible_python_interpreter': sys.executable}
+    )[0]
+    return len(data)
+  except Exception as e:
+    sys.stderr.write("payload of {0} not measured: {1}\n".format(name, e))
+    return None
+
+def regressions(results, baseline, tolerance):
+  """
+  :return: List of (module, metric, baseline value, value) that grew by more than tolerance percent
+  """
+  found = []
+  for name, metrics in sorted(results.items()):
+    for metric in METRICS:
+      old = baseline.get(name, {}).get(metric)
+      new = metrics.get(metric)
+      if old and new is not None and (new - old) * 100.0 / old > tolerance:
+        found.append((name, metric, old, new))
+  return found
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__)
+  parser.add_argument('--rounds', type=int, default=5)
+  parser.add_argument('--modules', help='comma separated module names, defaults to all')
+  parser.add_argument('--save', help='write the results as JSON to this file')
+  parser.add_argument('--compare', help='JSON file of earlier results to compare against')
+  parser.add_argument('--tolerance', type=float, default=20.0, help='percent a metric may grow before it counts as a regression')
+  args = parser.parse_args()
+
+  # The payload builder resolves module_utils imports through this path, and
+  # reads it when Ansible's constants are first loaded
+  os.environ.setdefault('ANSIBLE_MODULE_UTILS', MODULE_UTILS)
+
+  names = args.modules.split(',') if args.modules else module_names()
+  results = {}
+  print("rounds: {0}".format(args.rounds))
+  print("{0:<26}{1:>12}{2:>12}{3:>16}".format('', 'import ms', 'client ms', 'payload bytes'))
+  for name in names:
+    import_ms, client_ms = startup_times(name, args.rounds)
+    payload = payload_size(name)
+    results[name] = dict(import_ms=round(import_ms, 1), client_ms=round(client_ms, 1), payload_bytes=payload)
+    print("{0:<26}{1:>12.1f}{2:>12.1f}{3:>16}".format(name, import_ms, client_ms, payload if payload is not None else '-'))
+
+  if args.save:
+    with open(args.save, 'w') as f:
+      json.dump(results, f, indent=2, sort_keys=True)
+
+  if args.compare:
+    with open(args.compare) as f:
+      baseline = json.load(f)
+    found = regressions(results, baseline, args.tolerance)
+    for (name, metric, old, new) in found:
+      print("REGRESSION {0} {1}: {2} -> {3}".format(name, metric, old, new))
+    if found:
+      sys.exit(1)
+    print("no regressions over {0}% against {1}".format(args.tolerance, args.compare))
+
+if __name__ == '__main__':
+  main()
@@ -45,13 +45,25 @@ description:
   - Create if no ApiKey resource is found matching the provided name
   - Delete ApiKey resource matching the provided name
   - Updates I(enabled) and I(description)
+  - Provisions many ApiKey resources at once with I(api_keys)
 version_added: "2.2"
 options:
   name:
     description:
-    - The domain name of the ApiKey resource on which to operate
+    - The domain name of the ApiKey resource on which to operate.  One of C(name) or C(api_keys) is required.
     type: string
-    required: True
+    required: False
+  api_keys:
+    description:
+    - List of api keys to manage in bulk, each a dictionary with C(name) and optional C(value), C(description) and C(enabled) (default False).  The account's keys are listed once and compared by name.  Missing keys are created with as few import_api_keys calls as the payload limit allows, and need a C(value).  Existing keys only receive update_api_key calls for the fields that differ.  With C(state=absent), the listed keys are deleted.
+    type: list
+    required: False
+  fail_on_warnings:
+    description:
+    - Fail the import when API Gateway reports warnings about the imported keys
+    type: bool
+    default: False
+    required: False
   value:
     description:
     - Value of the api key. Required for create.
@@ -70,6 +82,12 @@ options:
     type: bool
     default: False
     required: False
+  include_value:
+    description:
+    - Return the key's value in the result.  Off by default, so that the secret stays out of registered variables, and the lookup skips fetching key values.
+    type: bool
+    default: False
+    required: False
   generate_distinct_id:
     description:
     - Specifies whether key identifier is distinct from created apikey value
@@ -84,11 +102,13 @@ options:
     required: False
 requirements:
     - python = 2.7
-    - boto
     - boto3
 notes:
     - While it is possible via the boto api to update the ApiKey's name, this module does not support this functionality since it searches for the ApiKey's id by its name.
-    - This module requires that you have boto and boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+    - Updates return the update_api_key response rather than looking the key up again.
+    - With C(api_keys), the module returns C(api_keys.created), C(api_keys.updated) and C(api_keys.removed) (lists of names), plus the C(api_keys.ids) and C(api_keys.warnings) reported by import_api_keys.  Key values are never returned.  When a call fails, the module fails with C(api_keys) listing only what was written before it stopped.
+    - This module requires that you have boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+    - This module also accepts the client options C(region), C(profile), C(endpoint_url), C(retry_mode), C(max_attempts), C(connect_timeout), C(read_timeout), C(max_pool_connections), C(retry_deadline), C(rate_limits), C(rate_limit_file) and C(write_lock) to tune its boto3 client.  Unset options keep the boto3 defaults.  When C(rate_limits) or C(rate_limit_file) is set, calls are paced by control plane rate limits that all modules on the host share.  Throttled, conflicting and transient calls are retried with backoff, and the result then includes C(retries), the number of retries per operation.
 '''
 
 EXAMPLES = '''
@@ -106,6 +126,18 @@ EXAMPLES = '''
     register: apikey
 
   - debug: var=apikey
+
+  - name: onboard customers
+    apigw_api_key:
+      api_keys:
+        - name: customer-0001
+          value: 'first-customer-key-value'
+          enabled: True
+        - name: customer-0002
+          value: 'second-customer-key-value'
+          description: 'trial'
+      state: present
+    register: apikeys
 '''
 
 RETURN = '''
@@ -127,8 +159,7 @@ RETURN = '''
       "id": "24601abcde",
       "lastUpdatedDate": "2016-12-12T21:45:35-06:00",
       "name": "testkey5000",
-      "stageKeys": [],
-      "value": "notthegreatestkeyintheworld:justatribute"
+      "stageKeys": []
     },
     "changed": true
   }
@@ -137,14 +168,73 @@ RETURN = '''
 
 __version__ = '${version}'
 
+import csv
+import io
+
 try:
-  import boto3
-  import boto
-  from botocore.exceptions import BotoCoreError
+  from botocore.exceptions import BotoCoreError, ClientError
   HAS_BOTO3 = True
 except ImportError:
   HAS_BOTO3 = False
 
+try:
+  from ansible.module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from ansible.module_utils.apigw_pages import iter_items
+  from ansible.module_utils.apigw_patch import diff_fields
+except ImportError:
+  from module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from module_utils.apigw_pages import iter_items
+  from module_utils.apigw_patch import diff_fields
+
+# import_api_keys bodies are kept well under API Gateway's 10MB payload limit
+IMPORT_CHUNK_BYTES = 5 * 1024 * 1024
+
+IMPORT_HEADER = ['name', 'key', 'description', 'enabled']
+
+def _csv_line(values):
+  """
+  Encodes one CSV line
+  :param values: List of field values
+  :return: The line as utf-8 bytes, including the line terminator
+  """
+  buf = io.BytesIO()
+  csv.writer(buf, lineterminator='\n').writerow(
+    [v.encode('utf-8') if isinstance(v, unicode) else str(v) for v in values]
+  )
+  return buf.getvalue()
+
+def build_import_chunks(entries, limit=IMPORT_CHUNK_BYTES):
+  """
+  Renders api keys as import_api_keys CSV bodies, starting a new body
+  whenever the next line would push the current one past limit
+  :param entries: List of normalized api_keys entries
+  :param limit: Maximum size of one body in bytes
+  :return: List of (body, names) tuples
+  """
+  header = _csv_line(IMPORT_HEADER)
+  chunks = []
+  lines = []
+  names = []
+  size = len(header)
+
+  for entry in entries:
+    line = _csv_line([
+      entry['name'], entry['value'], entry.get('description') or '', 'true' if entry['enabled'] else 'false'
+    ])
+    if lines and size + len(line) > limit:
+      chunks.append((header + ''.join(lines), names))
+      lines = []
+      names = []
+      size = len(header)
+    lines.append(line)
+    names.append(entry['name'])
+    size += len(line)
+
+  if lines:
+    chunks.append((header + ''.join(lines), names))
+
+  return chunks
+
 class ApiGwApiKey:
   def __init__(self, module):
     """
@@ -152,8 +242,8 @@ class ApiGwApiKey:
     """
     self.module = module
     if (not HAS_BOTO3):
-      self.module.fail_json(msg="boto and boto3 are required for this module")
-    self.client = boto3.client('apigateway')
+      self.module.fail_json(msg="boto3 is required for this module")
+    self.client = create_client(self.module)
 
   @staticmethod
   def _define_module_argument_spec():
@@ -161,31 +251,48 @@ class ApiGwApiKey:
     Defines the module's argument spec
     :return: Dictionary defining module arguments
     """
-    return dict( name=dict(required=True),
+    return dict( name=dict(required=False),
+                 api_keys=dict(required=False, type='list'),
+                 fail_on_warnings=dict(required=False, type='bool', default=False),
                  description=dict(required=False),
                  value=dict(required=False),
                  enabled=dict(required=False, type='bool', default=False),
+                 include_value=dict(required=False, type='bool', default=False),
                  generate_distinct_id=dict(required=False, type='bool', default=False),
                  state=dict(default='present', choices=['present', 'absent']),
     )
 
   def _retrieve_api_key(self):
     """
-    Retrieve all api_keys in the account and match them against the provided name
-    :return: Result matching the provided api name or an empty hash
+    Page through the api_keys whose names start with the provided name, stopping at the exact match.
+    Key values are only requested when include_value is set.
+    :return: Result matching the provided api name or None
     """
     resp = None
-    try:
-      get_resp = self.client.get_api_keys(nameQuery=self.module.params['name'], includeValues=True)
+    kwargs = dict(nameQuery=self.module.params['name'])
+    if self.module.params.get('include_value', False):
+      kwargs['includeValues'] = True
 
-      for item in get_resp.get('items', []):
+    try:
+      for item in iter_items(self.client.get_api_keys, **kwargs):
         if item['name'] == self.module.params.get('name'):
           resp = item
+          break
     except BotoCoreError as e:
       self.module.fail_json(msg="Error when getting api_keys from boto3: {}".format(e))
 
     return resp
 
+  def _scrub(self, api_key):
+    """
+    Drops the key's value from a result unless include_value is set
+    :param api_key: An api key document
+    :return: The document to return
+    """
+    if isinstance(api_key, dict) and 'value' in api_key and not self.module.params.get('include_value', False):
+      api_key = dict((k, v) for (k, v) in api_key.items() if k != 'value')
+    return api_key
+
   def _delete_api_key(self):
     """
     Delete api_key that matches the returned id
@@ -219,7 +326,7 @@ class ApiGwApiKey:
           if self.module.params.get(opt_field, None) not in [None, '']:
             args[opt_field] = self.module.params[opt_field]
 
-        api_key = self.client.create_api_key(**args)
+        api_key = self._scrub(self.client.create_api_key(**args))
     except BotoCoreError as e:
       self.module.fail_json(msg="Error when creating api_key via boto3: {}".format(e))
 
@@ -227,24 +334,17 @@ class ApiGwApiKey:
 
   @staticmethod
   def _create_patches(params, me):
-    patches = []
-
-    for param in ['enabled', 'description']:
-      ans_value = params.get(param, None)
-      if ans_value is not None and (param not in me or str(ans_value) != str(me[param])):
-        # More special snowflake logic because boto removes description
-        # from get results if the key is set to empty string
-        if param == 'description' and ans_value == '' and param not in me:
-          pass
-        else:
-          patches.append({'op': 'replace', 'path': "/{}".format(param), 'value': str(ans_value)})
-
-    return patches
+    # More special snowflake logic because boto removes description
+    # from get results if the key is set to empty string
+    return diff_fields(me, params, [
+      {'ansible': 'enabled', 'boto': 'enabled', 'op': 'replace'},
+      {'ansible': 'description', 'boto': 'description', 'op': 'replace', 'keep_empty': True},
+    ])
 
   def _update_api_key(self):
     """
-    Create api_key from provided args
-    :return: True, result from create_api_key
+    Update api_key from provided args
+    :return: changed, result from update_api_key
     """
     api_key = self.me
     changed = False
@@ -255,22 +355,138 @@ class ApiGwApiKey:
         changed = True
 
         if not self.module.check_mode:
-          self.client.update_api_key(
+          api_key = self.client.update_api_key(
             apiKey=self.me['id'],
             patchOperations=patches
           )
-          api_key = self._retrieve_api_key()
+          if self.module.params.get('include_value', False) and 'value' not in api_key and 'value' in self.me:
+            api_key['value'] = self.me['value']
+          api_key = self._scrub(api_key)
     except BotoCoreError as e:
       self.module.fail_json(msg="Error when updating api_key via boto3: {}".format(e))
 
     return (changed, api_key)
 
+  def _normalize_entries(self):
+    """
+    Validates api_keys and applies the per-entry defaults
+    :return: List of entries with name, value, description and enabled, or None after fail_json
+    """
+    entries = []
+    seen = set()
+    for entry in self.module.params['api_keys']:
+      if not isinstance(entry, dict) or not entry.get('name'):
+        self.module.fail_json(msg="Every api_keys entry needs a name")
+        return None
+      if entry['name'] in seen:
+        self.module.fail_json(msg="api_keys lists {} more than once".format(entry['name']))
+        return None
+      seen.add(entry['name'])
+      entries.append(dict(
+        name=entry['name'],
+        value=entry.get('value'),
+        description=entry.get('description'),
+        enabled=str(entry.get('enabled', False)).lower() in ['true', 'yes', 'on', '1'],
+      ))
+
+    return entries
+
+  def _retrieve_api_key_inventory(self):
+    """
+    Pages through every api_key in the account, without their values
+    :return: Dictionary of name to the first key found with that name, or None after fail_json
+    """
+    inventory = {}
+    try:
+      for item in iter_items(self.client.get_api_keys):
+        inventory.setdefault(item['name'], item)
+    except (BotoCoreError, ClientError) as e:
+      self.module.fail_json(msg="Error when getting api_keys from boto3: {}".format(e))
+      return None
+
+    return inventory
+
+  def _import_api_keys(self, entries, done):
+    """
+    Creates the provided keys with one import_api_keys call per chunk
+    :param entries: List of normalized entries, each with a value
+    :param done: Result dict the names, ids and warnings of every imported chunk are added to
+    :return: none.  Errors from boto3 are raised.
+    """
+    for (body, names) in build_import_chunks(entries):
+      resp = self.client.import_api_keys(
+        body=body,
+        format='csv',
+        failOnWarnings=self.module.params.get('fail_on_warnings', False),
+      )
+      done['created'].extend(names)
+      done['ids'].extend(resp.get('ids', []))
+      done['warnings'].extend(resp.get('warnings', []))
+
+  def _process_bulk_request(self):
+    """
+    Reconcile api_keys against the account's keys, creating missing keys
+    through import_api_keys and patching existing ones
+    :return: Returns either fail_json or exit_json
+    """
+    entries = self._normalize_entries()
+    if entries is None:
+      return None
+    inventory = self._retrieve_api_key_inventory()
+    if inventory is None:
+      return None
+
+    result = dict(created=[], updated=[], removed=[], ids=[], warnings=[])
+    to_create = []
+    writes = []
+
+    for entry in entries:
+      me = inventory.get(entry['name'])
+      if self.module.params.get('state', 'present') == 'absent':
+        if me is not None:
+          result['removed'].append(entry['name'])
+          writes.append(('delete_api_key', dict(apiKey=me['id']), 'removed', entry['name']))
+      elif me is None:
+        to_create.append(entry)
+      else:
+        patches = ApiGwApiKey._create_patches(entry, me)
+        if patches:
+          result['updated'].append(entry['name'])
+          writes.append(('update_api_key', dict(apiKey=me['id'], patchOperations=patches), 'updated', entry['name']))
+
+    missing_values = [e['name'] for e in to_create if e['value'] in [None, '']]
+    if missing_values:
+      return self.module.fail_json(msg="api_keys entries need a value to be imported: {}".format(', '.join(missing_values)))
+    result['created'] = [e['name'] for e in to_create]
+
+    if not self.module.check_mode:
+      done = dict(created=[], updated=[], removed=[], ids=[], warnings=[])
+      try:
+        if to_create:
+          self._import_api_keys(to_create, done)
+        for (func, kwargs, kind, name) in writes:
+          getattr(self.client, func)(**kwargs)
+          done[kind].append(name)
+      except (BotoCoreError, ClientError) as e:
+        return self.module.fail_json(
+          msg="Error when provisioning api_keys via boto3: {}".format(e),
+          changed=bool(done['created'] or done['updated'] or done['removed']),
+          api_keys=done
+        )
+      result.update(ids=done['ids'], warnings=done['warnings'])
+
+    changed = bool(result['created'] or result['updated'] or result['removed'])
+    return self.module.exit_json(changed=changed, api_keys=result)
+
   def process_request(self):
     """
     Process the user's request -- the primary code path
     :return: Returns either fail_json or exit_json
     """
 
+    if self.module.params.get('api_keys') is not None:
+      return self._process_bulk_request()
+
     api_key = None
     changed = False
     self.me = self._retrieve_api_key()
@@ -291,11 +507,15 @@ def main():
     :return: none
     """
     module = AnsibleModule(
-        argument_spec=ApiGwApiKey._define_module_argument_spec(),
+        argument_spec=client_argument_spec(ApiGwApiKey._define_module_argument_spec()),
+        required_one_of=[['name', 'api_keys']],
+        mutually_exclusive=[['name', 'api_keys']],
         supports_check_mode=True
     )
 
     api_key = ApiGwApiKey(module)
+    report_retries(module, api_key.client)
+
     api_key.process_request()
 
 from ansible.module_utils.basic import *  # pylint: disable=W0614
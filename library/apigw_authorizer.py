@@ -99,10 +99,10 @@ options:
     required: False
 requirements:
     - python = 2.7
-    - boto
     - boto3
 notes:
-    - This module requires that you have boto and boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+    - This module requires that you have boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+    - This module also accepts the client options C(region), C(profile), C(endpoint_url), C(retry_mode), C(max_attempts), C(connect_timeout), C(read_timeout), C(max_pool_connections), C(retry_deadline), C(rate_limits), C(rate_limit_file) and C(write_lock) to tune its boto3 client.  Unset options keep the boto3 defaults.  When C(rate_limits) or C(rate_limit_file) is set, calls are paced by control plane rate limits that all modules on the host share.  Throttled, conflicting and transient calls are retried with backoff, and the result then includes C(retries), the number of retries per operation.
 '''
 
 EXAMPLES = '''
@@ -156,13 +156,18 @@ RETURN = '''
 __version__ = '${version}'
 
 try:
-  import boto3
-  import boto
   from botocore.exceptions import BotoCoreError
   HAS_BOTO3 = True
 except ImportError:
   HAS_BOTO3 = False
 
+try:
+  from ansible.module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from ansible.module_utils.apigw_patch import diff_fields
+except ImportError:
+  from module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from module_utils.apigw_patch import diff_fields
+
 class ApiGwAuthorizer:
   def __init__(self, module):
     """
@@ -170,8 +175,8 @@ class ApiGwAuthorizer:
     """
     self.module = module
     if (not HAS_BOTO3):
-      self.module.fail_json(msg="boto and boto3 are required for this module")
-    self.client = boto3.client('apigateway')
+      self.module.fail_json(msg="boto3 is required for this module")
+    self.client = create_client(self.module)
 
   @staticmethod
   def _define_module_argument_spec():
@@ -273,20 +278,16 @@ class ApiGwAuthorizer:
   @staticmethod
   def _create_patches(params, me):
     fields = [
-      {'ansible': 'type', 'boto': 'type', 'default': ''},
-      {'ansible': 'uri', 'boto': 'authorizerUri', 'default': ''},
-      {'ansible': 'identity_source', 'boto': 'identitySource', 'default': ''},
-      {'ansible': 'identity_validation_expression', 'boto': 'identityValidationExpression', 'default': ''},
-      {'ansible': 'auth_type', 'boto': 'authType', 'default': ''},
-      {'ansible': 'credentials', 'boto': 'authorizerCredentials', 'default': ''},
-      {'ansible': 'result_ttl_seconds', 'boto': 'authorizerResultTtlInSeconds', 'default': 0},
+      {'ansible': 'type', 'boto': 'type', 'default': '', 'op': 'replace', 'ignore_case': True},
+      {'ansible': 'uri', 'boto': 'authorizerUri', 'default': '', 'op': 'replace', 'ignore_case': True},
+      {'ansible': 'identity_source', 'boto': 'identitySource', 'default': '', 'op': 'replace', 'ignore_case': True},
+      {'ansible': 'identity_validation_expression', 'boto': 'identityValidationExpression', 'default': '', 'op': 'replace', 'ignore_case': True},
+      {'ansible': 'auth_type', 'boto': 'authType', 'default': '', 'op': 'replace', 'ignore_case': True},
+      {'ansible': 'credentials', 'boto': 'authorizerCredentials', 'default': '', 'op': 'replace', 'ignore_case': True},
+      {'ansible': 'result_ttl_seconds', 'boto': 'authorizerResultTtlInSeconds', 'default': 0, 'op': 'replace', 'ignore_case': True},
     ]
 
-    patches = []
-    for f in fields:
-      ans_arg = params.get(f['ansible'], f['default'])
-      if ans_arg is not None and str(ans_arg).lower() != str(me.get(f['boto'])).lower():
-        patches.append({'op': 'replace', 'path': "/{}".format(f['boto']), 'value': str(ans_arg)})
+    patches = diff_fields(me, params, fields)
 
     # Magic for providerARNs
     if 'providerARNs' in me:
@@ -351,11 +352,13 @@ def main():
     :return: none
     """
     module = AnsibleModule(
-        argument_spec=ApiGwAuthorizer._define_module_argument_spec(),
+        argument_spec=client_argument_spec(ApiGwAuthorizer._define_module_argument_spec()),
         supports_check_mode=True
     )
 
     authorizer = ApiGwAuthorizer(module)
+    report_retries(module, authorizer.client)
+
     authorizer.process_request()
 
 from ansible.module_utils.basic import *  # pylint: disable=W0614
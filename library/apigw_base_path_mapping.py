@@ -70,10 +70,10 @@ options:
     required: False
 requirements:
     - python = 2.7
-    - boto
     - boto3
 notes:
-    - This module requires that you have boto and boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+    - This module requires that you have boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+    - This module also accepts the client options C(region), C(profile), C(endpoint_url), C(retry_mode), C(max_attempts), C(connect_timeout), C(read_timeout), C(max_pool_connections), C(retry_deadline), C(rate_limits), C(rate_limit_file) and C(write_lock) to tune its boto3 client.  Unset options keep the boto3 defaults.  When C(rate_limits) or C(rate_limit_file) is set, calls are paced by control plane rate limits that all modules on the host share.  Throttled, conflicting and transient calls are retried with backoff, and the result then includes C(retries), the number of retries per operation.
 '''
 
 EXAMPLES = '''
@@ -108,13 +108,16 @@ RETURN = '''
 __version__ = '${version}'
 
 try:
-  import boto3
-  import boto
   from botocore.exceptions import BotoCoreError
   HAS_BOTO3 = True
 except ImportError:
   HAS_BOTO3 = False
 
+try:
+  from ansible.module_utils.apigw_client import client_argument_spec, create_client, report_retries
+except ImportError:
+  from module_utils.apigw_client import client_argument_spec, create_client, report_retries
+
 class ApiGwBasePathMapping:
   def __init__(self, module):
     """
@@ -122,8 +125,8 @@ class ApiGwBasePathMapping:
     """
     self.module = module
     if (not HAS_BOTO3):
-      self.module.fail_json(msg="boto and boto3 are required for this module")
-    self.client = boto3.client('apigateway')
+      self.module.fail_json(msg="boto3 is required for this module")
+    self.client = create_client(self.module)
 
   @staticmethod
   def _define_module_argument_spec():
@@ -261,11 +264,13 @@ def main():
     :return: none
     """
     module = AnsibleModule(
-        argument_spec=ApiGwBasePathMapping._define_module_argument_spec(),
+        argument_spec=client_argument_spec(ApiGwBasePathMapping._define_module_argument_spec()),
         supports_check_mode=True
     )
 
     base_path_mapping = ApiGwBasePathMapping(module)
+    report_retries(module, base_path_mapping.client)
+
     base_path_mapping.process_request()
 
 from ansible.module_utils.basic import *  # pylint: disable=W0614
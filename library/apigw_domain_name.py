@@ -41,7 +41,7 @@ author: Brian Felton (@bjfelton)
 short_description: Add, update, or remove DomainName resources
 description:
 - Uses domain name for identifying resources for CRUD operations
-- Update only covers certificate name
+- Update covers certificate names, the regional certificate and the endpoint type
 version_added: "2.2"
 options:
   name:
@@ -74,6 +74,24 @@ options:
     type: string
     required: False
     default: None
+  endpoint_type:
+    description:
+    - Type of endpoint serving the domain name.  C(REGIONAL) domain names resolve to a regional endpoint instead of a CloudFront distribution, so callers in the same region skip the extra hop.  Left alone when omitted.
+    choices: ['EDGE', 'REGIONAL']
+    required: False
+    default: None
+  regional_cert_arn:
+    description:
+    - ARN of the ACM certificate used by the regional endpoint.  Required to create a C(REGIONAL) domain name, in which case the C(cert_*) options are not needed.
+    type: string
+    required: False
+    default: None
+  regional_cert_name:
+    description:
+    - Name of the certificate used by the regional endpoint
+    type: string
+    required: False
+    default: None
   state:
     description:
     - Should domain_name exist or not
@@ -82,10 +100,12 @@ options:
     required: False
 requirements:
     - python = 2.7
-    - boto
     - boto3
 notes:
-    - This module requires that you have boto and boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+    - Switching C(endpoint_type) of an existing domain name requires a certificate for the new endpoint, so set C(regional_cert_arn) or the C(cert_*) options alongside it.
+    - C(PRIVATE) domain names, and with them C(vpc_endpoint_ids), are not supported.  A private custom domain name is created with a resource policy and is then addressed by its domainNameId, which the boto3 and botocore releases this module targets do not accept; use a regional domain name behind a VPC endpoint instead.
+    - This module requires that you have boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+    - This module also accepts the client options C(region), C(profile), C(endpoint_url), C(retry_mode), C(max_attempts), C(connect_timeout), C(read_timeout), C(max_pool_connections), C(retry_deadline), C(rate_limits), C(rate_limit_file) and C(write_lock) to tune its boto3 client.  Unset options keep the boto3 defaults.  When C(rate_limits) or C(rate_limit_file) is set, calls are paced by control plane rate limits that all modules on the host share.  Throttled, conflicting and transient calls are retried with backoff, and the result then includes C(retries), the number of retries per operation.
 '''
 
 EXAMPLES = '''
@@ -104,6 +124,15 @@ EXAMPLES = '''
     register: dn
 
   - debug: var=dn
+
+  - name: regional domain name
+    apigw_domain_name:
+      name: api.example.com
+      endpoint_type: REGIONAL
+      regional_cert_arn: 'arn:aws:acm:us-east-1:123456789012:certificate/abcd-1234'
+      regional_cert_name: 'example-cert'
+      state: present
+    register: dn
 '''
 
 RETURN = '''
@@ -121,13 +150,18 @@ changed:
 __version__ = '${version}'
 
 try:
-  import boto3
-  import boto
   from botocore.exceptions import BotoCoreError, ClientError
   HAS_BOTO3 = True
 except ImportError:
   HAS_BOTO3 = False
 
+try:
+  from ansible.module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from ansible.module_utils.apigw_patch import create_patch, diff_endpoint_configuration
+except ImportError:
+  from module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from module_utils.apigw_patch import create_patch, diff_endpoint_configuration
+
 class ApiGwDomainName:
   def __init__(self, module):
     """
@@ -135,8 +169,8 @@ class ApiGwDomainName:
     """
     self.module = module
     if (not HAS_BOTO3):
-      self.module.fail_json(msg="boto and boto3 are required for this module")
-    self.client = boto3.client('apigateway')
+      self.module.fail_json(msg="boto3 is required for this module")
+    self.client = create_client(self.module)
 
   @staticmethod
   def _define_module_argument_spec():
@@ -149,6 +183,9 @@ class ApiGwDomainName:
                  cert_body=dict(required=False),
                  cert_private_key=dict(required=False),
                  cert_chain=dict(required=False),
+                 endpoint_type=dict(required=False, choices=['EDGE', 'REGIONAL']),
+                 regional_cert_arn=dict(required=False),
+                 regional_cert_name=dict(required=False),
                  state=dict(default='present', choices=['present', 'absent']),
     )
 
@@ -190,22 +227,33 @@ class ApiGwDomainName:
     """
     domain_name = None
     changed = False
+    endpoint_type = self.module.params.get('endpoint_type')
+    kwargs = dict(domainName=self.module.params['name'])
 
-    for required in ['cert_name', 'cert_body', 'cert_private_key', 'cert_chain']:
-      if self.module.params.get(required, None) is None:
-        self.module.fail_json(msg="All certificate parameters are required to create a domain name")
+    if endpoint_type == 'REGIONAL':
+      if self.module.params.get('regional_cert_arn') is None:
+        self.module.fail_json(msg="regional_cert_arn is required to create a regional domain name")
         return (changed, domain_name)
+      kwargs['regionalCertificateArn'] = self.module.params['regional_cert_arn']
+      if self.module.params.get('regional_cert_name') is not None:
+        kwargs['regionalCertificateName'] = self.module.params['regional_cert_name']
+    else:
+      for required in ['cert_name', 'cert_body', 'cert_private_key', 'cert_chain']:
+        if self.module.params.get(required, None) is None:
+          self.module.fail_json(msg="All certificate parameters are required to create a domain name")
+          return (changed, domain_name)
+      kwargs['certificateName'] = self.module.params['cert_name']
+      kwargs['certificateBody'] = self.module.params['cert_body']
+      kwargs['certificatePrivateKey'] = self.module.params['cert_private_key']
+      kwargs['certificateChain'] = self.module.params['cert_chain']
+
+    if endpoint_type is not None:
+      kwargs['endpointConfiguration'] = {'types': [endpoint_type]}
 
     try:
       changed = True
       if not self.module.check_mode:
-        domain_name = self.client.create_domain_name(
-          domainName=self.module.params['name'],
-          certificateName=self.module.params['cert_name'],
-          certificateBody=self.module.params['cert_body'],
-          certificatePrivateKey=self.module.params['cert_private_key'],
-          certificateChain=self.module.params['cert_chain'],
-        )
+        domain_name = self.client.create_domain_name(**kwargs)
 
     except BotoCoreError as e:
       self.module.fail_json(msg="Error when creating domain_name via boto3: {}".format(e))
@@ -223,9 +271,16 @@ class ApiGwDomainName:
     try:
       patches = []
       cert_name = self.module.params.get('cert_name', None)
-      if cert_name not in ['', None] and cert_name != self.me['certificateName']:
+      if cert_name not in ['', None] and cert_name != self.me.get('certificateName'):
         patches.append({'op': 'replace', 'path': '/certificateName', 'value': cert_name})
 
+      for (param, field) in [('regional_cert_arn', 'regionalCertificateArn'), ('regional_cert_name', 'regionalCertificateName')]:
+        value = self.module.params.get(param, None)
+        if value not in ['', None] and value != self.me.get(field):
+          patches.append(create_patch('replace', field, value=value))
+
+      patches.extend(diff_endpoint_configuration(self.me.get('endpointConfiguration'), self.module.params.get('endpoint_type')))
+
       if patches:
         changed = True
 
@@ -266,11 +321,13 @@ def main():
     :return: none
     """
     module = AnsibleModule(
-        argument_spec=ApiGwDomainName._define_module_argument_spec(),
+        argument_spec=client_argument_spec(ApiGwDomainName._define_module_argument_spec()),
         supports_check_mode=True
     )
 
     domain_name = ApiGwDomainName(module)
+    report_retries(module, domain_name.client)
+
     domain_name.process_request()
 
 from ansible.module_utils.basic import *  # pylint: disable=W0614
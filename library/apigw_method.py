@@ -47,10 +47,10 @@ version_added: "2.2"
 options:
   name:
     description:
-    - The name of the method on which to operate
+    - The name of the method on which to operate.  Required unless C(methods) is used.
     type: 'string'
     choices: ['GET', 'PUT', 'POST', 'DELETE', 'PATCH', 'HEAD']
-    required: True
+    required: False
   rest_api_id:
     description:
     - The id of the parent rest api
@@ -58,9 +58,21 @@ options:
     required: True
   resource_id:
     description:
-    - The id of the resource to which the method belongs
+    - The id of the resource to which the method belongs.  Required unless C(methods) is used.
     type: 'string'
-    required: True
+    required: False
+  methods:
+    description:
+    - List of method specs to reconcile in one invocation, for one or more resources.  Each entry accepts the same options as a single method (C(name), C(resource_id), C(method_integration), C(state), etc), and every entry is validated and converted the same way before anything is written.  Current state is read once from a get_resources sweep with embedded methods, changes are written concurrently, and results are reported per method.  Mutually exclusive with C(name).
+    type: 'list'
+    default: None
+    required: False
+  concurrency:
+    description:
+    - Maximum number of concurrent writes.  Method responses and integration responses for different status codes are written in parallel.  With C(methods), the entries are written in parallel instead and each entry writes its responses one after another, so no more than C(concurrency) writes run at once.
+    type: 'int'
+    default: 4
+    required: False
   authorization_type:
     description:
     - The type of authorization used for the method
@@ -337,6 +349,18 @@ options:
             - The template to apply
             type: 'string'
             required: True
+  use_snapshot:
+    description:
+    - Read the current method from a get_resources sweep with embedded methods instead of calling get_method.  The sweep stops as soon as C(resource_id) has been found.
+    type: 'bool'
+    default: False
+    required: False
+  verify:
+    description:
+    - After a create or update, re-read the method with get_method and return the remote document.  When False, the returned method is built locally from the state read before the write plus the put payloads and patch operations that were applied, which saves a round trip per changed method.
+    type: 'bool'
+    default: False
+    required: False
   state:
     description:
     - Determine whether to assert if resource should exist or not
@@ -347,14 +371,16 @@ options:
 
 requirements:
     - python = 2.7
-    - boto
     - boto3
 notes:
   - This module is a beast in that it's covering four separate APIs for the four API Gateway stages
   - Arguments are presented in a non-idiomatic manner -- arguments are grouped under dictionaries in order to better organize arguments to the four separate stages
   - While the majority of the Method, Method Integration, Method Response, and Integration Response APIs are covered, there are likely gaps.  Issues and PRs are welcome.
   - This module will update only a handful of attributes for a method, such as authorization type, api key required, request params, and request models.
-  - This module requires that you have boto and boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+  - Method response and integration response writes that are throttled by API Gateway are retried with jittered exponential backoff.
+  - Unless C(verify) is set, the returned method is built locally and does not include ResponseMetadata or fields that API Gateway fills in on its own (such as timeoutInMillis).
+  - This module requires that you have boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+  - This module also accepts the client options C(region), C(profile), C(endpoint_url), C(retry_mode), C(max_attempts), C(connect_timeout), C(read_timeout), C(max_pool_connections), C(retry_deadline), C(rate_limits), C(rate_limit_file) and C(write_lock) to tune its boto3 client.  Unset options keep the boto3 defaults.  When C(rate_limits) or C(rate_limit_file) is set, calls are paced by control plane rate limits that all modules on the host share.  Throttled, conflicting and transient calls are retried with backoff, and the result then includes C(retries), the number of retries per operation.
 '''
 
 EXAMPLES = '''
@@ -413,6 +439,31 @@ EXAMPLES = '''
 
     - debug: var=method
 
+- name: Manage every verb of a resource in one task
+  hosts: localhost
+  gather_facts: False
+  tasks:
+    - name: Methods
+      apigw_method:
+        rest_api_id: abcd1234
+        concurrency: 8
+        methods:
+          - resource_id: wxyz9876
+            name: GET
+            method_integration:
+              integration_type: MOCK
+            method_responses:
+              - status_code: 200
+            integration_responses:
+              - status_code: 200
+                is_default: True
+          - resource_id: wxyz9876
+            name: DELETE
+            state: absent
+      register: methods
+
+    - debug: var=methods
+
 - name: Remove method
   hosts: localhost
   gather_facts: False
@@ -509,15 +560,33 @@ Response after create
 
 __version__ = '${version}'
 
+import ast
 import copy
+from multiprocessing.pool import ThreadPool
 try:
-  import boto3
-  import boto
   from botocore.exceptions import BotoCoreError, ClientError
   HAS_BOTO3 = True
 except ImportError:
   HAS_BOTO3 = False
 
+try:
+  from ansible.module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from ansible.module_utils.apigw_params import check_entry
+  from ansible.module_utils.apigw_patch import create_patch, diff_fields, diff_list, diff_map
+  from ansible.module_utils.apigw_resources import ResourceSnapshot
+  from ansible.module_utils.apigw_retry import call_with_retry
+except ImportError:
+  from module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from module_utils.apigw_params import check_entry
+  from module_utils.apigw_patch import create_patch, diff_fields, diff_list, diff_map
+  from module_utils.apigw_resources import ResourceSnapshot
+  from module_utils.apigw_retry import call_with_retry
+
+class MethodSpecError(Exception):
+  """
+  Raised in place of fail_json while reconciling one entry of C(methods)
+  """
+
 class InvalidInputError(Exception):
   def __init__(self, param, fail_message):
     """
@@ -533,68 +602,17 @@ def buildDictionaryFromListOfDictionaries(list, key, value):
     dictionary[item[key]] = item[value]
   return dictionary
 
-def create_patch(op, path, prefix=None, value=None):
-  if re.search('/', path):
-    path = re.sub('/', '~1', path)
-
-  path = "/{}/{}".format(prefix, path) if prefix else "/{}".format(path)
-
-  resp = {'op': op, 'path': path}
-  if value is not None:
-    resp['value'] = str(value)
-  return resp
-
 def patch_builder(method, params, param_map):
-  ops = []
-  for ans_param, boto_param in param_map.iteritems():
-    if ans_param not in params and boto_param not in method:
-      pass
-    elif ans_param not in params and boto_param in method:
-      ops.append(create_patch('remove', boto_param))
-    elif ans_param in params and boto_param not in method:
-      ops.append(create_patch('add', boto_param, value=params[ans_param]))
-    elif str(params[ans_param]).lower() != str(method[boto_param]).lower():
-      ops.append(create_patch('replace', boto_param, value=params[ans_param]))
+  fields = [dict(ansible=ans, boto=boto, ignore_case=True, remove=True) for (ans, boto) in sorted(param_map.items())]
+  ops = diff_fields(method, params, fields)
 
   moduleRequestModels = buildDictionaryFromListOfDictionaries(params.get('request_models', []), 'content_type', 'model')
-  methodRequestModels = method.get('requestModels', {})
-  if len(methodRequestModels) == 0 and len(moduleRequestModels) > 0:
-    for key in moduleRequestModels:
-      ops.append(create_patch('add', key, 'requestModels', value=moduleRequestModels.get(key)))
-  elif len(moduleRequestModels) == 0 and len(methodRequestModels) > 0:
-    for key in methodRequestModels:
-      ops.append(create_patch('remove', key, 'requestModels'))
-  else:
-    for key in methodRequestModels:
-      moduleValue = moduleRequestModels.get(key, None)
-      methodValue = methodRequestModels.get(key, None)
-      if moduleValue != None and moduleValue != methodValue:
-        ops.append(create_patch('replace', key, 'requestModels', moduleValue))
-      elif moduleValue == None:
-        ops.append(create_patch('remove', key, 'requestModels'))
-
-    for key in moduleRequestModels:
-      moduleValue = moduleRequestModels.get(key, None)
-      methodValue = methodRequestModels.get(key, None)
-      if moduleValue != None and methodValue == None:
-        ops.append(create_patch('add', key, 'requestModels', moduleValue))
+  ops.extend(diff_map(method.get('requestModels', {}), moduleRequestModels, 'requestModels'))
 
   return ops
 
 def two_way_compare_patch_builder(aws_dict, ans_dict, prefix):
-  ops = []
-
-  for k in ans_dict.keys():
-    if k not in aws_dict.get(prefix, {}):
-      ops.append(create_patch('add', k, prefix=prefix, value=ans_dict[k]))
-    elif str(ans_dict[k]) != str(aws_dict[prefix][k]):
-      ops.append(create_patch('replace', k, prefix=prefix, value=ans_dict[k]))
-
-  for k in aws_dict.get(prefix, {}).keys():
-    if k not in ans_dict:
-      ops.append(create_patch('remove', k, prefix=prefix))
-
-  return ops
+  return diff_map(aws_dict.get(prefix, {}), ans_dict, prefix)
 
 def put_method(params):
   resp = dict(
@@ -710,13 +728,11 @@ def update_integration(method, params):
   ops.extend(patch_builder(method.get('methodIntegration', {}), mi_params, param_map))
 
   if mi_params.get('uses_caching', False) and 'cache_key_parameters' in mi_params:
-    new_params = []
-    for ckp in mi_params.get('cache_key_parameters'):
-      if ckp not in method.get('methodIntegration', {}).get('cacheKeyParameters', []):
-        new_params.append(ckp)
-
-    if new_params:
-      ops.append(create_patch('replace', '/cacheKeyParameters', value=new_params))
+    ops.extend(diff_list(
+      method.get('methodIntegration', {}).get('cacheKeyParameters'),
+      mi_params.get('cache_key_parameters') or [],
+      'cacheKeyParameters'
+    ))
 
   ops.extend(
     two_way_compare_patch_builder(
@@ -810,24 +826,16 @@ def update_method_response(method, params):
 
       ops['creates'].append(kwargs)
     else:
-      for content_type, model in mr_dict[code]['models'].iteritems():
-        if content_type not in mr_aws[code].get('responseModels', []):
-          patch_dict.setdefault(code, []).append(create_patch('add', content_type, prefix='responseModels', value=model))
-        elif model != mr_aws[code]['responseModels'][content_type]:
-          patch_dict.setdefault(code, []).append(create_patch('replace', content_type, prefix='responseModels', value=model))
-
+      resp_params = {}
       for param, required in mr_dict[code]['params'].iteritems():
-        full_param = "method.response.header.{}".format(param)
-        if full_param not in mr_aws[code].get('responseParameters', []):
-          patch_dict.setdefault(code, []).append(
-            create_patch('add', full_param, prefix='responseParameters', value=str(required))
-          )
-        elif str(required).lower() != str(mr_aws[code]['responseParameters'][full_param]).lower():
-          patch_dict.setdefault(code, []).append(
-            create_patch('replace', full_param, prefix='responseParameters', value=str(required))
-          )
+        resp_params["method.response.header.{}".format(param)] = required
 
-  # Find codes and response models that need to be deleted
+      code_ops = diff_map(mr_aws[code].get('responseModels'), mr_dict[code]['models'], 'responseModels')
+      code_ops.extend(diff_map(mr_aws[code].get('responseParameters'), resp_params, 'responseParameters', ignore_case=True))
+      if code_ops:
+        patch_dict[code] = code_ops
+
+  # Find codes that need to be deleted
   for code in mr_aws:
     if code not in mr_dict:
       kwargs = dict(
@@ -837,13 +845,6 @@ def update_method_response(method, params):
         statusCode=code
       )
       ops['deletes'].append(kwargs)
-    else:
-      for content_type, model in mr_aws[code].get('responseModels', {}).iteritems():
-        if content_type not in mr_dict[code]['models']:
-          patch_dict.setdefault(code, []).append(create_patch('remove', content_type, prefix='responseModels'))
-      for param, required in mr_aws[code].get('responseParameters', {}).iteritems():
-        if param.split('.')[-1] not in mr_dict[code]['params']:
-          patch_dict.setdefault(code, []).append(create_patch('remove', param, prefix='responseParameters'))
 
   for code in patch_dict:
     ops['updates'].append(dict(
@@ -907,25 +908,17 @@ def update_integration_response(method, params):
       )
       ops['creates'].append(kwargs)
     else:
+      code_ops = []
       # selectionPattern
       if ir_dict[code]['pattern'] != ir_aws[code].get('selectionPattern', ''):
-        patch_dict.setdefault(code, []).append(create_patch('replace', 'selectionPattern', value=ir_dict[code]['pattern']))
-
-      # responseParameters
-      for param, value in ir_dict[code]['response_params'].iteritems():
-        if 'responseParameters' not in ir_aws[code] or param not in ir_aws[code]['responseParameters']:
-          patch_dict.setdefault(code, []).append(create_patch('add', param, prefix='responseParameters', value=value))
-        elif value != ir_aws[code]['responseParameters'][param]:
-          patch_dict.setdefault(code, []).append(create_patch('replace', param, prefix='responseParameters', value=value))
-
-      # responseTemplates
-      for ctype, tmpl in ir_dict[code]['response_templates'].iteritems():
-        if 'responseTemplates' not in ir_aws[code] or ctype not in ir_aws[code]['responseTemplates']:
-          patch_dict.setdefault(code, []).append(create_patch('add', ctype, prefix='responseTemplates', value=tmpl))
-        elif tmpl != ir_aws[code]['responseTemplates'][ctype]:
-          patch_dict.setdefault(code, []).append(create_patch('replace', ctype, prefix='responseTemplates', value=tmpl))
-
-  # Find codes and response models that need to be deleted
+        code_ops.append(create_patch('replace', 'selectionPattern', value=ir_dict[code]['pattern']))
+
+      code_ops.extend(diff_map(ir_aws[code].get('responseParameters'), ir_dict[code]['response_params'], 'responseParameters'))
+      code_ops.extend(diff_map(ir_aws[code].get('responseTemplates'), ir_dict[code]['response_templates'], 'responseTemplates'))
+      if code_ops:
+        patch_dict[code] = code_ops
+
+  # Find codes that need to be deleted
   for code in ir_aws:
     if code not in ir_dict:
       kwargs = dict(
@@ -935,16 +928,6 @@ def update_integration_response(method, params):
         statusCode=code
       )
       ops['deletes'].append(kwargs)
-    else:
-      if 'responseTemplates' in ir_aws[code]:
-        for ctype, tmpl in ir_aws[code]['responseTemplates'].iteritems():
-          if ctype not in ir_dict[code]['response_templates']:
-            patch_dict.setdefault(code, []).append(create_patch('remove', ctype, prefix='responseTemplates'))
-
-      if 'responseParameters' in ir_aws[code]:
-        for param, value in ir_aws[code]['responseParameters'].iteritems():
-          if param not in ir_dict[code]['response_params']:
-            patch_dict.setdefault(code, []).append(create_patch('remove', param, prefix='responseParameters'))
 
   for code in patch_dict:
     ops['updates'].append(dict(
@@ -981,6 +964,119 @@ def param_transformer(params_list, type, location='method'):
 
   return params
 
+# Fields holding a set of strings, patched with one path per member
+LIST_FIELDS = ('cacheKeyParameters',)
+
+def patch_value(current, value):
+  """
+  Converts the string value of a patch operation back into the type API
+  Gateway reports for the patched field
+  :param current: Value of the field before the patch, if any
+  :param value: Value carried by the patch operation
+  :return: The converted value
+  """
+  if isinstance(current, list):
+    try:
+      return list(ast.literal_eval(value))
+    except (ValueError, SyntaxError):
+      return [value]
+  if isinstance(value, basestring) and value.lower() in ['true', 'false']:
+    return value.lower() == 'true'
+
+  return value
+
+def apply_patch_operations(doc, ops):
+  """
+  Applies API Gateway patch operations to a local document
+  :param doc: Dictionary to patch in place
+  :param ops: List of patch operations
+  :return: The patched dictionary
+  """
+  for op in ops:
+    parts = [p.replace('~1', '/').replace('~0', '~') for p in op['path'].split('/')[1:]]
+    if len(parts) == 2 and parts[0] in LIST_FIELDS:
+      members = doc.setdefault(parts[0], [])
+      if op['op'] == 'remove':
+        if parts[1] in members:
+          members.remove(parts[1])
+      elif parts[1] not in members:
+        members.append(parts[1])
+      continue
+
+    target = doc
+    for part in parts[:-1]:
+      target = target.setdefault(part, {})
+
+    if op['op'] == 'remove':
+      target.pop(parts[-1], None)
+    else:
+      target[parts[-1]] = patch_value(target.get(parts[-1]), op.get('value'))
+
+  return doc
+
+def replay_writes(method, writes):
+  """
+  Builds the method document that results from applying a series of writes to
+  a method, mirroring the structure returned by get_method
+  :param method: The method as read before the writes, or None
+  :param writes: Ordered list of (client function name, kwargs) tuples
+  :return: The resulting method document
+  """
+  doc = copy.deepcopy(method or {})
+  doc.pop('ResponseMetadata', None)
+
+  for (func, kwargs) in writes:
+    args = copy.deepcopy(kwargs)
+    for key in ['restApiId', 'resourceId', 'patchOperations']:
+      args.pop(key, None)
+    if func != 'put_method':
+      args.pop('httpMethod', None)
+
+    if func in ['put_method', 'update_method']:
+      target = doc
+    elif func in ['put_method_response', 'update_method_response', 'delete_method_response']:
+      target = doc.setdefault('methodResponses', {})
+    elif func == 'put_integration':
+      if 'integrationHttpMethod' in args:
+        args['httpMethod'] = args.pop('integrationHttpMethod')
+      doc['methodIntegration'] = args
+      continue
+    elif func == 'update_integration':
+      target = doc.setdefault('methodIntegration', {})
+    else:
+      target = doc.setdefault('methodIntegration', {}).setdefault('integrationResponses', {})
+
+    if func == 'put_method':
+      doc.update(args)
+    elif func.startswith('put_'):
+      target[args['statusCode']] = args
+    elif func.startswith('delete_'):
+      target.pop(kwargs['statusCode'], None)
+    elif func == 'update_method' or func == 'update_integration':
+      apply_patch_operations(target, kwargs.get('patchOperations', []))
+    else:
+      apply_patch_operations(target.setdefault(kwargs['statusCode'], {'statusCode': kwargs['statusCode']}), kwargs.get('patchOperations', []))
+
+  if 'passthroughBehavior' in doc.get('methodIntegration', {}):
+    doc['methodIntegration']['passthroughBehavior'] = doc['methodIntegration']['passthroughBehavior'].upper()
+
+  return doc
+
+class _MethodSpecModule(object):
+  def __init__(self, module, params):
+    """
+    Stands in for the AnsibleModule while one entry of C(methods) is
+    reconciled, so a failure is reported for that method instead of ending
+    the whole run
+    :param module: The AnsibleModule
+    :param params: Params of the single method
+    """
+    self.params = params
+    self.check_mode = module.check_mode
+
+  def fail_json(self, msg, **kwargs):
+    raise MethodSpecError(msg)
+
 class ApiGwMethod:
   def __init__(self, module):
     """
@@ -988,8 +1084,9 @@ class ApiGwMethod:
     """
     self.module = module
     if (not HAS_BOTO3):
-      self.module.fail_json(msg="boto and boto3 are required for this module")
-    self.client = boto3.client('apigateway')
+      self.module.fail_json(msg="boto3 is required for this module")
+    self.client = create_client(self.module)
+    self.snapshot = None
 
   @staticmethod
   def _define_module_argument_spec():
@@ -999,12 +1096,14 @@ class ApiGwMethod:
     """
     return dict(
         name=dict(
-          required=True,
+          required=False,
           choices=['GET', 'PUT', 'POST', 'DELETE', 'PATCH', 'HEAD', 'ANY', 'OPTIONS'],
           aliases=['method']
         ),
         rest_api_id=dict(required=True),
-        resource_id=dict(required=True),
+        resource_id=dict(required=False),
+        methods=dict(required=False, type='list'),
+        concurrency=dict(required=False, type='int', default=4),
         authorization_type=dict(required=False, default='NONE'),
         authorizer_id=dict(required=False),
         api_key_required=dict(required=False, type='bool', default=False),
@@ -1100,6 +1199,8 @@ class ApiGwMethod:
             template=dict(required=True)
           ),
         ),
+        use_snapshot=dict(required=False, type='bool', default=False),
+        verify=dict(required=False, type='bool', default=False),
         state=dict(default='present', choices=['present', 'absent'])
     )
 
@@ -1153,6 +1254,72 @@ class ApiGwMethod:
     except BotoCoreError as e:
       self.module.fail_json(msg='Error calling boto3 get_method: {}'.format(e))
 
+  def _find_method_in_snapshot(self):
+    """
+    Look up the method in a resource snapshot with embedded methods, loading
+    only as many pages as needed to reach the method's resource
+    :return: Returns the method document, None when missing, or exits with fail_json
+    """
+    p = self.module.params
+
+    try:
+      if self.snapshot is None:
+        self.snapshot = ResourceSnapshot(self.client, p.get('rest_api_id'), embed_methods=True)
+      self.snapshot.load(resource_ids=[p.get('resource_id')])
+      return self.snapshot.get_method(p.get('resource_id'), p.get('name'))
+    except (BotoCoreError, ClientError) as e:
+      self.module.fail_json(msg='Error calling boto3 get_resources: {}'.format(e))
+
+  def _write_responses(self, calls):
+    """
+    Dispatch method response and integration response writes.  Calls for the
+    same status code run in the given order, while different status codes are
+    independent and run concurrently under a pool bounded by concurrency.
+    Throttled calls are retried.
+    :param calls: Ordered list of (client function name, kwargs) tuples
+    :return: Nothing.  The first error encountered is raised.
+    """
+    chains = {}
+    codes = []
+    for (func, kwargs) in calls:
+      if kwargs['statusCode'] not in chains:
+        codes.append(kwargs['statusCode'])
+        chains[kwargs['statusCode']] = []
+      chains[kwargs['statusCode']].append((func, kwargs))
+
+    def write(chain):
+      try:
+        for (func, kwargs) in chain:
+          call_with_retry(getattr(self.client, func), kwargs)
+      except Exception as e:
+        return e
+
+    workers = min(len(codes), max(1, self.module.params.get('concurrency', 4) or 1))
+    if workers <= 1:
+      errors = [write(chains[code]) for code in codes]
+    else:
+      pool = ThreadPool(workers)
+      try:
+        errors = pool.map(write, [chains[code] for code in codes])
+      finally:
+        pool.close()
+        pool.join()
+
+    errors = [e for e in errors if e is not None]
+    if errors:
+      raise errors[0]
+
+  def _method_after_writes(self, writes):
+    """
+    Determine the method document to return after a create or update
+    :param writes: Ordered list of (client function name, kwargs) tuples that were applied
+    :return: Result of get_method when verify is set, otherwise the locally built document
+    """
+    if self.module.params.get('verify', False):
+      return self._find_method()
+
+    return replay_writes(self.method, writes)
+
   def _delete_method(self):
     """
     Delete the method
@@ -1177,13 +1344,14 @@ class ApiGwMethod:
     changed = True
     if not self.module.check_mode:
       try:
-        self.client.put_method(**put_method(self.module.params))
-        self.client.put_integration(**put_integration(self.module.params))
-        for args in put_method_response(self.module.params):
-          self.client.put_method_response(**args)
-        for args in put_integration_response(self.module.params):
-          self.client.put_integration_response(**args)
-        response = self._find_method()
+        pm_args = put_method(self.module.params)
+        self.client.put_method(**pm_args)
+        pi_args = put_integration(self.module.params)
+        self.client.put_integration(**pi_args)
+        calls = [('put_method_response', args) for args in put_method_response(self.module.params)]
+        calls.extend([('put_integration_response', args) for args in put_integration_response(self.module.params)])
+        self._write_responses(calls)
+        response = self._method_after_writes([('put_method', pm_args), ('put_integration', pi_args)] + calls)
       except BotoCoreError as e:
         self.module.fail_json(msg="Error while creating method via boto3: {}".format(e))
 
@@ -1192,6 +1360,7 @@ class ApiGwMethod:
   def _update_method(self):
     response = None
     changed = False
+    writes = []
 
     try:
       um_args = update_method(self.method, self.module.params)
@@ -1199,52 +1368,134 @@ class ApiGwMethod:
         changed = True
         if not self.module.check_mode:
           self.client.update_method(**um_args)
+          writes.append(('update_method', um_args))
 
       if 'methodIntegration' not in self.method:
         changed = True
         if not self.module.check_mode:
-          self.client.put_integration(**put_integration(self.module.params))
+          pi_args = put_integration(self.module.params)
+          self.client.put_integration(**pi_args)
+          writes.append(('put_integration', pi_args))
       else:
         ui_args = update_integration(self.method, self.module.params)
         if ui_args:
           changed = True
           if not self.module.check_mode:
             self.client.update_integration(**ui_args)
+            writes.append(('update_integration', ui_args))
 
+      calls = []
       umr_args = update_method_response(self.method, self.module.params)
-      if umr_args['creates'] or umr_args['deletes'] or umr_args['updates']:
-        changed = True
-        if not self.module.check_mode:
-          for create_kwargs in umr_args['creates']:
-            self.client.put_method_response(**create_kwargs)
-          for patch_kwargs in umr_args['updates']:
-            self.client.update_method_response(**patch_kwargs)
-          for delete_kwargs in umr_args['deletes']:
-            self.client.delete_method_response(**delete_kwargs)
+      calls.extend([('put_method_response', kwargs) for kwargs in umr_args['creates']])
+      calls.extend([('update_method_response', kwargs) for kwargs in umr_args['updates']])
+      calls.extend([('delete_method_response', kwargs) for kwargs in umr_args['deletes']])
 
       uir_args = update_integration_response(self.method, self.module.params)
-      if uir_args['creates'] or uir_args['deletes'] or uir_args['updates']:
+      calls.extend([('put_integration_response', kwargs) for kwargs in uir_args['creates']])
+      calls.extend([('update_integration_response', kwargs) for kwargs in uir_args['updates']])
+      calls.extend([('delete_integration_response', kwargs) for kwargs in uir_args['deletes']])
+
+      if calls:
         changed = True
         if not self.module.check_mode:
-          for create_kwargs in uir_args['creates']:
-            self.client.put_integration_response(**create_kwargs)
-          for patch_kwargs in uir_args['updates']:
-            self.client.update_integration_response(**patch_kwargs)
-          for delete_kwargs in uir_args['deletes']:
-            self.client.delete_integration_response(**delete_kwargs)
-
-      response = self._find_method()
+          self._write_responses(calls)
+          writes.extend(calls)
+
+      response = self._method_after_writes(writes)
     except BotoCoreError as e:
       self.module.fail_json(msg="Error while updating method via boto3: {}".format(e))
 
     return changed, response
 
-  def process_request(self):
+  def _build_method_params(self, spec):
     """
-    Process the user's request -- the primary code path
+    Builds the params of one entry of C(methods) as if it had been passed to
+    the module on its own, validating and converting them the same way
+    :param spec: One entry of the methods list
+    :return: Dictionary of params
+    :raises ValueError: When the entry is invalid
+    """
+    if not isinstance(spec, dict):
+      raise ValueError("entries must be dictionaries")
+
+    argument_spec = ApiGwMethod._define_module_argument_spec()
+    argument_spec.pop('methods')
+    params = check_entry(argument_spec, dict(copy.deepcopy(spec), rest_api_id=self.module.params.get('rest_api_id')))
+    if params.get('name') is None or params.get('resource_id') is None:
+      raise ValueError("name and resource_id are required")
+    params['use_snapshot'] = True
+    # The entries already run in a pool bounded by concurrency, so each one
+    # writes its responses sequentially rather than starting a pool of its own
+    params['concurrency'] = 1
+
+    return params
+
+  def _reconcile_method(self, params):
+    """
+    Reconcile one entry of C(methods) against the shared snapshot
+    :param params: Result of _build_method_params
+    :return: Dictionary describing the outcome for that method
+    """
+    worker = copy.copy(self)
+    worker.module = _MethodSpecModule(self.module, params)
+
+    result = dict(resource_id=params.get('resource_id'), name=params.get('name'), changed=False, method=None)
+    try:
+      (result['changed'], result['method']) = worker._reconcile()
+    except Exception as e:
+      result['failed'] = True
+      result['msg'] = str(e)
+
+    return result
+
+  def _process_methods(self):
+    """
+    Reconcile every entry of C(methods), reading current state once and
+    writing the methods concurrently
     :return: Returns either fail_json or exit_json
     """
-    self.method = self._find_method()
+    specs = []
+    for (index, spec) in enumerate(self.module.params.get('methods')):
+      try:
+        specs.append(self._build_method_params(spec))
+      except ValueError as e:
+        self.module.fail_json(msg="Invalid methods entry {0}: {1}".format(index, e))
+        return
+
+    try:
+      self.snapshot = ResourceSnapshot(self.client, self.module.params.get('rest_api_id'), embed_methods=True)
+      self.snapshot.load(resource_ids=list(set(p.get('resource_id') for p in specs)))
+    except (BotoCoreError, ClientError) as e:
+      self.module.fail_json(msg='Error calling boto3 get_resources: {}'.format(e))
+      return
+
+    pool = ThreadPool(max(1, self.module.params.get('concurrency') or 1))
+    try:
+      results = pool.map(self._reconcile_method, specs)
+    finally:
+      pool.close()
+      pool.join()
+
+    changed = any(r['changed'] for r in results)
+    failed = [r for r in results if r.get('failed')]
+    if failed:
+      self.module.fail_json(
+        msg="Error reconciling {0} of {1} methods".format(len(failed), len(results)),
+        changed=changed,
+        methods=results
+      )
+    else:
+      self.module.exit_json(changed=changed, methods=results)
+
+  def _reconcile(self):
+    """
+    Create, update, or delete the method described by the module's params
+    :return: (changed, response)
+    """
+    if self.module.params.get('use_snapshot', False):
+      self.method = self._find_method_in_snapshot()
+    else:
+      self.method = self._find_method()
 
     changed = False
     response = None
@@ -1257,6 +1508,17 @@ class ApiGwMethod:
     elif self.module.params.get('state', 'present') == 'present':
       (changed, response) = self._update_method()
 
+    return changed, response
+
+  def process_request(self):
+    """
+    Process the user's request -- the primary code path
+    :return: Returns either fail_json or exit_json
+    """
+    if self.module.params.get('methods') is not None:
+      return self._process_methods()
+
+    (changed, response) = self._reconcile()
     self.module.exit_json(changed=changed, method=response)
 
 def main():
@@ -1265,11 +1527,16 @@ def main():
     :return: none
     """
     module = AnsibleModule(
-        argument_spec=ApiGwMethod._define_module_argument_spec(),
+        argument_spec=client_argument_spec(ApiGwMethod._define_module_argument_spec()),
+        mutually_exclusive=[['name', 'methods']],
+        required_one_of=[['name', 'methods']],
+        required_together=[['name', 'resource_id']],
         supports_check_mode=True
     )
 
     rest_api = ApiGwMethod(module)
+    report_retries(module, rest_api.client)
+
     rest_api.process_request()
 
 from ansible.module_utils.basic import *  # pylint: disable=W0614
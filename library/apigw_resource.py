@@ -44,8 +44,25 @@ version_added: "2.2"
 options:
   name:
     description:
-      - The name of the resource on which to operate
-    required: True
+      - The name of the resource on which to operate.  Mutually exclusive with C(paths).
+    required: False
+  paths:
+    description:
+      - List of resource paths to reconcile in a single invocation.  The resource tree is loaded once and every missing path is created.  Mutually exclusive with C(name).
+    type: list
+    required: False
+  exclusive:
+    description:
+      - When C(paths) is used with C(state) 'present', delete every existing resource that is neither declared in C(paths) nor an ancestor of a declared path.
+    type: bool
+    default: False
+    required: False
+  concurrency:
+    description:
+      - Maximum number of concurrent create_resource and delete_resource calls when C(paths) is used.  Sibling subtrees are handled in parallel.
+    type: int
+    default: 4
+    required: False
   rest_api_id:
     description:
       - The id of the parent rest api
@@ -59,10 +76,11 @@ options:
 
 requirements:
     - python = 2.7
-    - boto
     - boto3
 notes:
-    - This module requires that you have boto and boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+    - Deleting a resource also deletes all of its children.  When C(paths) is used with C(state) 'absent' or C(exclusive), only the top-most resource of each doomed branch is deleted.
+    - This module requires that you have boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+    - This module also accepts the client options C(region), C(profile), C(endpoint_url), C(retry_mode), C(max_attempts), C(connect_timeout), C(read_timeout), C(max_pool_connections), C(retry_deadline), C(rate_limits), C(rate_limit_file) and C(write_lock) to tune its boto3 client.  Unset options keep the boto3 defaults.  When C(rate_limits) or C(rate_limit_file) is set, calls are paced by control plane rate limits that all modules on the host share.  Throttled, conflicting and transient calls are retried with backoff, and the result then includes C(retries), the number of retries per operation.
 '''
 
 EXAMPLES = '''
@@ -81,6 +99,30 @@ EXAMPLES = '''
     - name: debug
       debug: var=resource
 
+- name: Add many resources to Api Gateway at once
+  hosts: localhost
+  gather_facts: False
+  connection: local
+  tasks:
+    - name: Create resources
+      apigw_resource:
+        paths:
+          - '/thing/{param}/awesomeness'
+          - '/thing/{param}/greatness'
+          - '/other'
+        rest_api_id: 'abcd1234'
+        concurrency: 8
+        state: present
+      register: resources
+
+    - name: Remove whole branches, one delete_resource call per branch
+      apigw_resource:
+        paths:
+          - '/thing'
+          - '/thing/{param}/greatness'
+        rest_api_id: 'abcd1234'
+        state: absent
+
 - name: Rest api from Api Gateway
   hosts: localhost
   gather_facts: False
@@ -130,15 +172,24 @@ RETURN = '''
 
 __version__ = '${version}'
 
-import copy
+from multiprocessing.pool import ThreadPool
+try:
+  import queue
+except ImportError:
+  import Queue as queue
 try:
-  import boto3
-  import boto
   from botocore.exceptions import BotoCoreError
   HAS_BOTO3 = True
 except ImportError:
   HAS_BOTO3 = False
 
+try:
+  from ansible.module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from ansible.module_utils.apigw_resources import iter_resources, PathIndex
+except ImportError:
+  from module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from module_utils.apigw_resources import iter_resources, PathIndex
+
 class ApiGwResource:
   def __init__(self, module):
     """
@@ -146,11 +197,9 @@ class ApiGwResource:
     """
     self.module = module
     if (not HAS_BOTO3):
-      self.module.fail_json(msg="boto and boto3 are required for this module")
-    self.client = boto3.client('apigateway')
-    self.path_map = {
-      'paths': {}
-    }
+      self.module.fail_json(msg="boto3 is required for this module")
+    self.client = create_client(self.module)
+    self.path_index = PathIndex()
 
   @staticmethod
   def _define_module_argument_spec():
@@ -158,28 +207,41 @@ class ApiGwResource:
     Defines the module's argument spec
     :return: Dictionary defining module arguments
     """
-    return dict( name=dict(required=True),
+    return dict( name=dict(required=False),
+                 paths=dict(required=False, type='list'),
                  rest_api_id=dict(required=True),
+                 exclusive=dict(required=False, type='bool', default=False),
+                 concurrency=dict(required=False, type='int', default=4),
                  state=dict(default='present', choices=['present', 'absent'])
     )
 
-  def _build_resource_dictionary(self):
+  def _build_resource_dictionary(self, wanted=None):
+    """
+    Builds path_index from the resources of the rest api, one page at a time.
+    Loading stops as soon as every path in wanted has been resolved.  Since a
+    resource can only exist beneath its ancestors, resolving the requested
+    path is sufficient; a missing path still requires a full listing.
+    :param wanted: List of paths that must be resolved, or None to load everything
+    :return: Nothing.  Calls fail_json on error
+    """
+    pending = None if wanted is None else set(wanted)
     try:
-      resources = self.client.get_resources(restApiId=self.module.params.get('rest_api_id'), limit=500)
+      for res in iter_resources(self.client, self.module.params.get('rest_api_id')):
+        self.path_index.add(res.get('path'), res.get('id'), res.get('parentId'))
 
-      for res in resources.get('items'):
-        self.path_map['paths'][res.get('path')] = {'id': res.get('id')}
-        if 'parentId' in res:
-          self.path_map['paths'][res.get('path')]['parentId'] = res.get('parentId')
+        if pending is not None:
+          pending.discard(res.get('path'))
+          if not pending:
+            break
 
     except BotoCoreError as e:
       self.module.fail_json(msg="Error calling boto3 get_resources: {}".format(e))
 
   @staticmethod
-  def _build_create_resources_list(path_map, resource):
+  def _build_create_resources_list(path_index, resource):
     """
     Splits resource and builds a list of create operations
-    :param path_map: A map containing path parts
+    :param path_index: PathIndex of the existing resources
     :param resource: The url to create
     :return: Ordered list of resources to create
     """
@@ -188,12 +250,173 @@ class ApiGwResource:
     parts = resource.split('/')[1:]
     for part in parts:
       new_part = "{0}/{1}".format(last_part, part)
-      if new_part not in path_map['paths']:
+      if new_part not in path_index:
         operations.append({'part': part, 'path': new_part, 'parent': '/' if last_part == '' else last_part})
       last_part = new_part
 
     return operations
 
+  @staticmethod
+  def _build_create_resources_trie(path_index, resources):
+    """
+    Merges the create operations for several resources into a prefix trie
+    :param path_index: PathIndex of the existing resources
+    :param resources: List of urls to create
+    :return: Dictionary keyed by path, where each node holds its create operation
+             and a dictionary of child nodes.  Top-level nodes have parents that
+             already exist.
+    """
+    trie = {}
+    for resource in resources:
+      node = trie
+      for op in ApiGwResource._build_create_resources_list(path_index, resource):
+        node = node.setdefault(op['path'], {'op': op, 'children': {}})['children']
+
+    return trie
+
+  @staticmethod
+  def _build_delete_resources_list(path_index, resources):
+    """
+    Determines the minimal set of existing resources whose deletion removes
+    every listed resource.  Deleting a resource cascades to its children, so a
+    listed resource is skipped when one of its ancestors is also listed.
+    :param path_index: PathIndex of the existing resources
+    :param resources: List of urls to delete
+    :return: Sorted list of top-most paths to delete
+    """
+    doomed = set(r for r in resources if r in path_index and r != '/')
+
+    operations = []
+    for path in doomed:
+      if not any(ancestor in doomed for (ancestor, _) in path_index.ancestors(path)):
+        operations.append(path)
+
+    return sorted(operations)
+
+  @staticmethod
+  def _build_prune_resources_list(path_index, resources):
+    """
+    Determines the minimal set of existing resources whose deletion removes
+    everything that is neither listed nor an ancestor of a listed resource
+    :param path_index: PathIndex of the existing resources
+    :param resources: List of urls to keep
+    :return: Sorted list of top-most paths to delete
+    """
+    return path_index.prune(resources)
+
+  def _create_resource_tree(self, trie):
+    """
+    Creates every node of the trie.  A node is only submitted once its parent
+    exists, while independent sibling subtrees are created concurrently under
+    a pool bounded by the concurrency param.
+    :param trie: Result of _build_create_resources_trie
+    :return: Nothing.  Calls fail_json on error
+    """
+    rest_api_id = self.module.params.get('rest_api_id')
+    results = queue.Queue()
+
+    def create(node):
+      try:
+        op = node['op']
+        resp = self.client.create_resource(
+          restApiId=rest_api_id,
+          parentId=self.path_index.get_id(op['parent']),
+          pathPart=op['part']
+        )
+        results.put((node, resp, None))
+      except Exception as e:
+        results.put((node, None, e))
+
+    pool = ThreadPool(max(1, self.module.params.get('concurrency') or 1))
+    error = None
+    try:
+      pending = 0
+      for node in trie.values():
+        pool.apply_async(create, (node,))
+        pending += 1
+
+      while pending:
+        (node, resp, e) = results.get()
+        pending -= 1
+        if e is not None:
+          error = error or e
+          continue
+
+        self.path_index.add(node['op']['path'], resp.get('id'), resp.get('parentId'))
+        if error is None:
+          for child in node['children'].values():
+            pool.apply_async(create, (child,))
+            pending += 1
+    finally:
+      pool.close()
+      pool.join()
+
+    if isinstance(error, BotoCoreError):
+      self.module.fail_json(msg="Error calling boto3 create_resource: {}".format(error))
+    elif error is not None:
+      raise error
+
+  def _delete_resources(self, paths):
+    """
+    Deletes the provided resources concurrently under a pool bounded by the
+    concurrency param, removing them and their children from path_index
+    :param paths: List of top-most paths to delete
+    :return: Nothing.  Calls fail_json on error
+    """
+    rest_api_id = self.module.params.get('rest_api_id')
+
+    def delete(path):
+      try:
+        self.client.delete_resource(restApiId=rest_api_id, resourceId=self.path_index.get_id(path))
+      except Exception as e:
+        return e
+
+    pool = ThreadPool(max(1, self.module.params.get('concurrency') or 1))
+    try:
+      errors = [e for e in pool.map(delete, paths) if e is not None]
+    finally:
+      pool.close()
+      pool.join()
+
+    if errors and isinstance(errors[0], BotoCoreError):
+      self.module.fail_json(msg="Error calling boto3 delete_resource: {}".format(errors[0]))
+    elif errors:
+      raise errors[0]
+
+    for path in paths:
+      self.path_index.remove(path)
+
+  def _remove_resources(self, paths):
+    """
+    Delete the API Gateway Resources listed in paths with as few calls as possible
+    :param paths: List of top-most paths to delete
+    :return: changed: Boolean indicating whether or not a change occurred
+    """
+    changed = len(paths) > 0
+
+    if changed and not self.module.check_mode:
+      self._delete_resources(paths)
+
+    return changed
+
+  def _create_resources(self):
+    """
+    Create every API Gateway Resource listed in paths
+    :return: (changed, result)
+              changed: Boolean indicating whether or not a change occurred
+              result: List of the requested resources with their ids
+    """
+    paths = self.module.params.get('paths')
+    trie = ApiGwResource._build_create_resources_trie(self.path_index, paths)
+    changed = len(trie) > 0
+
+    if changed and not self.module.check_mode:
+      self._create_resource_tree(trie)
+
+    result = [self.path_index.describe(path) for path in paths]
+
+    return changed, result
+
   def _create_resource(self):
     """
     Create an API Gateway Resource
@@ -203,26 +426,25 @@ class ApiGwResource:
     """
     changed = False
     result = None
-    if self.module.params.get('name') not in self.path_map['paths']:
+    if self.module.params.get('name') not in self.path_index:
       changed = True
 
       if not self.module.check_mode:
         try:
-          operations = ApiGwResource._build_create_resources_list(self.path_map, self.module.params.get('name'))
+          operations = ApiGwResource._build_create_resources_list(self.path_index, self.module.params.get('name'))
 
           for op in operations:
             part = op['part']
             result = self.client.create_resource(
               restApiId=self.module.params.get('rest_api_id'),
-              parentId=self.path_map['paths'][op['parent']]['id'],
+              parentId=self.path_index.get_id(op['parent']),
               pathPart=part
             )
-            self.path_map['paths'][op['path']] = {'id': result.get('id')}
+            self.path_index.add(op['path'], result.get('id'), result.get('parentId'))
         except BotoCoreError as e:
           self.module.fail_json(msg="Error calling boto3 create_resource: {}".format(e))
     else:
-      result = copy.deepcopy(self.path_map['paths'][self.module.params.get('name')])
-      result['path'] = self.module.params.get('name')
+      result = self.path_index.describe(self.module.params.get('name'))
 
     return changed, result
 
@@ -234,13 +456,13 @@ class ApiGwResource:
               result: Output of the delete_resource call
     """
     changed = False
-    if self.module.params.get('name') in self.path_map['paths']:
+    if self.module.params.get('name') in self.path_index:
       try:
         changed = True
         if not self.module.check_mode:
           self.client.delete_resource(
             restApiId=self.module.params.get('rest_api_id'),
-            resourceId=self.path_map['paths'][self.module.params.get('name')]['id']
+            resourceId=self.path_index.get_id(self.module.params.get('name'))
           )
       except BotoCoreError as e:
         self.module.fail_json(msg="Error calling boto3 delete_resource: {}".format(e))
@@ -254,7 +476,28 @@ class ApiGwResource:
     """
     changed = False
     result = None
-    self._build_resource_dictionary()
+
+    paths = self.module.params.get('paths')
+    if paths is not None:
+      if self.module.params.get('state') == 'absent':
+        self._build_resource_dictionary(wanted=paths)
+        deleted = ApiGwResource._build_delete_resources_list(self.path_index, paths)
+        changed = self._remove_resources(deleted)
+      elif self.module.params.get('exclusive'):
+        self._build_resource_dictionary()
+        deleted = ApiGwResource._build_prune_resources_list(self.path_index, paths)
+        changed = self._remove_resources(deleted)
+        (created, result) = self._create_resources()
+        changed = changed or created
+      else:
+        deleted = []
+        self._build_resource_dictionary(wanted=paths)
+        (changed, result) = self._create_resources()
+
+      self.module.exit_json(changed=changed, resources=result, deleted=deleted)
+      return
+
+    self._build_resource_dictionary(wanted=[self.module.params.get('name')])
     if self.module.params.get('state') == 'absent':
       (changed, result) = self._delete_resource()
     else:
@@ -268,11 +511,15 @@ def main():
     :return: none
     """
     module = AnsibleModule(
-        argument_spec=ApiGwResource._define_module_argument_spec(),
+        argument_spec=client_argument_spec(ApiGwResource._define_module_argument_spec()),
+        mutually_exclusive=[['name', 'paths']],
+        required_one_of=[['name', 'paths']],
         supports_check_mode=True
     )
 
     rest_api = ApiGwResource(module)
+    report_retries(module, rest_api.client)
+
     rest_api.process_request()
 
 from ansible.module_utils.basic import *  # pylint: disable=W0614
@@ -50,6 +50,61 @@ options:
     description:
       - A description for the rest api
     required: False
+  minimum_compression_size:
+    description:
+      - Smallest response body, in bytes, that API Gateway compresses when the client accepts a compressed encoding.  Between 0 and 10485760; -1 turns compression off.  Left alone when omitted.
+    type: int
+    required: False
+  binary_media_types:
+    description:
+      - Complete list of media types (e.g. C(image/png), C(*/*)) that API Gateway treats as binary payloads.  Types missing from the list are removed, an empty list removes them all.  Left alone when omitted.
+    type: list
+    required: False
+  endpoint_type:
+    description:
+      - Type of endpoint serving the rest api.  C(REGIONAL) avoids the CloudFront hop of C(EDGE) for callers in the same region, C(PRIVATE) is only reachable through VPC endpoints.  Left alone when omitted.
+    choices: ['EDGE', 'REGIONAL', 'PRIVATE']
+    required: False
+  vpc_endpoint_ids:
+    description:
+      - Complete list of VPC endpoint ids attached to a C(PRIVATE) rest api.  Ids missing from the list are detached.  Left alone when omitted.
+    type: list
+    required: False
+  clone_from:
+    description:
+      - Name or id of an existing rest api to copy when the rest api is created.  Resources, methods, models and settings are copied server-side in a single create_rest_api call, so follow-up tasks only need to reconcile the differences.  Ignored when the rest api already exists.  Mutually exclusive with C(swagger_file) and C(swagger).
+    required: False
+  swagger_file:
+    description:
+      - Path to an OpenAPI (Swagger) definition, in JSON or YAML, to apply to the rest api.  The file is streamed from disk to API Gateway, so this is the preferred way to pass large definitions.  Mutually exclusive with C(swagger).
+    type: path
+    required: False
+  swagger:
+    description:
+      - Inline OpenAPI (Swagger) definition to apply to the rest api, either as a string or as a dictionary.  Mutually exclusive with C(swagger_file).
+    type: raw
+    required: False
+  import_mode:
+    description:
+      - How a definition is applied to an existing rest api.  C(merge) adds the definition to the current api, C(overwrite) replaces the current api with it.  C(incremental) exports the current definition from C(export_stage), compares it with the given one, and merges only the changed operations, models and settings; no definition is merged when they match, though the name and description are still reconciled.  A missing rest api is always created with import_rest_api.
+    choices: ['merge', 'overwrite', 'incremental']
+    default: 'merge'
+    required: False
+  export_stage:
+    description:
+      - Stage whose definition is exported with get_export and compared against when C(import_mode) is C(incremental).  Required in that mode.  If the stage does not exist yet, the whole definition is merged.
+    required: False
+  fail_on_warnings:
+    description:
+      - Fail the import when API Gateway reports warnings about the definition
+    type: bool
+    default: False
+    required: False
+  lookup_cache:
+    description:
+      - Path of a JSON file used as a name to id index for rest apis, shared by the tasks of a play (e.g. C({{ playbook_dir }}/.apigw-cache.json)).  The index is only written from complete listings, and a cached id is confirmed with a single get_rest_api call, so later lookups skip listing the account's apis.  Apis created outside of these modules after the index was written are not seen, so delete the file when that happens.  The file is created as needed and can be deleted at any time.
+    type: path
+    required: False
   state:
     description:
       - Determine whether to assert if api should exist or not
@@ -58,10 +113,16 @@ options:
     required: False
 requirements:
     - python = 2.7
-    - boto
     - boto3
 notes:
-    - This module requires that you have boto and boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+    - When a definition is given, the whole api surface is applied in a single import_rest_api or put_rest_api call, and the module always reports a change.  The rest api keeps the C(name) and C(description) given to the module, regardless of the definition's title.
+    - In C(incremental) mode the comparison is made against the definition deployed to C(export_stage), so deploy after each import to keep later comparisons accurate.  Operations and models are compared by the keys the given definition states; defaults that API Gateway adds on export are ignored.  Paths missing from the definition are reported as C(changes.stale_paths) but are not removed, use C(overwrite) for that.
+    - C(minimum_compression_size) and C(binary_media_types) also apply on top of an imported definition, overriding any C(x-amazon-apigateway-minimum-compression-size) or C(x-amazon-apigateway-binary-media-types) it sets.
+    - Switching C(endpoint_type) is done in place, but takes a few minutes to complete in API Gateway; the rest api keeps serving from its old endpoint meanwhile.
+    - A C(clone_from) value that looks like a rest api id is tried as an id first, then as a name.  Stages and deployments are not copied.
+    - Rest apis are looked up by name, listing every api in the account.  If that name is found more than once, the module fails instead of picking one of the apis.
+    - This module requires that you have boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+    - This module also accepts the client options C(region), C(profile), C(endpoint_url), C(retry_mode), C(max_attempts), C(connect_timeout), C(read_timeout), C(max_pool_connections), C(retry_deadline), C(rate_limits), C(rate_limit_file) and C(write_lock) to tune its boto3 client.  Unset options keep the boto3 defaults.  When C(rate_limits) or C(rate_limit_file) is set, calls are paced by control plane rate limits that all modules on the host share.  Throttled, conflicting and transient calls are retried with backoff, and the result then includes C(retries), the number of retries per operation.
 '''
 
 EXAMPLES = '''
@@ -74,12 +135,52 @@ EXAMPLES = '''
       apigw_rest_api:
         name: 'docs.example.io'
         description: 'stolen straight from the docs'
+        minimum_compression_size: 1024
+        binary_media_types:
+          - 'image/png'
+          - 'application/octet-stream'
+        endpoint_type: REGIONAL
         state: present
       register: api
 
     - name: debug
       debug: var=api
 
+- name: Stand up a new environment from an existing api
+  hosts: localhost
+  gather_facts: False
+  connection: local
+  tasks:
+    - name: Clone rest api
+      apigw_rest_api:
+        name: 'staging.docs.example.io'
+        clone_from: 'docs.example.io'
+        state: present
+      register: api
+
+- name: Import a whole api from an OpenAPI definition
+  hosts: localhost
+  gather_facts: False
+  connection: local
+  tasks:
+    - name: Create or overwrite rest api
+      apigw_rest_api:
+        name: 'docs.example.io'
+        swagger_file: 'files/docs-api.json'
+        import_mode: overwrite
+        fail_on_warnings: True
+        state: present
+      register: api
+
+    - name: Later runs only send what changed since the last deployment
+      apigw_rest_api:
+        name: 'docs.example.io'
+        swagger_file: 'files/docs-api.json'
+        import_mode: incremental
+        export_stage: prod
+        state: present
+      register: api
+
 - name: Rest api from Api Gateway
   hosts: localhost
   gather_facts: False
@@ -128,14 +229,29 @@ RETURN = '''
 
 __version__ = '${version}'
 
+import json
+import re
 try:
-  import boto3
-  import boto
-  from botocore.exceptions import BotoCoreError
+  from botocore.exceptions import BotoCoreError, ClientError
   HAS_BOTO3 = True
 except ImportError:
   HAS_BOTO3 = False
 
+try:
+  from ansible.module_utils.apigw_cache import NameCache
+  from ansible.module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from ansible.module_utils.apigw_openapi import DefinitionError, build_fragment, diff_definition, export_type, has_changes, load_definition
+  from ansible.module_utils.apigw_pages import iter_items
+  from ansible.module_utils.apigw_patch import create_patch, diff_endpoint_configuration, diff_list
+except ImportError:
+  from module_utils.apigw_cache import NameCache
+  from module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from module_utils.apigw_openapi import DefinitionError, build_fragment, diff_definition, export_type, has_changes, load_definition
+  from module_utils.apigw_pages import iter_items
+  from module_utils.apigw_patch import create_patch, diff_endpoint_configuration, diff_list
+
+MAX_COMPRESSION_SIZE = 10485760
+
 class ApiGwRestApi:
   def __init__(self, module):
     """
@@ -143,8 +259,10 @@ class ApiGwRestApi:
     """
     self.module = module
     if (not HAS_BOTO3):
-      self.module.fail_json(msg="boto and boto3 are required for this module")
-    self.client = boto3.client('apigateway')
+      self.module.fail_json(msg="boto3 is required for this module")
+    self.client = create_client(self.module)
+    self.changes = None
+    self.cache = None
 
   @staticmethod
   def _define_module_argument_spec():
@@ -154,27 +272,128 @@ class ApiGwRestApi:
     """
     return dict( name=dict(required=True),
                  description=dict(required=False),
+                 minimum_compression_size=dict(required=False, type='int'),
+                 binary_media_types=dict(required=False, type='list'),
+                 endpoint_type=dict(required=False, choices=['EDGE', 'REGIONAL', 'PRIVATE']),
+                 vpc_endpoint_ids=dict(required=False, type='list'),
+                 clone_from=dict(required=False),
+                 swagger_file=dict(required=False, type='path'),
+                 swagger=dict(required=False, type='raw'),
+                 import_mode=dict(default='merge', choices=['merge', 'overwrite', 'incremental']),
+                 export_stage=dict(required=False),
+                 fail_on_warnings=dict(required=False, type='bool', default=False),
+                 lookup_cache=dict(required=False, type='path'),
                  state=dict(default='present', choices=['present', 'absent'])
     )
 
-  def _retrieve_rest_api(self):
+  def _open_lookup_cache(self):
+    """
+    Opens the name to id index when lookup_cache is set
+    :return: NameCache for the client's region, or None
+    """
+    if not self.module.params.get('lookup_cache'):
+      return None
+
+    return NameCache(
+      self.module.params.get('lookup_cache'),
+      "rest_apis:{0}".format(self.client.meta.region_name)
+    )
+
+  def _retrieve_cached_rest_api(self, name):
     """
-    Retrieve all rest APIs in the account and match it against the provided name
-    :return: Result matching the provided api name or an empty hash
+    Confirm the id cached for name with get_rest_api
+    :param name: Name of the rest api
+    :return: The rest api, or None when the cache has no usable entry
     """
-    response = None
+    ids = self.cache.get(name)
+    if not ids:
+      return None
+    if len(ids) > 1:
+      self.module.fail_json(msg="Found {0} rest apis named {1}: {2}".format(len(ids), name, ', '.join(str(i) for i in ids)))
+      return None
+
     try:
-      results = self.client.get_rest_apis()
-      id = self.module.params.get('name')
+      api = self.client.get_rest_api(restApiId=ids[0])
+      api.pop('ResponseMetadata', None)
+      if api.get('name') == name:
+        return api
+    except ClientError as e:
+      if 'NotFoundException' not in e.message:
+        self.module.fail_json(msg="Encountered fatal error calling boto3 get_rest_api function: {0}".format(e))
+        return None
+    except BotoCoreError as e:
+      self.module.fail_json(msg="Encountered fatal error calling boto3 get_rest_api function: {0}".format(e))
+      return None
 
-      api = filter(lambda result: result['name'] == id, results['items'])
+    self.cache.discard(name)
+    return None
 
-      if len(api):
-        response = api[0]
+  def _retrieve_rest_api(self, name=None):
+    """
+    Page through every rest API in the account.  As the listing is complete,
+    it replaces the names recorded in the lookup cache.
+    :param name: Name to look for, defaults to the name param
+    :return: Result matching the provided api name or None.  Fails when the name is not unique.
+    """
+    name = self.module.params.get('name') if name is None else name
+    if self.cache is not None:
+      api = self._retrieve_cached_rest_api(name)
+      if api is not None:
+        return api
+
+    seen = {}
+    try:
+      for item in iter_items(self.client.get_rest_apis):
+        seen.setdefault(item['name'], []).append(item)
     except BotoCoreError as e:
       self.module.fail_json(msg="Encountered fatal error calling boto3 get_rest_apis function: {0}".format(e))
+      return None
+
+    if self.cache is not None:
+      for cached_name in self.cache.names():
+        if cached_name not in seen:
+          self.cache.discard(cached_name)
+      for (seen_name, apis) in seen.iteritems():
+        self.cache.put(seen_name, [a['id'] for a in apis])
+      self.cache.save()
 
-    return response
+    matches = seen.get(name, [])
+    if len(matches) > 1:
+      self.module.fail_json(msg="Found {0} rest apis named {1}: {2}".format(
+        len(matches), name, ', '.join(str(a['id']) for a in matches)))
+      return None
+
+    return matches[0] if matches else None
+
+  @staticmethod
+  def _build_patches(api, params):
+    """
+    Builds the patch operations that bring the discovered api in line with the user-provided params
+    :param api: Result from _retrieve_rest_api()
+    :param params: Module params
+    :return: List of patch operations, empty when the api matches
+    """
+    patches = []
+    if api.get('name') != params.get('name') or api.get('description') != params.get('description'):
+      description = "" if params.get('description') is None else params.get('description')
+      patches.append({'op': 'replace', 'path': '/name', 'value': params.get('name')})
+      patches.append({'op': 'replace', 'path': '/description', 'value': description})
+
+    size = params.get('minimum_compression_size')
+    current = api.get('minimumCompressionSize')
+    if size is not None and size < 0:
+      if current is not None:
+        patches.append(create_patch('replace', 'minimumCompressionSize', value=''))
+    elif size is not None and size != current:
+      patches.append(create_patch('replace', 'minimumCompressionSize', value=size))
+
+    if params.get('binary_media_types') is not None:
+      patches.extend(diff_list(api.get('binaryMediaTypes'), params.get('binary_media_types'), 'binaryMediaTypes'))
+
+    patches.extend(diff_endpoint_configuration(
+      api.get('endpointConfiguration'), params.get('endpoint_type'), params.get('vpc_endpoint_ids')))
+
+    return patches
 
   @staticmethod
   def _is_changed(api, params):
@@ -184,7 +403,7 @@ class ApiGwRestApi:
     :param params: Module params
     :return: Boolean telling if result matches params
     """
-    return api.get('name') != params.get('name') or api.get('description') != params.get('description')
+    return len(ApiGwRestApi._build_patches(api, params)) > 0
 
   def _create_or_update_api(self, api):
     """
@@ -197,7 +416,7 @@ class ApiGwRestApi:
     if not api:
       changed, api = self._create_api()
     elif ApiGwRestApi._is_changed(api, self.module.params):
-      changed, api = self._update_api(api.get('id'))
+      changed, api = self._update_api(api)
 
     return changed, api
 
@@ -220,29 +439,51 @@ class ApiGwRestApi:
 
     return changed, api
 
-  def _update_api(self, id):
+  def _update_api(self, current):
     """
-    Updates the API with the provided id using boto3
-    :param id: Id of the discovered rest api
+    Updates the discovered API using boto3
+    :param current: The discovered rest api
     :return: (changed, result)
               changed: Boolean showing whether a change occurred
               result: The resulting rest api object after the update
     """
     api = None
-    description = "" if self.module.params.get('description') is None else self.module.params.get('description')
+    patches = ApiGwRestApi._build_patches(current, self.module.params)
     try:
       if not self.module.check_mode:
-        api = self.client.update_rest_api(restApiId=id, patchOperations=[
-          {'op': 'replace', 'path': '/name', 'value': self.module.params.get('name')},
-          {'op': 'replace', 'path': '/description', 'value': description},
-        ])
+        api = self.client.update_rest_api(restApiId=current.get('id'), patchOperations=patches)
     except BotoCoreError as e:
       self.module.fail_json(msg="Encountered fatal error calling boto3 update_rest_api function: {0}".format(e))
     return True, api
 
+  def _resolve_clone_source(self):
+    """
+    Finds the id of the rest api named by clone_from, which may be an id or a name
+    :return: The id of the source api, or fails when there is none
+    """
+    source = self.module.params.get('clone_from')
+
+    if re.match(r'^[a-z0-9]{10}$', source):
+      try:
+        return self.client.get_rest_api(restApiId=source)['id']
+      except ClientError as e:
+        if 'NotFoundException' not in e.message:
+          self.module.fail_json(msg="Encountered fatal error calling boto3 get_rest_api function: {0}".format(e))
+          return None
+      except BotoCoreError as e:
+        self.module.fail_json(msg="Encountered fatal error calling boto3 get_rest_api function: {0}".format(e))
+        return None
+
+    api = self._retrieve_rest_api(source)
+    if api is None:
+      self.module.fail_json(msg="Unable to find rest api {0} to clone from".format(source))
+      return None
+
+    return api.get('id')
+
   def _create_api(self):
     """
-    Creates a new api based on user input
+    Creates a new api based on user input, copying clone_from when provided
     :return: (True, result)
               True
               result: The resulting rest api object after the create
@@ -251,6 +492,16 @@ class ApiGwRestApi:
     kwargs = dict(name=self.module.params.get('name'))
     if self.module.params.get('description'):
       kwargs['description'] = self.module.params.get('description')
+    if self.module.params.get('minimum_compression_size') is not None and self.module.params.get('minimum_compression_size') >= 0:
+      kwargs['minimumCompressionSize'] = self.module.params.get('minimum_compression_size')
+    if self.module.params.get('binary_media_types'):
+      kwargs['binaryMediaTypes'] = self.module.params.get('binary_media_types')
+    if self.module.params.get('endpoint_type'):
+      kwargs['endpointConfiguration'] = {'types': [self.module.params.get('endpoint_type')]}
+      if self.module.params.get('vpc_endpoint_ids'):
+        kwargs['endpointConfiguration']['vpcEndpointIds'] = self.module.params.get('vpc_endpoint_ids')
+    if self.module.params.get('clone_from'):
+      kwargs['cloneFrom'] = self._resolve_clone_source()
     try:
       if not self.module.check_mode:
         api = self.client.create_rest_api(**kwargs)
@@ -258,20 +509,178 @@ class ApiGwRestApi:
       self.module.fail_json(msg="Encountered fatal error calling boto3 create_rest_api function: {0}".format(e))
     return True, api
 
+  def _open_definition(self):
+    """
+    Opens the OpenAPI definition provided by the user
+    :return: A file object for swagger_file, so the body is streamed from disk,
+             or the inline swagger document as a string
+    """
+    if self.module.params.get('swagger_file'):
+      return open(self.module.params.get('swagger_file'), 'rb')
+
+    definition = self.module.params.get('swagger')
+    if isinstance(definition, (dict, list)):
+      definition = json.dumps(definition)
+    return definition
+
+  def _read_definition(self):
+    """
+    Reads the OpenAPI definition provided by the user into memory
+    :return: The definition as a string
+    """
+    definition = self._open_definition()
+    if hasattr(definition, 'read'):
+      with definition as f:
+        return f.read()
+    return definition
+
+  def _import_api(self, api):
+    """
+    Applies the OpenAPI definition: import_rest_api when the api does not
+    exist, put_rest_api in the configured mode otherwise.  The name and
+    description are then reconciled as usual.
+    :param api: The discovered API, or None
+    :return: (changed, result)
+              changed: Boolean showing whether a change occurred
+              result: The resulting rest api object
+    """
+    changed = True
+    if api is not None and self.module.params.get('import_mode') == 'incremental':
+      (changed, api) = self._incremental_import(api)
+      if api is None:
+        return changed, api
+    elif self.module.check_mode:
+      return True, api
+    else:
+      function = 'import_rest_api' if api is None else 'put_rest_api'
+      body = None
+      try:
+        body = self._open_definition()
+        kwargs = dict(failOnWarnings=self.module.params.get('fail_on_warnings', False), body=body)
+        if api is None:
+          api = self.client.import_rest_api(**kwargs)
+        else:
+          mode = 'overwrite' if self.module.params.get('import_mode') == 'overwrite' else 'merge'
+          api = self.client.put_rest_api(restApiId=api.get('id'), mode=mode, **kwargs)
+      except (IOError, OSError) as e:
+        self.module.fail_json(msg="Error reading OpenAPI definition: {0}".format(e))
+        return True, None
+      except (BotoCoreError, ClientError) as e:
+        self.module.fail_json(msg="Encountered fatal error calling boto3 {0} function: {1}".format(function, e))
+        return True, None
+      finally:
+        if hasattr(body, 'close'):
+          body.close()
+
+    if ApiGwRestApi._is_changed(api, self.module.params):
+      (changed, updated) = self._update_api(api)
+      if updated is not None:
+        api = updated
+
+    return changed, api
+
+  def _export_definition(self, api, doc_type):
+    """
+    Exports the definition currently deployed to export_stage
+    :param api: The discovered API
+    :param doc_type: get_export exportType
+    :return: The parsed definition, or None when the stage does not exist
+    """
+    try:
+      response = self.client.get_export(
+        restApiId=api.get('id'),
+        stageName=self.module.params.get('export_stage'),
+        exportType=doc_type,
+        parameters={'extensions': 'apigateway'},
+        accepts='application/json'
+      )
+      return json.loads(response['body'].read())
+    except ClientError as e:
+      if 'NotFoundException' in e.message:
+        return None
+      self.module.fail_json(msg="Encountered fatal error calling boto3 get_export function: {0}".format(e))
+    except (BotoCoreError, ValueError) as e:
+      self.module.fail_json(msg="Encountered fatal error calling boto3 get_export function: {0}".format(e))
+
+  def _incremental_import(self, api):
+    """
+    Compares the user's definition with the one deployed to export_stage and
+    merges only what changed
+    :param api: The discovered API
+    :return: (changed, result)
+              changed: Boolean showing whether a change occurred
+              result: The resulting rest api object
+    """
+    if not self.module.params.get('export_stage'):
+      self.module.fail_json(msg="export_stage is required when import_mode is 'incremental'")
+      return False, api
+
+    try:
+      desired = load_definition(self._read_definition())
+    except (IOError, OSError) as e:
+      self.module.fail_json(msg="Error reading OpenAPI definition: {0}".format(e))
+      return False, api
+    except DefinitionError as e:
+      self.module.fail_json(msg="Error parsing OpenAPI definition: {0}".format(e))
+      return False, api
+
+    current = self._export_definition(api, export_type(desired))
+    if current is None:
+      body = desired
+      self.changes = diff_definition({}, desired)
+    else:
+      self.changes = diff_definition(current, desired)
+      if not has_changes(self.changes):
+        return False, api
+      body = build_fragment(desired, self.changes)
+
+    if self.module.check_mode:
+      return True, api
+
+    try:
+      result = self.client.put_rest_api(
+        restApiId=api.get('id'),
+        mode='merge',
+        failOnWarnings=self.module.params.get('fail_on_warnings', False),
+        body=json.dumps(body)
+      )
+    except (BotoCoreError, ClientError) as e:
+      self.module.fail_json(msg="Encountered fatal error calling boto3 put_rest_api function: {0}".format(e))
+      return True, api
+
+    return True, result
+
   def process_request(self):
     """
     Process the user's request -- the primary code path
     :return: Returns either fail_json or exit_json
     """
     params = self.module.params
+    if params.get('minimum_compression_size') is not None and params.get('minimum_compression_size') > MAX_COMPRESSION_SIZE:
+      return self.module.fail_json(msg="minimum_compression_size must be at most {0}".format(MAX_COMPRESSION_SIZE))
+    if params.get('vpc_endpoint_ids') and params.get('endpoint_type') not in [None, 'PRIVATE']:
+      return self.module.fail_json(msg="vpc_endpoint_ids can only be set when endpoint_type is PRIVATE")
+
+    self.cache = self._open_lookup_cache()
     api = self._retrieve_rest_api()
     changed = False
 
     if params.get('state') == 'absent':
       changed, api = self._maybe_delete_api(api)
+    elif params.get('swagger_file') or params.get('swagger'):
+      changed, api = self._import_api(api)
     else:
       changed, api = self._create_or_update_api(api)
 
+    if self.cache is not None and changed and not self.module.check_mode:
+      if params.get('state') == 'absent':
+        self.cache.discard(params.get('name'))
+      elif api and api.get('id'):
+        self.cache.put(params.get('name'), [api.get('id')])
+      self.cache.save()
+
+    if self.changes is not None:
+      return self.module.exit_json(changed=changed, api=api, changes=self.changes)
     return self.module.exit_json(changed=changed, api=api)
 
 
@@ -281,11 +690,14 @@ def main():
     :return: none
     """
     module = AnsibleModule(
-        argument_spec=ApiGwRestApi._define_module_argument_spec(),
+        argument_spec=client_argument_spec(ApiGwRestApi._define_module_argument_spec()),
+        mutually_exclusive=[['swagger_file', 'swagger'], ['clone_from', 'swagger_file'], ['clone_from', 'swagger']],
         supports_check_mode=True
     )
 
     rest_api = ApiGwRestApi(module)
+    report_retries(module, rest_api.client)
+
     rest_api.process_request()
 
 from ansible.module_utils.basic import *  # pylint: disable=W0614
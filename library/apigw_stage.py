@@ -108,11 +108,11 @@ options:
 
 requirements:
     - python = 2.7
-    - boto
     - boto3
 notes:
     - This module does not currently create stages, as these are a byproduct of executing deployments.
-    - This module requires that you have boto and boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+    - This module requires that you have boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+    - This module also accepts the client options C(region), C(profile), C(endpoint_url), C(retry_mode), C(max_attempts), C(connect_timeout), C(read_timeout), C(max_pool_connections), C(retry_deadline), C(rate_limits), C(rate_limit_file) and C(write_lock) to tune its boto3 client.  Unset options keep the boto3 defaults.  When C(rate_limits) or C(rate_limit_file) is set, calls are paced by control plane rate limits that all modules on the host share.  Throttled, conflicting and transient calls are retried with backoff, and the result then includes C(retries), the number of retries per operation.
 '''
 
 EXAMPLES = '''
@@ -193,48 +193,43 @@ __version__ = '${version}'
 
 import copy
 try:
-  import boto3
-  import boto
   from botocore.exceptions import BotoCoreError, ClientError
   HAS_BOTO3 = True
 except ImportError:
   HAS_BOTO3 = False
 
-def create_patch(path, value):
-  return {'op': 'replace', 'path': "/{}".format(path), 'value': str(value)}
+try:
+  from ansible.module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from ansible.module_utils.apigw_patch import create_patch, diff_fields, escape_path, values_equal
+except ImportError:
+  from module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from module_utils.apigw_patch import create_patch, diff_fields, escape_path, values_equal
+
+# To avoid unnecessary changes and complexity, I am punting on attempting
+# to resolve discrepancies between existing Stage values and parameters
+# that the user has not provided.  This may create an edge case somewhere,
+# but it seems overall safer than potentially hosing up cache settings
+# for the entire Stage.
+STAGE_FIELDS = [
+  {'ansible': 'description', 'boto': 'description', 'op': 'replace'},
+  {'ansible': 'cache_cluster_enabled', 'boto': 'cacheClusterEnabled', 'op': 'replace'},
+  {'ansible': 'cache_cluster_size', 'boto': 'cacheClusterSize', 'op': 'replace'},
+]
 
 def build_patch_args(stage, params):
   args = None
 
-  arg_map = {
-    'description': 'description',
-    'cache_cluster_enabled': 'cacheClusterEnabled',
-    'cache_cluster_size': 'cacheClusterSize',
-  }
-
   stage = {} if stage is None else stage
   stg_methods = stage.get('methodSettings', {})
 
-  patches = []
-  for ans_param, boto_param in arg_map.iteritems():
-    if ans_param in params and params[ans_param] is not None:
-      if boto_param in stage and str(params[ans_param]) == str(stage[boto_param]):
-        pass
-      else:
-        patches.append(create_patch(boto_param, params[ans_param]))
-    else:
-      # To avoid unnecessary changes and complexity, I am punting on attempting
-      # to resolve discrepancies between existing Stage values and parameters
-      # that the user has not provided.  This may create an edge case somewhere,
-      # but it seems overall safer than potentially hosing up cache settings
-      # for the entire Stage.
-      pass
+  patches = diff_fields(stage, params, STAGE_FIELDS)
 
   for m in params.get('method_settings', []):
-    method_key = "{0}/{1}".format(re.sub('/', '~1', m['method_name']), m['method_verb'])
+    method_key = "{0}/{1}".format(escape_path(m['method_name']), m['method_verb'])
+    caching_enabled = m.get('caching_enabled', False)
 
-    if method_key not in stg_methods or str(stg_methods[method_key]['cachingEnabled']) != str(m.get('caching_enabled', False)):
-      patches.append(create_patch("{}/caching/enabled".format(method_key), m.get('caching_enabled', False)))
+    if method_key not in stg_methods or not values_equal(caching_enabled, stg_methods[method_key]['cachingEnabled']):
+      patches.append(create_patch('replace', "{}/caching/enabled".format(method_key), value=caching_enabled))
 
   if patches:
     args = {
@@ -252,8 +247,8 @@ class ApiGwStage:
     """
     self.module = module
     if (not HAS_BOTO3):
-      self.module.fail_json(msg="boto and boto3 are required for this module")
-    self.client = boto3.client('apigateway')
+      self.module.fail_json(msg="boto3 is required for this module")
+    self.client = create_client(self.module)
 
   @staticmethod
   def _define_module_argument_spec():
@@ -366,11 +361,13 @@ def main():
     :return: none
     """
     module = AnsibleModule(
-        argument_spec=ApiGwStage._define_module_argument_spec(),
+        argument_spec=client_argument_spec(ApiGwStage._define_module_argument_spec()),
         supports_check_mode=True
     )
 
     stage = ApiGwStage(module)
+    report_retries(module, stage.client)
+
     stage.process_request()
 
 from ansible.module_utils.basic import *  # pylint: disable=W0614
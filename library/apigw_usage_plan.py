@@ -11,8 +11,8 @@
 #    Manage creation, update, and removal of API Gateway UsagePlan resources
 #
 # NOTE: While it is possible via the boto api to update the UsagePlan's name,
-#       this module does not support this functionality since it searches
-#       for the UsagePlan's id by its name.
+#       this module only supports this functionality when usage_plan_id is
+#       given, since it otherwise searches for the UsagePlan's id by its name.
 
 # MIT License
 #
@@ -43,7 +43,7 @@ author: Brian Felton (@bjfelton)
 short_description: Add, update, or remove UsagePlan and UsagePlanKey resources
 description:
 - Basic CRUD operations on Usage Plan Key resources
-- Does not support updating name (see Notes)
+- Does not support updating name unless C(usage_plan_id) is given (see Notes)
 version_added: "2.2"
 options:
   name:
@@ -51,6 +51,18 @@ options:
     - The domain name of the UsagePlan resource on which to operate
     type: string
     required: True
+  usage_plan_id:
+    description:
+    - Id of the UsagePlan resource on which to operate.  The plan is read with a single get_usage_plan call instead of listing plans by name, and is renamed to C(name) if needed.  Fails with C(state=present) when no plan has this id.
+    type: string
+    default: None
+    required: False
+  lookup_key_id:
+    description:
+    - When looking the plan up by name, only consider plans that the ApiKey with this id is associated with.  API Gateway filters the listing server-side, so fewer pages are read.  When none of those plans has the name, every plan is searched before a new one is created.
+    type: string
+    default: None
+    required: False
   description:
     description:
     - UsagePlan description
@@ -113,11 +125,12 @@ options:
     required: False
 requirements:
     - python = 2.7
-    - boto
     - boto3
 notes:
-- While it is possible via the boto api to update the UsagePlan's name, this module does not support this functionality since it searches for the UsagePlan's id by its name.
-- This module requires that you have boto and boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+- While it is possible via the boto api to update the UsagePlan's name, this module only supports this functionality when C(usage_plan_id) is given, since it otherwise searches for the UsagePlan's id by its name.
+- Plans are looked up by name a page at a time, stopping at the first match.  Updates return the update_usage_plan response rather than looking the plan up again.
+- This module requires that you have boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+- This module also accepts the client options C(region), C(profile), C(endpoint_url), C(retry_mode), C(max_attempts), C(connect_timeout), C(read_timeout), C(max_pool_connections), C(retry_deadline), C(rate_limits), C(rate_limit_file) and C(write_lock) to tune its boto3 client.  Unset options keep the boto3 defaults.  When C(rate_limits) or C(rate_limit_file) is set, calls are paced by control plane rate limits that all modules on the host share.  Throttled, conflicting and transient calls are retried with backoff, and the result then includes C(retries), the number of retries per operation.
 '''
 
 EXAMPLES = '''
@@ -141,6 +154,15 @@ EXAMPLES = '''
     register: plan
 
   - debug: var=plan
+
+  - name: tighten the plan of a known customer key
+    apigw_usage_plan:
+      name: testplan
+      lookup_key_id: zyxw9876
+      throttle_burst_limit: 50
+      throttle_rate_limit: 25.0
+      state: present
+    register: plan
 '''
 
 RETURN = '''
@@ -183,13 +205,20 @@ RETURN = '''
 __version__ = '${version}'
 
 try:
-  import boto3
-  import boto
-  from botocore.exceptions import BotoCoreError
+  from botocore.exceptions import BotoCoreError, ClientError
   HAS_BOTO3 = True
 except ImportError:
   HAS_BOTO3 = False
 
+try:
+  from ansible.module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from ansible.module_utils.apigw_pages import iter_items
+  from ansible.module_utils.apigw_usage_plan_spec import PARAM_MAP, all_defaults, api_stages_remove_patches, create_args, create_patches, is_default_value
+except ImportError:
+  from module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from module_utils.apigw_pages import iter_items
+  from module_utils.apigw_usage_plan_spec import PARAM_MAP, all_defaults, api_stages_remove_patches, create_args, create_patches, is_default_value
+
 class ApiGwUsagePlan:
   def __init__(self, module):
     """
@@ -197,15 +226,9 @@ class ApiGwUsagePlan:
     """
     self.module = module
     if (not HAS_BOTO3):
-      self.module.fail_json(msg="boto and boto3 are required for this module")
-    self.client = boto3.client('apigateway')
-    self.param_map = {
-      'throttle_burst_limit': 'throttle/burstLimit',
-      'throttle_rate_limit': 'throttle/rateLimit',
-      'quota_offset': 'quota/offset',
-      'quota_limit': 'quota/limit',
-      'quota_period': 'quota/period',
-    }
+      self.module.fail_json(msg="boto3 is required for this module")
+    self.client = create_client(self.module)
+    self.param_map = dict(PARAM_MAP)
 
   @staticmethod
   def _define_module_argument_spec():
@@ -214,6 +237,8 @@ class ApiGwUsagePlan:
     :return: Dictionary defining module arguments
     """
     return dict( name=dict(required=True),
+                 usage_plan_id=dict(required=False),
+                 lookup_key_id=dict(required=False),
                  description=dict(required=False, default=''),
                  api_stages=dict(
                    type='list',
@@ -232,29 +257,56 @@ class ApiGwUsagePlan:
 
   def _retrieve_usage_plan(self):
     """
-    Retrieve all usage_plans in the account and match them against the provided name
-    :return: Result matching the provided api name or an empty hash
+    Retrieve the usage_plan by usage_plan_id, or else page through the usage_plans
+    in the account, stopping at the first one matching the provided name
+    :return: Result matching the provided id or name, or None
     """
+    if self.module.params.get('usage_plan_id'):
+      return self._retrieve_usage_plan_by_id()
+
     resp = None
     try:
-      get_resp = self.client.get_usage_plans()
-
-      for item in get_resp.get('items', []):
-        if item['name'] == self.module.params.get('name'):
-          resp = item
+      if self.module.params.get('lookup_key_id'):
+        resp = self._find_usage_plan_by_name(keyId=self.module.params['lookup_key_id'])
+      if resp is None:
+        # A plan with the name may exist without being linked to the key
+        resp = self._find_usage_plan_by_name()
     except BotoCoreError as e:
       self.module.fail_json(msg="Error when getting usage_plans from boto3: {}".format(e))
 
     return resp
 
+  def _find_usage_plan_by_name(self, **kwargs):
+    """
+    Page through get_usage_plans, stopping at the first plan matching the provided name
+    :param kwargs: Extra arguments for get_usage_plans, e.g. keyId
+    :return: The matching plan, or None.  Errors from boto3 are raised.
+    """
+    for item in iter_items(self.client.get_usage_plans, **kwargs):
+      if item['name'] == self.module.params.get('name'):
+        return item
+    return None
+
+  def _retrieve_usage_plan_by_id(self):
+    """
+    Retrieve the usage_plan matching usage_plan_id with get_usage_plan
+    :return: The usage plan, or None when it does not exist
+    """
+    resp = None
+    try:
+      resp = self.client.get_usage_plan(usagePlanId=self.module.params['usage_plan_id'])
+      resp.pop('ResponseMetadata', None)
+    except ClientError as e:
+      if 'NotFoundException' not in e.message:
+        self.module.fail_json(msg="Error when getting usage_plan from boto3: {}".format(e))
+    except BotoCoreError as e:
+      self.module.fail_json(msg="Error when getting usage_plan from boto3: {}".format(e))
+
+    return resp
+
   @staticmethod
   def _build_api_stages_remove_patches(me):
-    patches = []
-    for entry in me.get('apiStages', []):
-      key = "{0}:{1}".format(entry['apiId'], entry['stage'])
-      patches.append({'op': 'remove', 'path': '/apiStages', 'value': key})
-
-    return patches
+    return api_stages_remove_patches(me)
 
   def _delete_usage_plan(self):
     """
@@ -275,12 +327,7 @@ class ApiGwUsagePlan:
 
   @staticmethod
   def _is_default_value(param_name, param_value):
-    defaults = ApiGwUsagePlan._define_module_argument_spec()
-
-    if defaults[param_name].get('type', 'string') in ['int', 'float']:
-      return param_value < 0
-    else:
-      return param_value in [None, '']
+    return is_default_value(param_name, param_value)
 
   def _create_usage_plan(self):
     """
@@ -293,25 +340,7 @@ class ApiGwUsagePlan:
     try:
       changed = True
       if not self.module.check_mode:
-        args = dict(name=self.module.params['name'])
-
-        for f in ['description','throttle_burst_limit','throttle_rate_limit','quota_limit','quota_period','quota_offset']:
-          if not ApiGwUsagePlan._is_default_value(f, self.module.params.get(f, None)):
-            boto_param = self.param_map.get(f, f)
-            if '/' in boto_param:
-              (p1, p2) = boto_param.split('/')
-              if p1 not in args:
-                args[p1] = {}
-              args[p1].update({p2: self.module.params[f]})
-            else:
-              args[boto_param] = self.module.params[f]
-
-        for stage in self.module.params.get('api_stages', []):
-          if 'apiStages' not in args:
-            args['apiStages'] = []
-          args['apiStages'].append({'apiId': stage.get('rest_api_id'), 'stage': stage.get('stage')})
-
-        usage_plan = self.client.create_usage_plan(**args)
+        usage_plan = self.client.create_usage_plan(**create_args(self.module.params, self.param_map))
     except BotoCoreError as e:
       self.module.fail_json(msg="Error when creating usage_plan via boto3: {}".format(e))
 
@@ -319,51 +348,11 @@ class ApiGwUsagePlan:
 
   @staticmethod
   def _all_defaults(ans_params, params_list):
-    is_default = False
-    for p in params_list:
-      is_default = is_default or ApiGwUsagePlan._is_default_value(p, ans_params.get(p, None))
-
-    return is_default
+    return all_defaults(ans_params, params_list)
 
   @staticmethod
   def _create_patches(params, me, pmap):
-    patches = []
-
-    # delete ops
-    if 'throttle' in me and ApiGwUsagePlan._all_defaults(params, ['throttle_rate_limit','throttle_burst_limit']):
-      patches.append({'op': 'remove', 'path': "/throttle"})
-    if 'quota' in me and ApiGwUsagePlan._all_defaults(params, ['quota_limit','quota_offset','quota_period']):
-      patches.append({'op': 'remove', 'path': "/quota"})
-    if 'apiStages' in me and params.get('api_stages', []) == []:
-      patches.extend(ApiGwUsagePlan._build_api_stages_remove_patches(me))
-
-    # add/replace ops
-    for p in ['description','throttle_rate_limit','throttle_burst_limit','quota_limit','quota_offset','quota_period']:
-      boto_param = pmap.get(p, p)
-      if '/' in boto_param:
-        (parent, child) = boto_param.split('/')
-        if not ApiGwUsagePlan._is_default_value(p, params.get(p, None)):
-          if child not in me.get(parent, {}):
-            patches.append({'op': 'add', 'path': "/{}".format(boto_param), 'value': str(params[p])})
-          elif me[parent][child] != params[p]:
-            patches.append({'op': 'replace', 'path': "/{}".format(boto_param), 'value': str(params[p])})
-      else:
-        # must be description
-        if p not in me and params.get(p, '') in [None, '']:
-          pass
-        elif p in me and me[p] != params.get(p, ''):
-          patches.append({'op': 'replace', 'path': "/{}".format(boto_param), 'value': str(params.get(p, ''))})
-
-    # add handling for api_stages
-    api_stages = []
-    for stage in me.get('apiStages', []):
-      api_stages.append("{0}:{1}".format(stage['apiId'], stage['stage']))
-    for entry in params.get('api_stages', []):
-      key = "{0}:{1}".format(entry['rest_api_id'], entry['stage'])
-      if key not in api_stages:
-        patches.append({'op': 'add', 'path': '/apiStages', 'value': key})
-
-    return patches
+    return create_patches(params, me, pmap)
 
   def _update_usage_plan(self):
     """
@@ -375,15 +364,16 @@ class ApiGwUsagePlan:
 
     try:
       patches = ApiGwUsagePlan._create_patches(self.module.params, self.me, self.param_map)
+      if self.module.params.get('usage_plan_id') and self.me.get('name') != self.module.params['name']:
+        patches.insert(0, {'op': 'replace', 'path': '/name', 'value': self.module.params['name']})
       if patches:
         changed = True
 
         if not self.module.check_mode:
-          self.client.update_usage_plan(
+          usage_plan = self.client.update_usage_plan(
             usagePlanId=self.me['id'],
             patchOperations=patches
           )
-          usage_plan = self._retrieve_usage_plan()
     except BotoCoreError as e:
       self.module.fail_json(msg="Error when updating usage_plan via boto3: {}".format(e))
 
@@ -402,7 +392,9 @@ class ApiGwUsagePlan:
     if self.module.params.get('state', 'present') == 'absent' and self.me is not None:
       changed = self._delete_usage_plan()
     elif self.module.params.get('state', 'present') == 'present':
-      if self.me is None:
+      if self.me is None and self.module.params.get('usage_plan_id'):
+        return self.module.fail_json(msg="Unable to find usage_plan {}".format(self.module.params['usage_plan_id']))
+      elif self.me is None:
         (changed, usage_plan) = self._create_usage_plan()
       else:
         (changed, usage_plan) = self._update_usage_plan()
@@ -415,11 +407,13 @@ def main():
     :return: none
     """
     module = AnsibleModule(
-        argument_spec=ApiGwUsagePlan._define_module_argument_spec(),
+        argument_spec=client_argument_spec(ApiGwUsagePlan._define_module_argument_spec()),
         supports_check_mode=True
     )
 
     usage_plan = ApiGwUsagePlan(module)
+    report_retries(module, usage_plan.client)
+
     usage_plan.process_request()
 
 from ansible.module_utils.basic import *  # pylint: disable=W0614
@@ -40,6 +40,7 @@ author: Brian Felton (@bjfelton)
 short_description: Add or remove UsagePlanKey resources
 description:
 - Create or remove Usage Plan Key resources
+- Manages a single key with C(api_key_id), or reconciles a whole list of keys with C(api_key_ids)
 version_added: "2.2"
 options:
   usage_plan_id:
@@ -49,9 +50,32 @@ options:
     required: True
   api_key_id:
     description:
-    - Id of the UsagePlan resource to which a key will be associated
+    - Id of the ApiKey resource to associate with the usage plan.  One of C(api_key_id) or C(api_key_ids) is required.
     type: string
-    required: True
+    required: False
+  api_key_ids:
+    description:
+    - Ids of the ApiKey resources to associate with the usage plan in bulk.  The plan's current keys are paged through once and compared with this list, and only the differences are written.  With C(state=absent), the listed keys are removed from the plan.
+    type: list
+    required: False
+  purge_keys:
+    description:
+    - With C(api_key_ids) and C(state=present), also remove keys that are associated with the plan but missing from the list
+    type: bool
+    default: False
+    required: False
+  concurrency:
+    description:
+    - Maximum number of concurrent create_usage_plan_key and delete_usage_plan_key calls when C(api_key_ids) is used
+    type: int
+    default: 4
+    required: False
+  rate_limit:
+    description:
+    - Upper bound on create_usage_plan_key and delete_usage_plan_key calls per second, across all workers and module processes on the host, when C(api_key_ids) is used.  It sets the C(*_usage_plan_key) budget of the client's shared rate limits, which C(rate_limits) can override.  0 removes the bound.  Throttled calls are retried with backoff either way.
+    type: float
+    default: 10
+    required: False
   key_type:
     description:
     - Type of the api key.  You can choose any value you like, so long as you choose 'API_KEY'.
@@ -67,10 +91,11 @@ options:
     required: False
 requirements:
     - python = 2.7
-    - boto
     - boto3
 notes:
-    - This module requires that you have boto and boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+    - With C(api_key_ids), the module returns C(usage_plan_keys.added) and C(usage_plan_keys.removed) instead of C(usage_plan_key).  When some of the calls fail, the module fails with C(usage_plan_keys) listing the keys that were added and removed before it stopped.
+    - This module requires that you have boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+    - This module also accepts the client options C(region), C(profile), C(endpoint_url), C(retry_mode), C(max_attempts), C(connect_timeout), C(read_timeout), C(max_pool_connections), C(retry_deadline), C(rate_limits), C(rate_limit_file) and C(write_lock) to tune its boto3 client.  Unset options keep the boto3 defaults.  When C(rate_limits) or C(rate_limit_file) is set, calls are paced by control plane rate limits that all modules on the host share.  Throttled, conflicting and transient calls are retried with backoff, and the result then includes C(retries), the number of retries per operation.
 '''
 
 EXAMPLES = '''
@@ -87,6 +112,16 @@ EXAMPLES = '''
     register: plankey
 
   - debug: var=plankey
+
+  - name: make the plan hold exactly these keys
+    apigw_usage_plan_key:
+      usage_plan_id: 12345abcde
+      api_key_ids: "{{ customer_key_ids }}"
+      purge_keys: True
+      concurrency: 8
+      rate_limit: 10
+      state: present
+    register: plankeys
 '''
 
 RETURN = '''
@@ -113,14 +148,21 @@ RETURN = '''
 
 __version__ = '${version}'
 
+from multiprocessing.pool import ThreadPool
+
 try:
-  import boto3
-  import boto
-  from botocore.exceptions import BotoCoreError
+  from botocore.exceptions import BotoCoreError, ClientError
   HAS_BOTO3 = True
 except ImportError:
   HAS_BOTO3 = False
 
+try:
+  from ansible.module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from ansible.module_utils.apigw_pages import iter_items
+except ImportError:
+  from module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from module_utils.apigw_pages import iter_items
+
 class ApiGwUsagePlanKey:
   def __init__(self, module):
     """
@@ -128,8 +170,8 @@ class ApiGwUsagePlanKey:
     """
     self.module = module
     if (not HAS_BOTO3):
-      self.module.fail_json(msg="boto and boto3 are required for this module")
-    self.client = boto3.client('apigateway')
+      self.module.fail_json(msg="boto3 is required for this module")
+    self.client = create_client(self.module, rate_limits=ApiGwUsagePlanKey._rate_limits(self.module.params))
 
   @staticmethod
   def _define_module_argument_spec():
@@ -138,28 +180,119 @@ class ApiGwUsagePlanKey:
     :return: Dictionary defining module arguments
     """
     return dict( usage_plan_id=dict(required=True),
-                 api_key_id=dict(required=True),
+                 api_key_id=dict(required=False),
+                 api_key_ids=dict(required=False, type='list'),
+                 purge_keys=dict(required=False, type='bool', default=False),
+                 concurrency=dict(required=False, type='int', default=4),
+                 rate_limit=dict(required=False, type='float', default=10),
                  key_type=dict(required=False, default='API_KEY', choices=['API_KEY']),
                  state=dict(default='present', choices=['present', 'absent']),
     )
 
+  @staticmethod
+  def _rate_limits(params):
+    """
+    Maps rate_limit onto a budget of the client's shared rate limits, which
+    create_usage_plan_key and delete_usage_plan_key calls both take from
+    :param params: Module params
+    :return: Dict of budgets, or None when the calls are not bounded
+    """
+    if params.get('api_key_ids') is None or not params.get('rate_limit'):
+      return None
+    return {'*_usage_plan_key': params['rate_limit']}
+
   def _retrieve_usage_plan_key(self):
     """
-    Retrieve all usage_plan_keys in the account and match them against the provided name
-    :return: Result matching the provided api name or an empty hash
+    Page through the usage_plan_keys of the plan, stopping at the one matching the provided id
+    :return: Result matching the provided api key id or None
     """
     resp = None
     try:
-      get_resp = self.client.get_usage_plan_keys(usagePlanId=self.module.params['usage_plan_id'])
-
-      for item in get_resp.get('items', []):
+      for item in iter_items(self.client.get_usage_plan_keys, usagePlanId=self.module.params['usage_plan_id']):
         if item['id'] == self.module.params.get('api_key_id'):
           resp = item
+          break
     except BotoCoreError as e:
       self.module.fail_json(msg="Error when getting usage_plan_keys from boto3: {}".format(e))
 
     return resp
 
+  def _retrieve_usage_plan_key_ids(self):
+    """
+    Stream the usage_plan_keys of the plan a page at a time, keeping only their ids
+    :return: Set of the key ids associated with the plan
+    """
+    try:
+      return set(item['id'] for item in iter_items(self.client.get_usage_plan_keys, usagePlanId=self.module.params['usage_plan_id']))
+    except (BotoCoreError, ClientError) as e:
+      self.module.fail_json(msg="Error when getting usage_plan_keys from boto3: {}".format(e))
+
+    return None
+
+  def _apply_to_keys(self, func, key_ids, **kwargs):
+    """
+    Calls func once per key id, concurrently under a pool bounded by the
+    concurrency param.  The client paces and retries the calls.
+    :param func: The client method to call
+    :param key_ids: List of key ids
+    :param kwargs: Extra arguments for every call
+    :return: List of (key id, error) tuples for the calls that failed
+    """
+    usage_plan_id = self.module.params['usage_plan_id']
+
+    def apply(key_id):
+      try:
+        func(usagePlanId=usage_plan_id, keyId=key_id, **kwargs)
+      except Exception as e:
+        return (key_id, e)
+
+    pool = ThreadPool(max(1, self.module.params.get('concurrency') or 1))
+    try:
+      errors = [r for r in pool.map(apply, key_ids) if r is not None]
+    finally:
+      pool.close()
+      pool.join()
+
+    return errors
+
+  def _process_bulk_request(self):
+    """
+    Reconcile the plan's keys with api_key_ids, writing only the differences
+    :return: Returns either fail_json or exit_json
+    """
+    params = self.module.params
+    existing = self._retrieve_usage_plan_key_ids()
+    if existing is None:
+      return None
+
+    wanted = set(params['api_key_ids'])
+    if params.get('state', 'present') == 'present':
+      to_add = sorted(wanted - existing)
+      to_remove = sorted(existing - wanted) if params.get('purge_keys') else []
+    else:
+      to_add = []
+      to_remove = sorted(wanted & existing)
+
+    if not self.module.check_mode:
+      done = dict(added=[], removed=[])
+      for (action, func, key_ids, kwargs, result) in [
+        ('deleting', self.client.delete_usage_plan_key, to_remove, {}, 'removed'),
+        ('creating', self.client.create_usage_plan_key, to_add, {'keyType': params.get('key_type')}, 'added'),
+      ]:
+        errors = self._apply_to_keys(func, key_ids, **kwargs)
+        failed = set(key_id for (key_id, _) in errors)
+        done[result] = [k for k in key_ids if k not in failed]
+        if errors:
+          return self.module.fail_json(
+            msg="Error when {} usage_plan_keys via boto3: {} of {} calls failed, first for key {}: {}".format(
+              action, len(errors), len(key_ids), errors[0][0], errors[0][1]
+            ),
+            changed=bool(done['added'] or done['removed']),
+            usage_plan_keys=done
+          )
+
+    return self.module.exit_json(changed=bool(to_add or to_remove), usage_plan_keys=dict(added=to_add, removed=to_remove))
+
   def _delete_usage_plan_key(self):
     """
     Delete usage_plan_key that matches the returned id
@@ -202,6 +335,9 @@ class ApiGwUsagePlanKey:
     :return: Returns either fail_json or exit_json
     """
 
+    if self.module.params.get('api_key_ids') is not None:
+      return self._process_bulk_request()
+
     usage_plan_key = None
     changed = False
     self.me = self._retrieve_usage_plan_key()
@@ -222,11 +358,15 @@ def main():
     :return: none
     """
     module = AnsibleModule(
-        argument_spec=ApiGwUsagePlanKey._define_module_argument_spec(),
+        argument_spec=client_argument_spec(ApiGwUsagePlanKey._define_module_argument_spec()),
+        required_one_of=[['api_key_id', 'api_key_ids']],
+        mutually_exclusive=[['api_key_id', 'api_key_ids']],
         supports_check_mode=True
     )
 
     usage_plan_key = ApiGwUsagePlanKey(module)
+    report_retries(module, usage_plan_key.client)
+
     usage_plan_key.process_request()
 
 from ansible.module_utils.basic import *  # pylint: disable=W0614
@@ -0,0 +1,303 @@
+#!/usr/bin/python
+
+# API Gateway Ansible Modules
+#
+# Modules in this project allow management of the AWS API Gateway service.
+#
+# Authors:
+#  - Brian Felton <github: bjfelton>
+#
+# apigw_usage_plans
+#    Reconcile many API Gateway UsagePlan resources in a single task
+#
+
+# MIT License
+#
+# Copyright (c) 2016 Brian Felton, Emerson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+DOCUMENTATION='''
+module: apigw_usage_plans
+author: Brian Felton (@bjfelton)
+short_description: Add, update, or remove many UsagePlan resources at once
+description:
+- Reconciles a list of usage plan specs against the account's usage plans
+- Plans are listed once; creates, updates and deletes then run concurrently
+- Each spec is compared exactly as apigw_usage_plan compares its params
+version_added: "2.2"
+options:
+  usage_plans:
+    description:
+    - List of usage plan specs.  Each spec takes the options of apigw_usage_plan (C(name), C(description), C(api_stages), C(throttle_burst_limit), C(throttle_rate_limit), C(quota_limit), C(quota_offset), C(quota_period) and C(state)), with the same types, choices and defaults.  Every spec is validated before anything is written.  Plans that are not listed are left alone.
+    type: list
+    required: True
+  concurrency:
+    description:
+    - Maximum number of plans written concurrently
+    type: int
+    default: 4
+    required: False
+requirements:
+    - python = 2.7
+    - boto3
+notes:
+- Plans are matched by name, and names cannot be changed with this module.  If the account holds several plans with one name, the first one listed is used.
+- The module returns C(usage_plans), a report with the C(name), C(id), C(action) (created, updated, deleted or unchanged) and applied C(patches) of every listed plan.  On failure, the report is returned alongside the error and includes an C(error) for the plans that failed; C(changed) tells whether any other plan was written.
+- This module requires that you have boto3 installed and that your credentials are created or stored in a way that is compatible (see U(https://boto3.readthedocs.io/en/latest/guide/quickstart.html#configuration)).
+- This module also accepts the client options C(region), C(profile), C(endpoint_url), C(retry_mode), C(max_attempts), C(connect_timeout), C(read_timeout), C(max_pool_connections), C(retry_deadline), C(rate_limits), C(rate_limit_file) and C(write_lock) to tune its boto3 client.  Unset options keep the boto3 defaults.  When C(rate_limits) or C(rate_limit_file) is set, calls are paced by control plane rate limits that all modules on the host share.  Throttled, conflicting and transient calls are retried with backoff, and the result then includes C(retries), the number of retries per operation.
+'''
+
+EXAMPLES = '''
+---
+- hosts: localhost
+  gather_facts: False
+  tasks:
+  - name: usage plan tiers
+    apigw_usage_plans:
+      usage_plans:
+        - name: bronze
+          api_stages:
+            - rest_api_id: abcde12345
+              stage: live
+          throttle_burst_limit: 10
+          throttle_rate_limit: 5.0
+          quota_limit: 1000
+          quota_period: DAY
+        - name: gold
+          api_stages:
+            - rest_api_id: abcde12345
+              stage: live
+          throttle_burst_limit: 500
+          throttle_rate_limit: 250.0
+        - name: retired-tier
+          state: absent
+      concurrency: 8
+    register: plans
+
+  - debug: var=plans
+'''
+
+RETURN = '''
+{
+  "plans": {
+    "changed": true,
+    "usage_plans": [
+      {"name": "bronze", "id": "abc123", "action": "updated", "patches": [{"op": "replace", "path": "/quota/limit", "value": "1000"}]},
+      {"name": "gold", "id": "def456", "action": "unchanged", "patches": []},
+      {"name": "retired-tier", "id": "ghi789", "action": "deleted", "patches": []}
+    ]
+  }
+}
+'''
+
+__version__ = '${version}'
+
+from multiprocessing.pool import ThreadPool
+
+try:
+  from botocore.exceptions import BotoCoreError, ClientError
+  HAS_BOTO3 = True
+except ImportError:
+  HAS_BOTO3 = False
+
+try:
+  from ansible.module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from ansible.module_utils.apigw_pages import iter_items
+  from ansible.module_utils.apigw_params import check_entry
+  from ansible.module_utils.apigw_usage_plan_spec import api_stages_remove_patches, create_args, create_patches
+except ImportError:
+  from module_utils.apigw_client import client_argument_spec, create_client, report_retries
+  from module_utils.apigw_pages import iter_items
+  from module_utils.apigw_params import check_entry
+  from module_utils.apigw_usage_plan_spec import api_stages_remove_patches, create_args, create_patches
+
+# Argument spec of the apigw_usage_plan options accepted in a spec
+SPEC_ARGUMENTS = dict(
+  name=dict(required=True),
+  description=dict(required=False, default=''),
+  api_stages=dict(required=False, type='list', default=[]),
+  throttle_burst_limit=dict(required=False, type='int', default=-1),
+  throttle_rate_limit=dict(required=False, type='float', default=-1.0),
+  quota_limit=dict(required=False, type='int', default=-1),
+  quota_offset=dict(required=False, type='int', default=-1),
+  quota_period=dict(required=False, default='', choices=['', 'DAY', 'WEEK', 'MONTH']),
+  state=dict(default='present', choices=['present', 'absent']),
+)
+
+class ApiGwUsagePlans:
+  def __init__(self, module):
+    """
+    Constructor
+    """
+    self.module = module
+    if (not HAS_BOTO3):
+      self.module.fail_json(msg="boto3 is required for this module")
+    self.client = create_client(self.module)
+
+  @staticmethod
+  def _define_module_argument_spec():
+    """
+    Defines the module's argument spec
+    :return: Dictionary defining module arguments
+    """
+    return dict( usage_plans=dict(required=True, type='list'),
+                 concurrency=dict(required=False, type='int', default=4),
+    )
+
+  def _normalize_specs(self):
+    """
+    Validates usage_plans and converts them as apigw_usage_plan converts its params
+    :return: List of specs, or None after fail_json
+    """
+    specs = []
+    seen = set()
+    for entry in self.module.params['usage_plans']:
+      if not isinstance(entry, dict) or not entry.get('name'):
+        self.module.fail_json(msg="Every usage_plans entry needs a name")
+        return None
+      try:
+        spec = check_entry(SPEC_ARGUMENTS, entry)
+      except ValueError as e:
+        self.module.fail_json(msg="Invalid usage plan {}: {}".format(entry['name'], e))
+        return None
+      if spec['name'] in seen:
+        self.module.fail_json(msg="usage_plans lists {} more than once".format(spec['name']))
+        return None
+      seen.add(spec['name'])
+      specs.append(spec)
+
+    return specs
+
+  def _retrieve_usage_plans(self):
+    """
+    Pages through every usage_plan in the account once
+    :return: Dictionary of name to the first plan listed with that name, or None after fail_json
+    """
+    plans = {}
+    try:
+      for item in iter_items(self.client.get_usage_plans):
+        plans.setdefault(item['name'], item)
+    except (BotoCoreError, ClientError) as e:
+      self.module.fail_json(msg="Error when getting usage_plans from boto3: {}".format(e))
+      return None
+
+    return plans
+
+  @staticmethod
+  def _plan_changes(spec, me):
+    """
+    Determines what has to happen to one plan
+    :param spec: Normalized usage plan spec
+    :param me: The matching plan as listed by boto3, or None
+    :return: Report entry with name, id, action and patches
+    """
+    report = dict(name=spec['name'], id=me.get('id') if me else None, action='unchanged', patches=[])
+
+    if spec['state'] == 'absent':
+      if me is not None:
+        report['action'] = 'deleted'
+    elif me is None:
+      report['action'] = 'created'
+    else:
+      report['patches'] = create_patches(spec, me)
+      if report['patches']:
+        report['action'] = 'updated'
+
+    return report
+
+  def _apply(self, job):
+    """
+    Applies the change for one plan.  The client retries throttled calls.
+    :param job: (spec, me, report) tuple
+    :return: The report, with the new id or an error filled in
+    """
+    (spec, me, report) = job
+    try:
+      if report['action'] == 'created':
+        resp = self.client.create_usage_plan(**create_args(spec))
+        report['id'] = resp.get('id')
+      elif report['action'] == 'updated':
+        self.client.update_usage_plan(usagePlanId=me['id'], patchOperations=report['patches'])
+      elif report['action'] == 'deleted':
+        patches = api_stages_remove_patches(me)
+        if patches:
+          self.client.update_usage_plan(usagePlanId=me['id'], patchOperations=patches)
+        self.client.delete_usage_plan(usagePlanId=me['id'])
+    except Exception as e:
+      report['error'] = str(e)
+
+    return report
+
+  def process_request(self):
+    """
+    Process the user's request -- the primary code path
+    :return: Returns either fail_json or exit_json
+    """
+    specs = self._normalize_specs()
+    if specs is None:
+      return None
+    plans = self._retrieve_usage_plans()
+    if plans is None:
+      return None
+
+    jobs = []
+    for spec in specs:
+      me = plans.get(spec['name'])
+      jobs.append((spec, me, ApiGwUsagePlans._plan_changes(spec, me)))
+
+    pending = [job for job in jobs if job[2]['action'] != 'unchanged']
+    if pending and not self.module.check_mode:
+      pool = ThreadPool(max(1, min(len(pending), self.module.params.get('concurrency') or 1)))
+      try:
+        pool.map(self._apply, pending)
+      finally:
+        pool.close()
+        pool.join()
+
+    report = [job[2] for job in jobs]
+    failed = [r['name'] for r in report if 'error' in r]
+    if failed:
+      return self.module.fail_json(
+        msg="Error when reconciling usage_plans via boto3: {} of {} plans failed: {}".format(len(failed), len(pending), ', '.join(failed)),
+        changed=any(r['action'] != 'unchanged' and 'error' not in r for r in report),
+        usage_plans=report
+      )
+
+    return self.module.exit_json(changed=len(pending) > 0, usage_plans=report)
+
+def main():
+    """
+    Instantiates the module and calls process_request.
+    :return: none
+    """
+    module = AnsibleModule(
+        argument_spec=client_argument_spec(ApiGwUsagePlans._define_module_argument_spec()),
+        supports_check_mode=True
+    )
+
+    usage_plans = ApiGwUsagePlans(module)
+    report_retries(module, usage_plans.client)
+
+    usage_plans.process_request()
+
+from ansible.module_utils.basic import *  # pylint: disable=W0614
+if __name__ == '__main__':
+    main()
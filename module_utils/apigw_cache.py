@@ -0,0 +1,128 @@
+# API Gateway Ansible Modules
+#
+# Modules in this project allow management of the AWS API Gateway service.
+#
+# apigw_cache
+#    On-disk name to id index shared by the tasks of a play
+#
+
+# MIT License
+#
+# Copyright (c) 2016 Brian Felton, Emerson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+__version__ = '${version}'
+
+import json
+import os
+import tempfile
+
+class NameCache(object):
+  """
+  Name to id index persisted as JSON, so tasks later in a play can find a
+  resource by name without listing every resource again.  Entries are kept
+  per namespace (e.g. region and resource kind) and map a name to every id
+  seen with that name, which lets callers detect duplicates.  Entries are
+  hints: callers must confirm a cached id before trusting it.
+  """
+  def __init__(self, path, namespace):
+    """
+    Constructor
+    :param path: Path of the cache file.  It is created on the first save.
+    :param namespace: Key under which this cache's names are stored
+    """
+    self.path = path
+    self.namespace = namespace
+    self._entries = None
+    self._changes = {}
+
+  def _read(self):
+    try:
+      with open(self.path) as f:
+        data = json.load(f)
+      return data if isinstance(data, dict) else {}
+    except (IOError, OSError, ValueError):
+      return {}
+
+  def _load(self):
+    if self._entries is None:
+      self._entries = self._read().get(self.namespace, {})
+    return self._entries
+
+  def get(self, name):
+    """
+    :param name: Name to look up
+    :return: List of ids recorded for name, or None when name is unknown
+    """
+    ids = self._load().get(name)
+    return list(ids) if ids is not None else None
+
+  def names(self):
+    """
+    :return: List of the names recorded in this namespace
+    """
+    return list(self._load().keys())
+
+  def put(self, name, ids):
+    """
+    Records the ids seen for a name
+    :param name: The name
+    :param ids: List of ids
+    """
+    if self._load().get(name) != list(ids):
+      self._entries[name] = list(ids)
+      self._changes[name] = list(ids)
+
+  def discard(self, name):
+    """
+    Forgets a name, e.g. after the resource was deleted or renamed
+    :param name: The name
+    """
+    if self._load().pop(name, None) is not None:
+      self._changes[name] = None
+
+  def save(self):
+    """
+    Writes pending changes.  The file is re-read first so entries written by
+    other processes are kept, and it is replaced atomically so readers never
+    see a partial file.  Failures to write are ignored, as the cache is only
+    an optimization.
+    """
+    if not self._changes:
+      return
+
+    data = self._read()
+    entries = data.setdefault(self.namespace, {})
+    for (name, ids) in self._changes.items():
+      if ids is None:
+        entries.pop(name, None)
+      else:
+        entries[name] = ids
+
+    tmp = None
+    try:
+      (fd, tmp) = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), prefix='.apigw-cache-')
+      with os.fdopen(fd, 'w') as f:
+        json.dump(data, f)
+      os.rename(tmp, self.path)
+      self._changes = {}
+    except (IOError, OSError):
+      if tmp is not None and os.path.exists(tmp):
+        os.remove(tmp)
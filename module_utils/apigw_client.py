@@ -0,0 +1,176 @@
+# API Gateway Ansible Modules
+#
+# Modules in this project allow management of the AWS API Gateway service.
+#
+# apigw_client
+#    Shared, tunable boto3 client factory for the apigw modules
+#
+
+# MIT License
+#
+# Copyright (c) 2016 Brian Felton, Emerson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+__version__ = '${version}'
+
+# boto3 and botocore.config are the slowest imports of a module run, so they
+# are only imported by the functions below, once the module arguments have
+# been parsed.
+
+try:
+  from ansible.module_utils.apigw_lock import WriteLock
+  from ansible.module_utils.apigw_rate import SharedRateLimiter
+  from ansible.module_utils.apigw_retry import RetryingClient
+except ImportError:
+  from module_utils.apigw_lock import WriteLock
+  from module_utils.apigw_rate import SharedRateLimiter
+  from module_utils.apigw_retry import RetryingClient
+
+# Options every module accepts to tune its apigateway client.  Unset options
+# keep the boto3 and botocore defaults.
+CLIENT_ARGUMENT_SPEC = dict(
+  region=dict(required=False, aliases=['aws_region']),
+  profile=dict(required=False, aliases=['aws_profile']),
+  endpoint_url=dict(required=False),
+  retry_mode=dict(required=False, choices=['legacy', 'standard', 'adaptive']),
+  max_attempts=dict(required=False, type='int'),
+  connect_timeout=dict(required=False, type='float'),
+  read_timeout=dict(required=False, type='float'),
+  max_pool_connections=dict(required=False, type='int'),
+  retry_deadline=dict(required=False, type='float'),
+  rate_limits=dict(required=False, type='dict'),
+  rate_limit_file=dict(required=False, type='path'),
+  write_lock=dict(required=False, choices=['rest_api', 'resource']),
+)
+
+# Pool size botocore uses when max_pool_connections is not set
+DEFAULT_POOL_CONNECTIONS = 10
+
+def client_argument_spec(spec):
+  """
+  Adds the client options to a module's argument spec
+  :param spec: The module's own argument spec
+  :return: A new argument spec holding both
+  """
+  merged = dict(CLIENT_ARGUMENT_SPEC)
+  merged.update(spec)
+  return merged
+
+def client_config(params):
+  """
+  Builds the botocore Config for the client options
+  :param params: Module params
+  :return: Config, or None when every option is unset
+  """
+  kwargs = {}
+
+  retries = {}
+  if params.get('retry_mode'):
+    retries['mode'] = params['retry_mode']
+  if params.get('max_attempts') is not None:
+    retries['max_attempts'] = params['max_attempts']
+  if retries:
+    kwargs['retries'] = retries
+
+  for option in ['connect_timeout', 'read_timeout']:
+    if params.get(option) is not None:
+      kwargs[option] = params[option]
+
+  # Modules running a worker pool need at least one connection per worker
+  pool = params.get('max_pool_connections')
+  if pool is None and (params.get('concurrency') or 0) > DEFAULT_POOL_CONNECTIONS:
+    pool = params['concurrency']
+  if pool is not None:
+    kwargs['max_pool_connections'] = pool
+
+  if not kwargs:
+    return None
+  from botocore.config import Config
+  return Config(**kwargs)
+
+def create_client(module, service='apigateway', rate_limits=None):
+  """
+  Creates the boto3 client for a module, wrapped so that its calls are paced
+  by the rate limits shared by all modules on the host when rate limits are
+  asked for, writes take the write lock when one is asked for, and
+  throttled, conflicting and transient calls are retried
+  :param module: The AnsibleModule, whose params hold any of the client options
+  :param service: Name of the AWS service
+  :param rate_limits: Budgets the module itself asks for, see normalize_budgets.
+                      The rate_limits param overrides them.  On their own they
+                      pace only the calls they name.
+  :return: A RetryingClient, or None after failing the module when boto3 is missing
+  """
+  try:
+    import boto3
+  except ImportError:
+    module.fail_json(msg="boto3 is required for this module")
+    return None
+
+  params = module.params
+  kwargs = {}
+  if params.get('region'):
+    kwargs['region_name'] = params['region']
+  if params.get('endpoint_url'):
+    kwargs['endpoint_url'] = params['endpoint_url']
+  config = client_config(params)
+  if config is not None:
+    kwargs['config'] = config
+
+  if params.get('profile'):
+    client = boto3.session.Session(profile_name=params['profile']).client(service, **kwargs)
+  else:
+    client = boto3.client(service, **kwargs)
+  limiter = None
+  requested = bool(params.get('rate_limits') or params.get('rate_limit_file'))
+  if requested or rate_limits:
+    budgets = dict(rate_limits or {})
+    budgets.update(params.get('rate_limits') or {})
+    limiter = SharedRateLimiter(
+      path=params.get('rate_limit_file'),
+      budgets=budgets,
+      prefix='{0}:'.format(client.meta.region_name),
+      defaults=requested
+    )
+  write_lock = WriteLock(params['write_lock']) if params.get('write_lock') else None
+  return RetryingClient(client, limiter=limiter, write_lock=write_lock, deadline=params.get('retry_deadline'))
+
+def report_retries(module, client):
+  """
+  Makes exit_json and fail_json add the retries made by client to the module
+  result as C(retries), a dict of operation name to retry count.  Nothing is
+  added when no call was retried.
+  :param module: The AnsibleModule
+  :param client: The client created by create_client
+  :return: none
+  """
+  if not isinstance(client, RetryingClient):
+    return
+
+  def wrap(func):
+    def report(**kwargs):
+      retries = client.retry_counts()
+      if retries:
+        kwargs.setdefault('retries', retries)
+      return func(**kwargs)
+    return report
+
+  module.exit_json = wrap(module.exit_json)
+  module.fail_json = wrap(module.fail_json)
@@ -0,0 +1,117 @@
+# API Gateway Ansible Modules
+#
+# Modules in this project allow management of the AWS API Gateway service.
+#
+# apigw_lock
+#    Host local advisory locks serializing writes to a rest api
+#
+
+# MIT License
+#
+# Copyright (c) 2016 Brian Felton, Emerson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+__version__ = '${version}'
+
+from contextlib import contextmanager
+import os
+import re
+import tempfile
+
+try:
+  import fcntl
+except ImportError:
+  fcntl = None
+
+DEFAULT_LOCK_DIR = os.path.join(tempfile.gettempdir(), 'ansible-apigw-locks')
+
+# Operations that only read and never take a lock
+READ_PREFIXES = ('get_',)
+
+class WriteLock(object):
+  """
+  Advisory flock based locks that serialize the writes module processes on
+  the host make to one rest api.  With the 'rest_api' scope every write to an
+  api holds its lock exclusively.  With the 'resource' scope a write naming a
+  resourceId holds the api lock shared and the resource lock exclusively, so
+  writes to different resources of one api still run side by side, while
+  writes to the api as a whole wait for all of them.  Reads, and calls that
+  name no rest api, are never locked.
+  """
+
+  def __init__(self, scope='rest_api', directory=None):
+    """
+    Constructor
+    :param scope: 'rest_api' or 'resource'
+    :param directory: Directory of the lock files, defaults to DEFAULT_LOCK_DIR
+    """
+    self.scope = scope
+    self.directory = directory or DEFAULT_LOCK_DIR
+
+  def locks(self, operation, kwargs):
+    """
+    :param operation: Client method name
+    :param kwargs: Keyword arguments of the call
+    :return: List of (lock name, exclusive) tuples to take, in order
+    """
+    rest_api_id = kwargs.get('restApiId')
+    if not rest_api_id or operation.startswith(READ_PREFIXES):
+      return []
+    if self.scope == 'resource' and kwargs.get('resourceId'):
+      return [(rest_api_id, False), ('{0}.{1}'.format(rest_api_id, kwargs['resourceId']), True)]
+    return [(rest_api_id, True)]
+
+  @contextmanager
+  def hold(self, operation, kwargs):
+    """
+    Holds the locks of a call for the duration of the block.  Locks that
+    cannot be taken, for instance without fcntl or a writable lock directory,
+    are skipped rather than failing the call.
+    :param operation: Client method name
+    :param kwargs: Keyword arguments of the call
+    """
+    handles = []
+    try:
+      for name, exclusive in (self.locks(operation, kwargs) if fcntl is not None else []):
+        handle = self._open(name)
+        if handle is None:
+          break
+        handles.append(handle)
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+      yield
+    finally:
+      for handle in reversed(handles):
+        handle.close()
+
+  def _open(self, name):
+    """
+    :param name: Lock name
+    :return: Open lock file, or None when it cannot be opened
+    """
+    if not os.path.isdir(self.directory):
+      try:
+        os.makedirs(self.directory, 0o700)
+      except OSError:
+        # Another process may have created it first
+        pass
+    try:
+      return open(os.path.join(self.directory, re.sub(r'[^A-Za-z0-9_.-]', '_', name) + '.lock'), 'a')
+    except (IOError, OSError):
+      return None
@@ -0,0 +1,219 @@
+# API Gateway Ansible Modules
+#
+# Modules in this project allow management of the AWS API Gateway service.
+#
+# apigw_openapi
+#    Compares OpenAPI definitions and builds reduced fragments for merge imports
+#
+
+# MIT License
+#
+# Copyright (c) 2016 Brian Felton, Emerson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+__version__ = '${version}'
+
+import copy
+import json
+
+try:
+  from ansible.module_utils.apigw_patch import values_equal
+except ImportError:
+  from module_utils.apigw_patch import values_equal
+
+try:
+  import yaml
+  HAS_YAML = True
+except ImportError:
+  HAS_YAML = False
+
+OPERATION_KEYS = ['get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'x-amazon-apigateway-any-method']
+
+# Top-level keys that describe the document rather than the api, or that
+# API Gateway rewrites on export
+IGNORED_KEYS = ['info', 'host', 'basePath', 'schemes', 'servers']
+
+class DefinitionError(Exception):
+  """
+  Raised when an OpenAPI definition cannot be parsed
+  """
+
+def load_definition(text):
+  """
+  Parses an OpenAPI definition in JSON or, when PyYAML is available, YAML
+  :param text: The definition as a string, or an already parsed dictionary
+  :return: The definition as a dictionary
+  """
+  if isinstance(text, dict):
+    return text
+
+  try:
+    return json.loads(text)
+  except ValueError as e:
+    if not HAS_YAML:
+      raise DefinitionError("definition is not valid JSON and PyYAML is not installed: {0}".format(e))
+
+  try:
+    doc = yaml.safe_load(text)
+  except yaml.YAMLError as e:
+    raise DefinitionError("definition is neither valid JSON nor YAML: {0}".format(e))
+  if not isinstance(doc, dict):
+    raise DefinitionError("definition must be a JSON or YAML object")
+  return doc
+
+def export_type(doc):
+  """
+  :param doc: A parsed OpenAPI definition
+  :return: The get_export exportType matching the definition's version
+  """
+  return 'oas30' if 'openapi' in doc else 'swagger'
+
+def contains(current, desired):
+  """
+  Tells whether everything stated by desired is already present in current.
+  Dictionaries may hold extra keys in current, since API Gateway fills in
+  defaults on export; lists and scalars must match exactly.
+  :param current: Value from the exported definition
+  :param desired: Value from the user's definition
+  :return: True when desired is satisfied by current
+  """
+  if isinstance(desired, dict):
+    if not isinstance(current, dict):
+      return False
+    for (key, value) in desired.iteritems():
+      if key not in current or not contains(current[key], value):
+        return False
+    return True
+
+  if isinstance(desired, list):
+    if not isinstance(current, list) or len(current) != len(desired):
+      return False
+    for (c, d) in zip(current, desired):
+      if not contains(c, d):
+        return False
+    return True
+
+  if isinstance(current, (dict, list)):
+    return False
+  return values_equal(desired, current)
+
+def _models(doc):
+  if 'openapi' in doc:
+    return doc.get('components', {}).get('schemas', {})
+  return doc.get('definitions', {})
+
+def _refs(value, found):
+  if isinstance(value, dict):
+    ref = value.get('$ref')
+    if isinstance(ref, basestring) and '/' in ref:
+      found.add(ref.rsplit('/', 1)[-1])
+    for v in value.itervalues():
+      _refs(v, found)
+  elif isinstance(value, list):
+    for v in value:
+      _refs(v, found)
+  return found
+
+def diff_definition(current, desired):
+  """
+  Finds what the desired definition would change in the current one
+  :param current: The definition exported from API Gateway
+  :param desired: The user's definition
+  :return: Dictionary with
+            paths: {path: [operations]} of new or changed operations
+            models: list of new or changed model names
+            settings: list of changed top-level keys
+            stale_paths: list of paths only found in current, which a merge leaves in place
+  """
+  changes = {'paths': {}, 'models': [], 'settings': [], 'stale_paths': []}
+  current_paths = current.get('paths', {})
+
+  for (path, item) in desired.get('paths', {}).iteritems():
+    existing = current_paths.get(path, {})
+    for (op, spec) in item.iteritems():
+      if op.lower() in OPERATION_KEYS and not contains(existing.get(op.lower()), spec):
+        changes['paths'].setdefault(path, []).append(op.lower())
+    if path in changes['paths']:
+      changes['paths'][path].sort()
+
+  changes['stale_paths'] = sorted(p for p in current_paths if p not in desired.get('paths', {}))
+
+  current_models = _models(current)
+  changes['models'] = sorted(
+    name for (name, schema) in _models(desired).iteritems() if not contains(current_models.get(name), schema)
+  )
+
+  for (key, value) in desired.iteritems():
+    if key in IGNORED_KEYS or key in ['paths', 'definitions', 'openapi', 'swagger']:
+      continue
+    if key == 'components':
+      value = dict((k, v) for (k, v) in value.iteritems() if k != 'schemas')
+    if not contains(current.get(key), value):
+      changes['settings'].append(key)
+  changes['settings'].sort()
+
+  return changes
+
+def has_changes(changes):
+  """
+  :param changes: Result of diff_definition
+  :return: True when a merge import would change the api
+  """
+  return bool(changes['paths'] or changes['models'] or changes['settings'])
+
+def build_fragment(desired, changes):
+  """
+  Reduces the desired definition to the operations and models that changed,
+  plus any models those reference so the fragment stays valid on its own.
+  Top-level settings and non-operation keys of changed paths (such as
+  shared parameters) are kept as they are.
+  :param desired: The user's definition
+  :param changes: Result of diff_definition
+  :return: The reduced definition
+  """
+  fragment = {}
+  for (key, value) in desired.iteritems():
+    if key not in ['paths', 'definitions', 'components']:
+      fragment[key] = value
+
+  fragment['paths'] = {}
+  for (path, ops) in changes['paths'].iteritems():
+    item = desired['paths'][path]
+    fragment['paths'][path] = dict(
+      (k, v) for (k, v) in item.iteritems() if k.lower() not in OPERATION_KEYS or k.lower() in ops
+    )
+
+  all_models = _models(desired)
+  wanted = set(changes['models'])
+  pending = list(_refs(fragment['paths'], set()) | wanted)
+  while pending:
+    name = pending.pop()
+    wanted.add(name)
+    pending.extend(r for r in _refs(all_models.get(name), set()) if r not in wanted)
+  models = dict((name, schema) for (name, schema) in all_models.iteritems() if name in wanted)
+  if 'openapi' in desired:
+    components = copy.copy(desired.get('components', {}))
+    if models or 'schemas' in components:
+      components['schemas'] = models
+    fragment['components'] = components
+  elif models:
+    fragment['definitions'] = models
+
+  return fragment
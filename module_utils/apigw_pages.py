@@ -0,0 +1,64 @@
+# API Gateway Ansible Modules
+#
+# Modules in this project allow management of the AWS API Gateway service.
+#
+# apigw_pages
+#    Paging helpers for API Gateway list calls
+#
+
+# MIT License
+#
+# Copyright (c) 2016 Brian Felton, Emerson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+__version__ = '${version}'
+
+# Largest page size accepted by the API Gateway list calls
+PAGE_SIZE = 500
+
+def iter_pages(func, **kwargs):
+  """
+  Generator that pages through an API Gateway list call, following position
+  tokens.  Stop iterating to stop paging.
+  :param func: The client method to call, e.g. client.get_rest_apis
+  :param kwargs: Arguments for the call.  limit defaults to PAGE_SIZE.
+  :return: Yields the items of one page at a time.  Errors from boto3 are raised.
+  """
+  kwargs.setdefault('limit', PAGE_SIZE)
+
+  while True:
+    page = func(**kwargs)
+    yield page.get('items', [])
+
+    if not page.get('position'):
+      break
+    kwargs['position'] = page.get('position')
+
+def iter_items(func, **kwargs):
+  """
+  Generator that yields the items of an API Gateway list call one at a
+  time, only requesting the next page when the current one is exhausted
+  :param func: The client method to call
+  :param kwargs: Arguments for the call
+  :return: Yields one item at a time.  Errors from boto3 are raised.
+  """
+  for items in iter_pages(func, **kwargs):
+    for item in items:
+      yield item
@@ -0,0 +1,95 @@
+# API Gateway Ansible Modules
+#
+# Modules in this project allow management of the AWS API Gateway service.
+#
+# apigw_params
+#    Validation of the entries of list options against an argument spec
+#
+
+# MIT License
+#
+# Copyright (c) 2016 Brian Felton, Emerson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+__version__ = '${version}'
+
+import copy
+
+from ansible.module_utils.common.validation import check_type_bool, check_type_dict, check_type_float, \
+  check_type_int, check_type_list, check_type_path, check_type_raw, check_type_str
+
+TYPE_CHECKERS = dict(
+  str=check_type_str,
+  int=check_type_int,
+  float=check_type_float,
+  bool=check_type_bool,
+  list=check_type_list,
+  dict=check_type_dict,
+  path=check_type_path,
+  raw=check_type_raw,
+)
+
+def check_entry(argument_spec, entry):
+  """
+  Validates one entry of a list option the way AnsibleModule validates the
+  module params: aliases are resolved, unknown and missing required options
+  are rejected, values are converted to their type, choices are enforced and
+  defaults are filled in.  Options nested in the argument spec are not checked.
+  :param argument_spec: Argument spec the entry follows
+  :param entry: Dictionary given by the user
+  :return: Dictionary holding every option of the argument spec
+  :raises ValueError: Describing the first problem found
+  """
+  aliases = {}
+  for (name, arg) in argument_spec.items():
+    for alias in arg.get('aliases', []):
+      aliases[alias] = name
+
+  params = {}
+  unknown = []
+  for (key, value) in entry.items():
+    name = aliases.get(key, key)
+    if name not in argument_spec:
+      unknown.append(key)
+    params[name] = value
+  if unknown:
+    raise ValueError("Unsupported parameters: {0}".format(', '.join(sorted(unknown))))
+
+  missing = [name for (name, arg) in argument_spec.items() if arg.get('required') and params.get(name) is None]
+  if missing:
+    raise ValueError("missing required arguments: {0}".format(', '.join(sorted(missing))))
+
+  for (name, arg) in argument_spec.items():
+    value = params.get(name)
+    if value is None:
+      params[name] = copy.deepcopy(arg.get('default'))
+      continue
+
+    wanted = arg.get('type', 'str')
+    try:
+      value = TYPE_CHECKERS[wanted](value)
+    except (TypeError, ValueError) as e:
+      raise ValueError("argument {0} is of type {1} and we were unable to convert to {2}: {3}".format(name, type(value), wanted, e))
+    if 'choices' in arg and value not in arg['choices']:
+      raise ValueError("value of {0} must be one of: {1}, got: {2}".format(
+        name, ', '.join(str(c) for c in arg['choices']), value))
+    params[name] = value
+
+  return params
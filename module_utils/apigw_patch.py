@@ -0,0 +1,243 @@
+# API Gateway Ansible Modules
+#
+# Modules in this project allow management of the AWS API Gateway service.
+#
+# apigw_patch
+#    Builds API Gateway patch operations from declarative field maps
+#
+
+# MIT License
+#
+# Copyright (c) 2016 Brian Felton, Emerson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+__version__ = '${version}'
+
+_MISSING = object()
+
+def escape_path(part):
+  """
+  Escapes one segment of a patch path as per RFC 6901
+  :param part: The segment, e.g. 'application/json'
+  :return: The escaped segment, e.g. 'application~1json'
+  """
+  if '~' in part:
+    part = part.replace('~', '~0')
+  if '/' in part:
+    part = part.replace('/', '~1')
+  return part
+
+def create_patch(op, path, prefix=None, value=None):
+  """
+  Builds a single patch operation
+  :param op: One of 'add', 'replace', 'remove'
+  :param path: Field name, or key of a map field when prefix is given.  The key is escaped.
+  :param prefix: Name of the map field holding the key, if any
+  :param value: Value of the operation.  Patch values are always strings; None omits the value.
+  :return: Dictionary describing the patch operation
+  """
+  if prefix:
+    path = "/{0}/{1}".format(prefix, escape_path(path))
+  else:
+    path = "/{0}".format(path)
+
+  patch = {'op': op, 'path': path}
+  if value is not None:
+    patch['value'] = str(value)
+  return patch
+
+def values_equal(wanted, current, ignore_case=False):
+  """
+  Compares a module value with the value reported by boto3.  Values of the
+  same type, and numbers of any type, are compared directly; only mismatched
+  types (e.g. True against 'true') fall back to comparing their string forms.
+  :param wanted: The module's value
+  :param current: The value reported by boto3
+  :param ignore_case: Compare string forms case-insensitively
+  :return: True when the values are considered equal
+  """
+  if type(wanted) is type(current):
+    if wanted == current:
+      return True
+    if not ignore_case:
+      return False
+    if isinstance(wanted, basestring):
+      return wanted.lower() == current.lower()
+  elif _is_number(wanted) and _is_number(current):
+    return wanted == current
+
+  if not isinstance(wanted, basestring) or not isinstance(current, basestring):
+    wanted = str(wanted)
+    current = str(current)
+  elif wanted == current:
+    return True
+
+  if ignore_case:
+    return wanted.lower() == current.lower()
+  return wanted == current
+
+def _is_number(value):
+  return isinstance(value, (int, long, float)) and not isinstance(value, bool)
+
+def _lookup(doc, path):
+  for part in path.split('/'):
+    if not isinstance(doc, dict) or part not in doc:
+      return _MISSING
+    doc = doc[part]
+  return doc
+
+def diff_fields(current, params, fields):
+  """
+  Builds patch operations for scalar fields described by a field map.  Each
+  entry of fields is a dictionary with the keys
+    ansible     - name of the module param
+    boto        - name of the field in the boto3 document; nested fields are
+                  separated by '/' (e.g. 'throttle/rateLimit')
+    default     - value used when the param is not provided (default None)
+    ignore_case - compare values case-insensitively (default False)
+    op          - op emitted for any change; when omitted, 'add' is used for
+                  fields missing from current and 'replace' otherwise
+    remove      - emit 'remove' when the param is missing from params, and
+                  has no default, while the field exists (default False).  A
+                  param that is present but None leaves the field alone.
+    keep_empty  - skip the op when the param is '' and the field is missing
+                  (default False)
+  Params that are None are left alone.
+  :param current: The boto3 document, or None
+  :param params: Module params
+  :param fields: List of field specs
+  :return: List of patch operations, in the order of fields
+  """
+  current = current or {}
+  ops = []
+
+  for f in fields:
+    boto = f['boto']
+    ansible = f['ansible']
+    value = params.get(ansible, _MISSING)
+    if value is _MISSING:
+      value = f.get('default')
+      absent = True
+    else:
+      absent = False
+    existing = current.get(boto, _MISSING) if '/' not in boto else _lookup(current, boto)
+
+    if value is None:
+      if absent and existing is not _MISSING and f.get('remove', False):
+        ops.append(create_patch('remove', boto))
+    elif existing is _MISSING:
+      if value != '' or not f.get('keep_empty', False):
+        ops.append(create_patch(f.get('op', 'add'), boto, value=value))
+    elif type(value) is type(existing):
+      # Same type: no string forms are needed, which is the common case
+      if value == existing:
+        continue
+      if f.get('ignore_case', False) and isinstance(value, basestring) and value.lower() == existing.lower():
+        continue
+      ops.append(create_patch(f.get('op', 'replace'), boto, value=value))
+    elif not values_equal(value, existing, f.get('ignore_case', False)):
+      ops.append(create_patch(f.get('op', 'replace'), boto, value=value))
+
+  return ops
+
+def diff_map(current, wanted, prefix, ignore_case=False):
+  """
+  Builds patch operations that turn one string-keyed map field into another,
+  e.g. requestParameters or responseTemplates
+  :param current: The map as reported by boto3, or None
+  :param wanted: The desired map
+  :param prefix: Name of the map field
+  :param ignore_case: Compare values case-insensitively
+  :return: List of patch operations: adds and replaces in key order, then removes in key order
+  """
+  current = current or {}
+  changed = []
+  removed = []
+  added = 0
+
+  for (key, value) in wanted.iteritems():
+    existing = current.get(key, _MISSING)
+    if existing is _MISSING:
+      changed.append((key, 'add', value))
+      added += 1
+    elif type(value) is type(existing) and value == existing:
+      continue
+    elif not values_equal(value, existing, ignore_case):
+      changed.append((key, 'replace', value))
+
+  # Every key of wanted but the added ones is in current, so anything beyond
+  # that count must be removed
+  if len(current) > len(wanted) - added:
+    removed = [key for key in current if key not in wanted]
+
+  changed.sort()
+  removed.sort()
+  ops = [create_patch(op, key, prefix=prefix, value=value) for (key, op, value) in changed]
+  ops.extend([create_patch('remove', key, prefix=prefix) for key in removed])
+
+  return ops
+
+def diff_list(current, wanted, prefix):
+  """
+  Builds patch operations that turn one list field holding a set of strings
+  into another, e.g. binaryMediaTypes.  Each member is its own path, so
+  unchanged members are not touched.
+  :param current: The list as reported by boto3, or None
+  :param wanted: The desired list; order and duplicates are ignored
+  :param prefix: Name of the list field
+  :return: List of patch operations: adds in order, then removes in order
+  """
+  current = set(current or [])
+  wanted = set(wanted)
+
+  ops = [create_patch('add', item, prefix=prefix) for item in sorted(wanted - current)]
+  ops.extend([create_patch('remove', item, prefix=prefix) for item in sorted(current - wanted)])
+
+  return ops
+
+def diff_endpoint_configuration(current, endpoint_type, vpc_endpoint_ids=None):
+  """
+  Builds patch operations for the endpointConfiguration of a rest api or
+  domain name.  API Gateway holds a single endpoint type, changed by replacing
+  the current one; VPC endpoint ids are added and removed one at a time.
+  Removals come first and additions last, so that the ids are only attached
+  while the type is PRIVATE.
+  :param current: The endpointConfiguration as reported by boto3, or None
+  :param endpoint_type: The desired type (EDGE, REGIONAL or PRIVATE), or None to leave it alone
+  :param vpc_endpoint_ids: The desired list of VPC endpoint ids, or None to leave them alone
+  :return: List of patch operations
+  """
+  current = current or {}
+  types = current.get('types') or ['EDGE']
+  ops = []
+
+  if vpc_endpoint_ids is not None:
+    existing = set(current.get('vpcEndpointIds') or [])
+    for vpce in sorted(existing - set(vpc_endpoint_ids)):
+      ops.append(create_patch('remove', 'endpointConfiguration/vpcEndpointIds', value=vpce))
+
+  if endpoint_type is not None and types != [endpoint_type]:
+    ops.append(create_patch('replace', 'endpointConfiguration/types/{0}'.format(types[0]), value=endpoint_type))
+
+  if vpc_endpoint_ids is not None:
+    for vpce in sorted(set(vpc_endpoint_ids) - existing):
+      ops.append(create_patch('add', 'endpointConfiguration/vpcEndpointIds', value=vpce))
+
+  return ops
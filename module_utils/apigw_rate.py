@@ -0,0 +1,227 @@
+# API Gateway Ansible Modules
+#
+# Modules in this project allow management of the AWS API Gateway service.
+#
+# apigw_rate
+#    Rate limiting for concurrent API Gateway calls
+#
+
+# MIT License
+#
+# Copyright (c) 2016 Brian Felton, Emerson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+__version__ = '${version}'
+
+import fnmatch
+import json
+import os
+import tempfile
+import threading
+import time
+
+try:
+  import fcntl
+except ImportError:
+  fcntl = None
+
+# Calls per second and burst of the API Gateway control plane.  '*' is the
+# account wide budget every call takes from; the others are the lower limits
+# AWS documents for single operations.
+DEFAULT_BUDGETS = {
+  '*': dict(rate=10.0, burst=40.0),
+  'create_deployment': dict(rate=0.2, burst=1.0),
+  'create_domain_name': dict(rate=1.0 / 30, burst=1.0),
+  'create_resource': dict(rate=5.0, burst=5.0),
+  'create_rest_api': dict(rate=0.05, burst=1.0),
+  'delete_domain_name': dict(rate=1.0 / 30, burst=1.0),
+  'delete_resource': dict(rate=5.0, burst=5.0),
+  'delete_rest_api': dict(rate=1.0 / 30, burst=1.0),
+  'get_resources': dict(rate=2.5, burst=5.0),
+  'import_rest_api': dict(rate=0.05, burst=1.0),
+  'put_rest_api': dict(rate=1.0, burst=1.0),
+  'update_domain_name': dict(rate=1.0 / 30, burst=1.0),
+  'update_usage_plan': dict(rate=1.0, burst=1.0),
+}
+
+DEFAULT_STATE_FILE = os.path.join(tempfile.gettempdir(), 'ansible-apigw-rate-limits.json')
+
+def take_token(tokens, updated, now, rate, burst):
+  """
+  Refills a token bucket and reserves one token
+  :param tokens: Tokens left at the last update, negative when tokens are reserved ahead
+  :param updated: Time of the last update
+  :param now: Current time
+  :param rate: Tokens added per second
+  :param burst: Most tokens the bucket holds
+  :return: Tuple of the tokens left and the seconds until the reserved token is due
+  """
+  tokens = min(burst, tokens + max(0.0, now - updated) * rate) - 1
+  return tokens, (-tokens / rate if tokens < 0 else 0.0)
+
+def normalize_budgets(budgets):
+  """
+  Turns rate limit settings into budgets
+  :param budgets: Dict of operation name or pattern to either a rate or a dict with rate and optional burst
+  :return: Dict of operation name or pattern to dict(rate, burst)
+  """
+  result = {}
+  for name, budget in (budgets or {}).items():
+    if not isinstance(budget, dict):
+      budget = dict(rate=budget)
+    rate = float(budget.get('rate') or 0)
+    result[name] = dict(rate=rate, burst=float(budget.get('burst') or max(1.0, rate)))
+  return result
+
+class RateLimiter(object):
+  """
+  Token bucket shared by the threads of a worker pool.  Tokens refill at
+  rate per second up to burst; a caller that finds the bucket empty reserves
+  the next token and sleeps until it is due, without holding the lock.
+  """
+
+  def __init__(self, rate, burst=None, clock=None, sleep=None):
+    """
+    Constructor
+    :param rate: Calls allowed per second.  None or 0 disables limiting.
+    :param burst: Calls allowed back to back after an idle spell, defaults to one second's worth
+    :param clock: Function returning the current time in seconds, defaults to time.time
+    :param sleep: Function used to wait, defaults to time.sleep
+    """
+    self.rate = float(rate or 0)
+    self.burst = float(burst or max(1.0, self.rate))
+    self._clock = clock or time.time
+    self._sleep = sleep or time.sleep
+    self._tokens = self.burst
+    self._updated = self._clock()
+    self._lock = threading.Lock()
+
+  def acquire(self):
+    """
+    Takes one token, waiting for it when the bucket is empty
+    :return: Seconds spent waiting
+    """
+    if self.rate <= 0:
+      return 0.0
+
+    with self._lock:
+      now = self._clock()
+      self._tokens, wait = take_token(self._tokens, self._updated, now, self.rate, self.burst)
+      self._updated = now
+
+    if wait > 0:
+      self._sleep(wait)
+    return wait
+
+class SharedRateLimiter(object):
+  """
+  Token buckets shared by every module process on the host.  The buckets live
+  in a JSON state file that is locked while a caller reserves its tokens, so
+  parallel forks queue up behind one another at the sustainable rate instead
+  of being throttled.  Every call takes a token from the account wide '*'
+  bucket and from the bucket of its operation, matched by exact name first
+  and then by the longest matching pattern such as 'put_*'.
+  """
+
+  def __init__(self, path=None, budgets=None, prefix='', defaults=True, clock=None, sleep=None):
+    """
+    Constructor
+    :param path: State file, defaults to DEFAULT_STATE_FILE
+    :param budgets: Budgets overriding DEFAULT_BUDGETS, see normalize_budgets.  A rate of 0 disables a bucket.
+    :param prefix: Prefix of the bucket keys, to keep the buckets of different regions apart
+    :param defaults: False to use only the given budgets, without DEFAULT_BUDGETS
+    :param clock: Function returning the current time in seconds, defaults to time.time
+    :param sleep: Function used to wait, defaults to time.sleep
+    """
+    self.path = path or DEFAULT_STATE_FILE
+    self.budgets = normalize_budgets(DEFAULT_BUDGETS) if defaults else {}
+    self.budgets.update(normalize_budgets(budgets))
+    self.prefix = prefix
+    self._clock = clock or time.time
+    self._sleep = sleep or time.sleep
+    self._lock = threading.Lock()
+
+  def buckets(self, operation):
+    """
+    :param operation: Client method name
+    :return: Names of the budgets a call of operation takes from
+    """
+    names = ['*']
+    if operation in self.budgets:
+      names.append(operation)
+    else:
+      patterns = [n for n in self.budgets if n != '*' and fnmatch.fnmatchcase(operation, n)]
+      if patterns:
+        names.append(max(patterns, key=len))
+    return [n for n in names if n in self.budgets and self.budgets[n]['rate'] > 0]
+
+  def acquire(self, operation):
+    """
+    Takes one token from every bucket of operation, waiting until all of them are due
+    :param operation: Client method name
+    :return: Seconds spent waiting
+    """
+    names = self.buckets(operation)
+    if not names:
+      return 0.0
+
+    try:
+      with self._lock:
+        wait = self._reserve(names)
+    except (IOError, OSError):
+      # A state file we cannot use must not break the module
+      return 0.0
+
+    if wait > 0:
+      self._sleep(wait)
+    return wait
+
+  def _reserve(self, names):
+    """
+    Reserves a token of every named bucket in the state file
+    :param names: Names of the budgets
+    :return: Seconds until all reserved tokens are due
+    """
+    handle = os.fdopen(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600), 'r+')
+    try:
+      if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+      try:
+        state = json.loads(handle.read() or '{}')
+      except ValueError:
+        state = {}
+
+      now = self._clock()
+      wait = 0.0
+      for name in names:
+        budget = self.budgets[name]
+        key = self.prefix + name
+        tokens, updated = state.get(key, [budget['burst'], now])
+        tokens, due = take_token(tokens, updated, now, budget['rate'], budget['burst'])
+        state[key] = [tokens, now]
+        wait = max(wait, due)
+
+      handle.seek(0)
+      handle.truncate()
+      handle.write(json.dumps(state))
+      handle.flush()
+      return wait
+    finally:
+      handle.close()
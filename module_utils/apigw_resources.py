@@ -0,0 +1,310 @@
+# API Gateway Ansible Modules
+#
+# Modules in this project allow management of the AWS API Gateway service.
+#
+# apigw_resources
+#    Shared helpers for reading the Resource tree of a rest api
+#
+
+# MIT License
+#
+# Copyright (c) 2016 Brian Felton, Emerson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+__version__ = '${version}'
+
+try:
+  from ansible.module_utils.apigw_pages import iter_items
+except ImportError:
+  from module_utils.apigw_pages import iter_items
+
+def iter_resources(client, rest_api_id, embed=None):
+  """
+  Generator that pages through get_resources with iter_items
+  :param client: boto3 apigateway client
+  :param rest_api_id: The id of the rest api to list
+  :param embed: Optional list of sub-resources to embed (e.g. ['methods'])
+  :return: Yields one resource item at a time.  Errors from boto3 are raised.
+  """
+  kwargs = dict(restApiId=rest_api_id)
+  if embed:
+    kwargs['embed'] = embed
+
+  return iter_items(client.get_resources, **kwargs)
+
+class ResourceSnapshot(object):
+  """
+  Point-in-time view of the resources of a rest api.  When methods are
+  embedded, every method document is pulled in the same paged sweep, so
+  callers can diff against the snapshot instead of calling get_method.
+  """
+  def __init__(self, client, rest_api_id, embed_methods=False):
+    """
+    Constructor
+    :param client: boto3 apigateway client
+    :param rest_api_id: The id of the rest api to load
+    :param embed_methods: Request the method documents of every resource
+    """
+    self.client = client
+    self.rest_api_id = rest_api_id
+    self.embed_methods = embed_methods
+    self.by_id = {}
+    self.by_path = {}
+    self.complete = False
+    self._resources = None
+
+  def load(self, resource_ids=None):
+    """
+    Load resources, one page at a time.  A later call resumes from where the
+    previous one stopped instead of listing from the start again.
+    :param resource_ids: Optional list of resource ids.  Loading stops as soon
+                         as all of them have been seen.
+    :return: self, to allow chaining.  Errors from boto3 are raised.
+    """
+    pending = None if resource_ids is None else set(resource_ids) - set(self.by_id)
+    if self.complete or pending is not None and not pending:
+      return self
+
+    if self._resources is None:
+      embed = ['methods'] if self.embed_methods else None
+      self._resources = iter_resources(self.client, self.rest_api_id, embed=embed)
+
+    for res in self._resources:
+      self.by_id[res.get('id')] = res
+      self.by_path[res.get('path')] = res
+
+      if pending is not None:
+        pending.discard(res.get('id'))
+        if not pending:
+          return self
+
+    self.complete = True
+    return self
+
+  def get_method(self, resource_id, http_method):
+    """
+    Look up an embedded method document
+    :param resource_id: The id of the resource owning the method
+    :param http_method: The http verb of the method
+    :return: The method document, or None when it does not exist
+    """
+    resource = self.by_id.get(resource_id, {})
+    return resource.get('resourceMethods', {}).get(http_method)
+
+try:
+  _intern = intern
+except NameError:
+  from sys import intern as _intern
+
+def _intern_part(part):
+  """
+  Intern a path part so repeated parts share one string
+  :param part: A single path part
+  :return: The interned part, or the part itself when it cannot be interned
+  """
+  try:
+    return _intern(str(part))
+  except UnicodeError:
+    return part
+
+class _PathNode(object):
+  """
+  A single path part in a PathIndex.  Full paths are never stored; they are
+  rebuilt from the parts on the way up to the root.
+  """
+  __slots__ = ('part', 'id', 'parent_id', 'parent', 'children')
+
+  def __init__(self, part, parent):
+    self.part = part
+    self.id = None
+    self.parent_id = None
+    self.parent = parent
+    self.children = None
+
+class PathIndex(object):
+  """
+  Compact trie of the resources of a rest api, keyed by path part.  Nodes use
+  __slots__ and interned parts, so the repeated parts of large APIs (e.g.
+  '{id}' or 'v1') are stored once.  Lookups, ancestor walks, and inserts cost
+  O(depth) regardless of the number of resources.  The trade-off is that a
+  single lookup walks one dict per path part, so it is several times slower
+  than one lookup in a dict keyed by the full path (see
+  benchmarks/bench_path_index.py); the module does few lookups per run, so
+  the smaller footprint and fast subtree walks win.
+
+  A node only counts as a resource once its id is known; nodes created on the
+  way to a deeper path stay placeholders until listed.
+  """
+  def __init__(self):
+    self.root = _PathNode('', None)
+    self._count = 0
+
+  @staticmethod
+  def _split(path):
+    # Splits like the rest of the module does, so '/a//b' and '/a/' keep
+    # their empty parts rather than resolving to '/a/b' and '/a'
+    return [] if path == '/' else path.split('/')[1:]
+
+  def _find(self, path):
+    node = self.root
+    for part in PathIndex._split(path):
+      if node.children is None:
+        return None
+      node = node.children.get(part)
+      if node is None:
+        return None
+    return node
+
+  @staticmethod
+  def _path_of(node):
+    parts = []
+    while node.parent is not None:
+      parts.append(node.part)
+      node = node.parent
+    return '/' + '/'.join(reversed(parts))
+
+  def add(self, path, resource_id, parent_id=None):
+    """
+    Record a resource, creating placeholder ancestors as needed
+    :param path: The full resource path
+    :param resource_id: The id of the resource
+    :param parent_id: The parentId API Gateway reported for the resource, if any
+    :return: Nothing
+    """
+    node = self.root
+    for part in PathIndex._split(path):
+      if node.children is None:
+        node.children = {}
+      child = node.children.get(part)
+      if child is None:
+        part = _intern_part(part)
+        child = node.children[part] = _PathNode(part, node)
+      node = child
+
+    if node.id is None:
+      self._count += 1
+    node.id = resource_id
+    node.parent_id = parent_id
+
+  def remove(self, path):
+    """
+    Remove a resource and its whole subtree, as API Gateway does on delete
+    :param path: The full resource path
+    :return: Number of resources removed
+    """
+    node = self._find(path)
+    if node is None or node.parent is None:
+      return 0
+
+    removed = sum(1 for _ in self._walk(node))
+    del node.parent.children[node.part]
+    self._count -= removed
+    return removed
+
+  def __contains__(self, path):
+    node = self._find(path)
+    return node is not None and node.id is not None
+
+  def __len__(self):
+    return self._count
+
+  def get_id(self, path):
+    """
+    :param path: The full resource path
+    :return: The id of the resource, or None when it is unknown
+    """
+    node = self._find(path)
+    return None if node is None else node.id
+
+  def describe(self, path):
+    """
+    :param path: The full resource path
+    :return: Dictionary with the id, parentId (when known), and path of the resource
+    """
+    node = self._find(path)
+    result = {'id': None if node is None else node.id, 'path': path}
+    if node is not None and node.parent_id is not None:
+      result['parentId'] = node.parent_id
+    elif node is not None and node.parent is not None and node.parent.id is not None:
+      result['parentId'] = node.parent.id
+    return result
+
+  def ancestors(self, path):
+    """
+    Walk from a path's parent up to the root
+    :param path: The full resource path
+    :return: Yields (path, id) for each ancestor, nearest first
+    """
+    parts = PathIndex._split(path)
+    node = self._find(path)
+    while parts:
+      parts.pop()
+      node = None if node is None else node.parent
+      yield '/' + '/'.join(parts), None if node is None else node.id
+
+  def _walk(self, node):
+    stack = [node]
+    while stack:
+      node = stack.pop()
+      if node.id is not None:
+        yield node
+      if node.children:
+        stack.extend(node.children.values())
+
+  def items(self, path='/'):
+    """
+    Enumerate a subtree
+    :param path: The root of the subtree, defaults to the whole api
+    :return: Yields (path, id) for every resource at or beneath path
+    """
+    node = self._find(path)
+    if node is None:
+      return
+    for n in self._walk(node):
+      yield PathIndex._path_of(n), n.id
+
+  def prune(self, keep):
+    """
+    Determines the top-most resources that are neither in keep nor an
+    ancestor of a path in keep
+    :param keep: Iterable of paths to keep
+    :return: Sorted list of paths
+    """
+    kept = set()
+    for path in keep:
+      parts = PathIndex._split(path)
+      while parts:
+        kept.add('/' + '/'.join(parts))
+        parts.pop()
+
+    result = []
+    stack = [(self.root, '')]
+    while stack:
+      (node, prefix) = stack.pop()
+      for part, child in (node.children or {}).items():
+        child_path = "{0}/{1}".format(prefix, part)
+        if child_path in kept:
+          stack.append((child, child_path))
+        elif child.id is not None:
+          result.append(child_path)
+        else:
+          stack.append((child, child_path))
+
+    return sorted(result)
@@ -0,0 +1,185 @@
+# API Gateway Ansible Modules
+#
+# Modules in this project allow management of the AWS API Gateway service.
+#
+# apigw_retry
+#    Retry helpers for API Gateway control-plane calls
+#
+
+# MIT License
+#
+# Copyright (c) 2016 Brian Felton, Emerson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+__version__ = '${version}'
+
+import random
+import threading
+import time
+
+try:
+  from botocore.exceptions import ConnectionClosedError, ConnectionError, ReadTimeoutError
+  TRANSIENT_EXCEPTIONS = (ConnectionClosedError, ConnectionError, ReadTimeoutError)
+except ImportError:
+  TRANSIENT_EXCEPTIONS = ()
+
+THROTTLE_ERROR_CODES = ['TooManyRequestsException', 'ThrottlingException', 'Throttling']
+CONFLICT_ERROR_CODES = ['ConflictException']
+TRANSIENT_ERROR_CODES = ['ServiceUnavailableException', 'ServiceUnavailable', 'InternalFailure', 'InternalServerError', 'RequestTimeout', 'RequestTimeoutException']
+
+# API Gateway raises ConflictException both for concurrent updates of one api,
+# which clear up on their own, and for resources that already exist, which
+# never do.  Only conflicts whose message reads like the former are retried.
+CONFLICT_RETRY_MESSAGES = ['concurrent modification', 'try again']
+
+def error_code(e):
+  """
+  Extracts the error code of a botocore ClientError
+  :param e: The exception
+  :return: The error code, or None for other exceptions
+  """
+  response = getattr(e, 'response', None)
+  if not isinstance(response, dict):
+    return None
+  return response.get('Error', {}).get('Code')
+
+def is_throttle_error(e):
+  """
+  :param e: The exception
+  :return: True when the exception is API Gateway throttling the caller
+  """
+  return error_code(e) in THROTTLE_ERROR_CODES
+
+def classify_error(e):
+  """
+  Sorts an exception raised by a client call into the kinds of errors that
+  are worth retrying
+  :param e: The exception
+  :return: 'throttle', 'conflict' or 'transient', or None when retrying cannot help
+  """
+  code = error_code(e)
+  if code in THROTTLE_ERROR_CODES:
+    return 'throttle'
+  if code in CONFLICT_ERROR_CODES:
+    message = (e.response.get('Error', {}).get('Message') or '').lower()
+    return 'conflict' if any(m in message for m in CONFLICT_RETRY_MESSAGES) else None
+  if code in TRANSIENT_ERROR_CODES:
+    return 'transient'
+  if code is not None and e.response.get('ResponseMetadata', {}).get('HTTPStatusCode', 0) >= 500:
+    return 'transient'
+  if isinstance(e, TRANSIENT_EXCEPTIONS):
+    return 'transient'
+  return None
+
+def call_with_retry(func, kwargs, max_attempts=5, base_delay=0.5, max_delay=10.0, deadline=None, sleep=None, clock=None, on_retry=None):
+  """
+  Calls func(**kwargs), retrying throttled, conflicting and transient errors
+  with decorrelated jitter backoff.  Any other error, the last retryable one,
+  or one whose retry would pass the deadline is raised.  Functions that
+  already retry on their own, such as the methods of a RetryingClient, are
+  called once.
+  :param func: The client method to call
+  :param kwargs: Keyword arguments for the call
+  :param max_attempts: Total number of attempts
+  :param base_delay: Shortest delay in seconds between attempts
+  :param max_delay: Upper bound of any single delay in seconds
+  :param deadline: Seconds after the first attempt past which no retry starts, or None
+  :param sleep: Function used to wait between attempts, defaults to time.sleep
+  :param clock: Function returning the current time, defaults to time.time
+  :param on_retry: Called with the exception before every retry
+  :return: Result of the call
+  """
+  if getattr(func, 'retries_handled', False) is True:
+    return func(**kwargs)
+
+  sleep = sleep or time.sleep
+  clock = clock or time.time
+  give_up = None if deadline is None else clock() + deadline
+  attempt = 1
+  delay = base_delay
+  while True:
+    try:
+      return func(**kwargs)
+    except Exception as e:
+      if attempt >= max_attempts or classify_error(e) is None:
+        raise
+      delay = min(max_delay, random.uniform(base_delay, delay * 3))
+      if give_up is not None and clock() + delay > give_up:
+        raise
+      if on_retry is not None:
+        on_retry(e)
+      sleep(delay)
+      attempt += 1
+
+class RetryingClient(object):
+  """
+  Wraps a boto3 client so that every API call goes through call_with_retry,
+  and counts the retries made per operation.  With a limiter, every attempt
+  first waits for a token of its operation, and with a write lock it then
+  holds the locks of the call while it runs.
+  """
+
+  # Client attributes that are not API calls
+  PASSTHROUGH = ['meta', 'exceptions', 'can_paginate', 'get_paginator', 'get_waiter', 'generate_presigned_url']
+
+  def __init__(self, client, limiter=None, write_lock=None, **retry_args):
+    """
+    :param client: The boto3 client
+    :param limiter: Object whose acquire(operation) paces the calls, or None
+    :param write_lock: Object whose hold(operation, kwargs) context guards the calls, or None
+    :param retry_args: Keyword arguments for call_with_retry
+    """
+    self.client = client
+    self.limiter = limiter
+    self.write_lock = write_lock
+    self.retry_args = retry_args
+    self.counts = {}
+    self.lock = threading.Lock()
+
+  def __getattr__(self, name):
+    attr = getattr(self.client, name)
+    if name.startswith('_') or name in self.PASSTHROUGH or not callable(attr):
+      return attr
+
+    def count(e):
+      with self.lock:
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    func = attr
+    if self.limiter is not None or self.write_lock is not None:
+      def func(**kwargs):
+        if self.limiter is not None:
+          self.limiter.acquire(name)
+        if self.write_lock is None:
+          return attr(**kwargs)
+        with self.write_lock.hold(name, kwargs):
+          return attr(**kwargs)
+
+    def call(**kwargs):
+      return call_with_retry(func, kwargs, on_retry=count, **self.retry_args)
+    call.retries_handled = True
+    return call
+
+  def retry_counts(self):
+    """
+    :return: Dict of operation name to the number of retries made, for operations that were retried
+    """
+    with self.lock:
+      return dict(self.counts)
@@ -0,0 +1,147 @@
+# API Gateway Ansible Modules
+#
+# Modules in this project allow management of the AWS API Gateway service.
+#
+# apigw_usage_plan_spec
+#    Translates usage plan specs into create_usage_plan arguments and patches
+#
+
+# MIT License
+#
+# Copyright (c) 2016 Brian Felton, Emerson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+__version__ = '${version}'
+
+try:
+  from ansible.module_utils.apigw_patch import diff_fields
+except ImportError:
+  from module_utils.apigw_patch import diff_fields
+
+# Module params that live in nested boto3 structures
+PARAM_MAP = {
+  'throttle_burst_limit': 'throttle/burstLimit',
+  'throttle_rate_limit': 'throttle/rateLimit',
+  'quota_offset': 'quota/offset',
+  'quota_limit': 'quota/limit',
+  'quota_period': 'quota/period',
+}
+
+# Numeric params use negative values to mean 'not provided'
+NUMERIC_PARAMS = ['throttle_burst_limit', 'throttle_rate_limit', 'quota_limit', 'quota_offset']
+
+def is_default_value(param_name, param_value):
+  """
+  :param param_name: Name of a usage plan param
+  :param param_value: Its value
+  :return: True when the value means the param was not provided
+  """
+  if param_name in NUMERIC_PARAMS:
+    return param_value is None or param_value < 0
+  return param_value in [None, '']
+
+def all_defaults(params, param_names):
+  """
+  :param params: Usage plan params
+  :param param_names: Names of the params to check
+  :return: True when any of the params holds its default value
+  """
+  is_default = False
+  for p in param_names:
+    is_default = is_default or is_default_value(p, params.get(p, None))
+
+  return is_default
+
+def api_stages_remove_patches(me):
+  """
+  :param me: The usage plan as reported by boto3
+  :return: Patch operations detaching every api stage of the plan
+  """
+  patches = []
+  for entry in me.get('apiStages', []):
+    key = "{0}:{1}".format(entry['apiId'], entry['stage'])
+    patches.append({'op': 'remove', 'path': '/apiStages', 'value': key})
+
+  return patches
+
+def create_args(params, pmap=PARAM_MAP):
+  """
+  Builds the create_usage_plan arguments for a plan spec
+  :param params: Usage plan params
+  :param pmap: Mapping of params to nested boto3 fields
+  :return: Dictionary of keyword arguments
+  """
+  args = dict(name=params['name'])
+
+  for f in ['description','throttle_burst_limit','throttle_rate_limit','quota_limit','quota_period','quota_offset']:
+    if not is_default_value(f, params.get(f, None)):
+      boto_param = pmap.get(f, f)
+      if '/' in boto_param:
+        (p1, p2) = boto_param.split('/')
+        if p1 not in args:
+          args[p1] = {}
+        args[p1].update({p2: params[f]})
+      else:
+        args[boto_param] = params[f]
+
+  for stage in params.get('api_stages', None) or []:
+    if 'apiStages' not in args:
+      args['apiStages'] = []
+    args['apiStages'].append({'apiId': stage.get('rest_api_id'), 'stage': stage.get('stage')})
+
+  return args
+
+def create_patches(params, me, pmap=PARAM_MAP):
+  """
+  Builds the update_usage_plan patches that turn a plan into its spec
+  :param params: Usage plan params
+  :param me: The usage plan as reported by boto3
+  :param pmap: Mapping of params to nested boto3 fields
+  :return: List of patch operations
+  """
+  patches = []
+
+  # delete ops
+  if 'throttle' in me and all_defaults(params, ['throttle_rate_limit','throttle_burst_limit']):
+    patches.append({'op': 'remove', 'path': "/throttle"})
+  if 'quota' in me and all_defaults(params, ['quota_limit','quota_offset','quota_period']):
+    patches.append({'op': 'remove', 'path': "/quota"})
+  if 'apiStages' in me and (params.get('api_stages', None) or []) == []:
+    patches.extend(api_stages_remove_patches(me))
+
+  # add/replace ops; default throttle and quota values mean 'not provided'
+  values = {'description': params.get('description', '')}
+  fields = [{'ansible': 'description', 'boto': 'description', 'op': 'replace', 'keep_empty': True}]
+  for p in ['throttle_rate_limit','throttle_burst_limit','quota_limit','quota_offset','quota_period']:
+    if not is_default_value(p, params.get(p, None)):
+      values[p] = params[p]
+    fields.append({'ansible': p, 'boto': pmap.get(p, p)})
+  patches.extend(diff_fields(me, values, fields))
+
+  # add handling for api_stages
+  api_stages = []
+  for stage in me.get('apiStages', []):
+    api_stages.append("{0}:{1}".format(stage['apiId'], stage['stage']))
+  for entry in params.get('api_stages', None) or []:
+    key = "{0}:{1}".format(entry['rest_api_id'], entry['stage'])
+    if key not in api_stages:
+      patches.append({'op': 'add', 'path': '/apiStages', 'value': key})
+
+  return patches
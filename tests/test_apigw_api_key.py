@@ -2,19 +2,19 @@
 # TODO: License goes here
 
 import library.apigw_api_key as apigw_api_key
-from library.apigw_api_key import ApiGwApiKey
+from library.apigw_api_key import ApiGwApiKey, build_import_chunks
 import mock
 from mock import patch
 from mock import create_autospec
 from mock import ANY
 import unittest
-import boto
 from botocore.exceptions import BotoCoreError
 
 class TestApiGwApiKey(unittest.TestCase):
 
   def setUp(self):
     self.module = mock.MagicMock()
+    self.module.params = {}
     self.module.check_mode = False
     self.module.exit_json = mock.MagicMock()
     self.module.fail_json = mock.MagicMock()
@@ -30,7 +30,7 @@ class TestApiGwApiKey(unittest.TestCase):
     }
     reload(apigw_api_key)
 
-  def test_boto_module_not_found(self):
+  def test_legacy_boto_module_not_required(self):
     # Setup Mock Import Function
     import __builtin__ as builtins
     real_import = builtins.__import__
@@ -43,7 +43,7 @@ class TestApiGwApiKey(unittest.TestCase):
       reload(apigw_api_key)
       ApiGwApiKey(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.assertEqual(0, self.module.fail_json.call_count)
 
   def test_boto3_module_not_found(self):
     # Setup Mock Import Function
@@ -58,12 +58,12 @@ class TestApiGwApiKey(unittest.TestCase):
       reload(apigw_api_key)
       ApiGwApiKey(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.module.fail_json.assert_called_with(msg='boto3 is required for this module')
 
-  @patch.object(apigw_api_key, 'boto3')
-  def test_boto3_client_properly_instantiated(self, mock_boto):
+  @patch('boto3.client')
+  def test_boto3_client_properly_instantiated(self, mock_client):
     ApiGwApiKey(self.module)
-    mock_boto.client.assert_called_once_with('apigateway')
+    mock_client.assert_called_once_with('apigateway')
 
   @patch.object(ApiGwApiKey, '_update_api_key', return_value=(1,2))
   def test_process_request_calls_get_api_keys_and_stores_result_when_invoked(self, m):
@@ -78,7 +78,7 @@ class TestApiGwApiKey(unittest.TestCase):
     self.api_key.process_request()
 
     self.assertEqual(resp['items'][1], self.api_key.me)
-    self.api_key.client.get_api_keys.assert_called_once_with(nameQuery='testify', includeValues=True)
+    self.api_key.client.get_api_keys.assert_called_once_with(nameQuery='testify', limit=500)
 
   def test_process_request_stores_None_result_when_not_found_in_get_api_keys_result(self):
     resp = {
@@ -92,14 +92,14 @@ class TestApiGwApiKey(unittest.TestCase):
     self.api_key.process_request()
 
     self.assertEqual(None, self.api_key.me)
-    self.api_key.client.get_api_keys.assert_called_once_with(nameQuery='testify', includeValues=True)
+    self.api_key.client.get_api_keys.assert_called_once_with(nameQuery='testify', limit=500)
 
   def test_process_request_calls_fail_json_when_get_api_keys_raises_exception(self):
     self.api_key.client.get_api_keys = mock.MagicMock(side_effect=BotoCoreError())
 
     self.api_key.process_request()
 
-    self.api_key.client.get_api_keys.assert_called_once_with(nameQuery='testify', includeValues=True)
+    self.api_key.client.get_api_keys.assert_called_once_with(nameQuery='testify', limit=500)
     self.api_key.module.fail_json.assert_called_once_with(
       msg='Error when getting api_keys from boto3: An unspecified error occurred'
     )
@@ -280,15 +280,47 @@ class TestApiGwApiKey(unittest.TestCase):
     )
 
   @patch('library.apigw_api_key.ApiGwApiKey._create_patches', return_value=['patches!'])
-  @patch.object(ApiGwApiKey, '_retrieve_api_key', side_effect=[{'id': 'hi'}, 'second call'])
-  def test_process_request_returns_result_of_find_when_update_is_successful(self, m, mcp):
+  @patch.object(ApiGwApiKey, '_retrieve_api_key', return_value={'id': 'hi'})
+  def test_process_request_returns_result_of_update_when_update_is_successful(self, m, mcp):
+    self.api_key.client.update_api_key = mock.MagicMock(return_value={'id': 'hi', 'enabled': True})
     self.api_key.process_request()
 
     self.api_key.client.update_api_key.assert_called_once_with(
       apiKey='hi',
       patchOperations=['patches!']
     )
-    self.api_key.module.exit_json.assert_called_once_with(changed=True, api_key='second call')
+    self.assertEqual(1, m.call_count)
+    self.api_key.module.exit_json.assert_called_once_with(changed=True, api_key={'id': 'hi', 'enabled': True})
+
+  def test_process_request_stops_paging_at_exact_match(self):
+    self.api_key.client.get_api_keys = mock.MagicMock(return_value={
+      'items': [{'name': 'testify-2', 'id': 'a'}, {'name': 'testify', 'id': 'b', 'description': 'test_description', 'enabled': True}],
+      'position': 'more',
+    })
+    self.api_key.process_request()
+
+    self.assertEqual(1, self.api_key.client.get_api_keys.call_count)
+    self.assertEqual('b', self.api_key.me['id'])
+
+  def test_process_request_requests_values_only_when_include_value_is_set(self):
+    self.api_key.module.params['include_value'] = True
+    self.api_key.client.get_api_keys = mock.MagicMock(return_value={
+      'items': [{'name': 'testify', 'id': 'b', 'enabled': False, 'value': 'secret'}]
+    })
+    self.api_key.client.update_api_key = mock.MagicMock(return_value={'name': 'testify', 'id': 'b', 'enabled': True})
+    self.api_key.process_request()
+
+    self.api_key.client.get_api_keys.assert_called_once_with(nameQuery='testify', includeValues=True, limit=500)
+    self.api_key.module.exit_json.assert_called_once_with(
+      changed=True, api_key={'name': 'testify', 'id': 'b', 'enabled': True, 'value': 'secret'}
+    )
+
+  @patch.object(ApiGwApiKey, '_retrieve_api_key', return_value=None)
+  def test_process_request_drops_value_from_create_result_by_default(self, m):
+    self.api_key.client.create_api_key = mock.MagicMock(return_value={'id': 'new', 'value': 'test_value'})
+    self.api_key.process_request()
+
+    self.api_key.module.exit_json.assert_called_once_with(changed=True, api_key={'id': 'new'})
 
   @patch('library.apigw_api_key.ApiGwApiKey._create_patches', return_value=['patches!'])
   @patch.object(ApiGwApiKey, '_retrieve_api_key', return_value={'something': 'here'})
@@ -299,14 +331,125 @@ class TestApiGwApiKey(unittest.TestCase):
     self.assertEqual(0, self.api_key.client.update_api_key.call_count)
     self.api_key.module.exit_json.assert_called_once_with(changed=True, api_key={'something': 'here'})
 
+  def test_build_import_chunks_splits_under_the_limit(self):
+    entries = [
+      dict(name='a', value='va', description=None, enabled=True),
+      dict(name='b', value='v,b', description=u'd\u00e9sc', enabled=False),
+      dict(name='c', value='vc', description='', enabled=False),
+    ]
+
+    chunks = build_import_chunks(entries, limit=50)
+
+    self.assertEqual([
+      ('name,key,description,enabled\na,va,,true\n', ['a']),
+      ('name,key,description,enabled\nb,"v,b",d\xc3\xa9sc,false\n', ['b']),
+      ('name,key,description,enabled\nc,vc,,false\n', ['c']),
+    ], chunks)
+    self.assertEqual(1, len(build_import_chunks(entries)))
+
+  def _bulk(self, inventory, api_keys, state='present'):
+    self.api_key.module.params = {'api_keys': api_keys, 'state': state, 'fail_on_warnings': False}
+    self.api_key.client.get_api_keys = mock.MagicMock(return_value={'items': inventory})
+    self.api_key.client.import_api_keys = mock.MagicMock(return_value={'ids': ['new1'], 'warnings': []})
+    self.api_key.process_request()
+
+  def test_process_request_bulk_imports_missing_keys_and_patches_changed_ones(self):
+    inventory = [
+      {'id': 'id1', 'name': 'same', 'enabled': True},
+      {'id': 'id2', 'name': 'changed', 'enabled': True, 'description': 'old'},
+    ]
+    self._bulk(inventory, [
+      {'name': 'same', 'enabled': True},
+      {'name': 'changed', 'enabled': 'yes', 'description': 'new'},
+      {'name': 'missing', 'value': 'secret', 'enabled': True},
+    ])
+
+    self.api_key.client.get_api_keys.assert_called_once_with(limit=500)
+    self.api_key.client.import_api_keys.assert_called_once_with(
+      body='name,key,description,enabled\nmissing,secret,,true\n', format='csv', failOnWarnings=False
+    )
+    self.api_key.client.update_api_key.assert_called_once_with(apiKey='id2', patchOperations=[
+      {'op': 'replace', 'path': '/description', 'value': 'new'},
+    ])
+    self.assertEqual(0, self.api_key.client.create_api_key.call_count)
+    self.api_key.module.exit_json.assert_called_once_with(changed=True, api_keys=dict(
+      created=['missing'], updated=['changed'], removed=[], ids=['new1'], warnings=[]
+    ))
+
+  def test_process_request_bulk_reports_no_change_when_keys_match(self):
+    self._bulk([{'id': 'id1', 'name': 'same', 'enabled': False}], [{'name': 'same'}])
+
+    self.assertEqual(0, self.api_key.client.import_api_keys.call_count)
+    self.assertEqual(0, self.api_key.client.update_api_key.call_count)
+    self.api_key.module.exit_json.assert_called_once_with(changed=False, api_keys=dict(
+      created=[], updated=[], removed=[], ids=[], warnings=[]
+    ))
+
+  def test_process_request_bulk_deletes_listed_keys_when_absent(self):
+    self._bulk([{'id': 'id1', 'name': 'gone'}], [{'name': 'gone'}, {'name': 'never-there'}], state='absent')
+
+    self.api_key.client.delete_api_key.assert_called_once_with(apiKey='id1')
+    self.api_key.module.exit_json.assert_called_once_with(changed=True, api_keys=dict(
+      created=[], updated=[], removed=['gone'], ids=[], warnings=[]
+    ))
+
+  def test_process_request_bulk_fails_when_missing_keys_have_no_value(self):
+    self._bulk([], [{'name': 'a'}, {'name': 'b', 'value': 'v'}])
+
+    self.assertEqual(0, self.api_key.client.import_api_keys.call_count)
+    self.api_key.module.fail_json.assert_called_once_with(msg='api_keys entries need a value to be imported: a')
+
+  def test_process_request_bulk_fails_on_duplicate_names(self):
+    self._bulk([], [{'name': 'a', 'value': 'v'}, {'name': 'a', 'value': 'w'}])
+
+    self.assertEqual(0, self.api_key.client.get_api_keys.call_count)
+    self.api_key.module.fail_json.assert_called_once_with(msg='api_keys lists a more than once')
+
+  def test_process_request_bulk_skips_writes_in_check_mode(self):
+    self.api_key.module.check_mode = True
+    self._bulk([{'id': 'id1', 'name': 'x', 'enabled': True}], [{'name': 'x'}, {'name': 'y', 'value': 'v'}])
+
+    self.assertEqual(0, self.api_key.client.import_api_keys.call_count)
+    self.assertEqual(0, self.api_key.client.update_api_key.call_count)
+    self.api_key.module.exit_json.assert_called_once_with(changed=True, api_keys=dict(
+      created=['y'], updated=['x'], removed=[], ids=[], warnings=[]
+    ))
+
+  def test_process_request_bulk_calls_fail_json_when_import_api_keys_raises_exception(self):
+    self.api_key.module.params = {'api_keys': [{'name': 'y', 'value': 'v'}], 'state': 'present'}
+    self.api_key.client.get_api_keys = mock.MagicMock(return_value={'items': []})
+    self.api_key.client.import_api_keys = mock.MagicMock(side_effect=BotoCoreError())
+    self.api_key.process_request()
+
+    self.api_key.module.fail_json.assert_called_once_with(
+      msg='Error when provisioning api_keys via boto3: An unspecified error occurred',
+      changed=False, api_keys=dict(created=[], updated=[], removed=[], ids=[], warnings=[])
+    )
+
+  def test_process_request_bulk_reports_completed_writes_when_a_later_one_fails(self):
+    self.api_key.client.update_api_key = mock.MagicMock(side_effect=BotoCoreError())
+    self._bulk([{'id': 'id1', 'name': 'changed', 'enabled': False}], [
+      {'name': 'changed', 'enabled': True},
+      {'name': 'missing', 'value': 'secret'},
+    ])
+
+    self.assertEqual(0, self.api_key.module.exit_json.call_count)
+    self.api_key.module.fail_json.assert_called_once_with(
+      msg='Error when provisioning api_keys via boto3: An unspecified error occurred',
+      changed=True, api_keys=dict(created=['missing'], updated=[], removed=[], ids=['new1'], warnings=[])
+    )
+
   def test_define_argument_spec(self):
     result = ApiGwApiKey._define_module_argument_spec()
     self.assertIsInstance(result, dict)
     self.assertEqual(result, dict(
-                     name=dict(required=True),
+                     name=dict(required=False),
+                     api_keys=dict(required=False, type='list'),
+                     fail_on_warnings=dict(required=False, type='bool', default=False),
                      description=dict(required=False),
                      value=dict(required=False),
                      enabled=dict(required=False, type='bool', default=False),
+                     include_value=dict(required=False, type='bool', default=False),
                      generate_distinct_id=dict(required=False, type='bool', default=False),
                      state=dict(default='present', choices=['present', 'absent']),
     ))
@@ -8,7 +8,6 @@ from mock import patch
 from mock import create_autospec
 from mock import ANY
 import unittest
-import boto
 from botocore.exceptions import BotoCoreError
 import copy
 
@@ -16,6 +15,7 @@ class TestApiGwAuthorizer(unittest.TestCase):
 
   def setUp(self):
     self.module = mock.MagicMock()
+    self.module.params = {}
     self.module.check_mode = False
     self.module.exit_json = mock.MagicMock()
     self.module.fail_json = mock.MagicMock()
@@ -32,7 +32,7 @@ class TestApiGwAuthorizer(unittest.TestCase):
     }
     reload(apigw_authorizer)
 
-  def test_boto_module_not_found(self):
+  def test_legacy_boto_module_not_required(self):
     # Setup Mock Import Function
     import __builtin__ as builtins
     real_import = builtins.__import__
@@ -45,7 +45,7 @@ class TestApiGwAuthorizer(unittest.TestCase):
       reload(apigw_authorizer)
       ApiGwAuthorizer(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.assertEqual(0, self.module.fail_json.call_count)
 
   def test_boto3_module_not_found(self):
     # Setup Mock Import Function
@@ -60,12 +60,12 @@ class TestApiGwAuthorizer(unittest.TestCase):
       reload(apigw_authorizer)
       ApiGwAuthorizer(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.module.fail_json.assert_called_with(msg='boto3 is required for this module')
 
-  @patch.object(apigw_authorizer, 'boto3')
-  def test_boto3_client_properly_instantiated(self, mock_boto):
+  @patch('boto3.client')
+  def test_boto3_client_properly_instantiated(self, mock_client):
     ApiGwAuthorizer(self.module)
-    mock_boto.client.assert_called_once_with('apigateway')
+    mock_client.assert_called_once_with('apigateway')
 
   @patch.object(ApiGwAuthorizer, '_update_authorizer', return_value=(None, None))
   def test_process_request_calls_get_authorizers_and_stores_result_when_invoked(self, m):
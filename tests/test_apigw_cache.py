@@ -0,0 +1,75 @@
+#!/usr/bin/python
+# TODO: License goes here
+
+from module_utils.apigw_cache import NameCache
+import json
+import mock
+import os
+import shutil
+import tempfile
+import unittest
+
+class TestApiGwCache(unittest.TestCase):
+
+  def setUp(self):
+    self.tmpdir = tempfile.mkdtemp()
+    self.path = os.path.join(self.tmpdir, 'cache.json')
+
+  def tearDown(self):
+    shutil.rmtree(self.tmpdir)
+
+  def test_get_returns_none_for_unknown_names_and_missing_file(self):
+    self.assertIsNone(NameCache(self.path, 'ns').get('name'))
+    self.assertFalse(os.path.exists(self.path))
+
+  def test_save_persists_entries_per_namespace(self):
+    cache = NameCache(self.path, 'ns')
+    cache.put('a', ['1'])
+    cache.put('dup', ['2', '3'])
+    cache.save()
+
+    self.assertEqual(['2', '3'], NameCache(self.path, 'ns').get('dup'))
+    self.assertIsNone(NameCache(self.path, 'other').get('a'))
+
+  def test_save_keeps_entries_written_by_other_processes(self):
+    first = NameCache(self.path, 'ns')
+    first.put('a', ['1'])
+    first.put('b', ['2'])
+    first.save()
+
+    mine = NameCache(self.path, 'ns')
+    mine.get('a')
+    theirs = NameCache(self.path, 'ns')
+    theirs.put('c', ['3'])
+    theirs.save()
+
+    mine.discard('a')
+    mine.save()
+
+    with open(self.path) as f:
+      self.assertEqual({'ns': {'b': ['2'], 'c': ['3']}}, json.load(f))
+
+  def test_names_lists_the_recorded_names(self):
+    cache = NameCache(self.path, 'ns')
+    cache.put('a', ['1'])
+    cache.put('b', ['2'])
+    self.assertEqual(['a', 'b'], sorted(cache.names()))
+
+  def test_save_skips_write_without_changes(self):
+    cache = NameCache(self.path, 'ns')
+    cache.get('a')
+    cache.save()
+    self.assertFalse(os.path.exists(self.path))
+
+  def test_corrupt_file_is_treated_as_empty(self):
+    with open(self.path, 'w') as f:
+      f.write('{not json')
+    cache = NameCache(self.path, 'ns')
+    self.assertIsNone(cache.get('a'))
+    cache.put('a', ['1'])
+    cache.save()
+    self.assertEqual(['1'], NameCache(self.path, 'ns').get('a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
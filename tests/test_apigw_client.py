@@ -0,0 +1,157 @@
+#!/usr/bin/python
+# TODO: License goes here
+
+from module_utils.apigw_client import CLIENT_ARGUMENT_SPEC, client_argument_spec, client_config, create_client, report_retries
+from module_utils.apigw_rate import DEFAULT_STATE_FILE
+from module_utils.apigw_retry import RetryingClient
+import mock
+from mock import patch
+import unittest
+
+def module(params):
+  result = mock.MagicMock()
+  result.params = params
+  return result
+
+class TestApiGwClient(unittest.TestCase):
+
+  def test_client_argument_spec_adds_client_options(self):
+    spec = client_argument_spec(dict(name=dict(required=True)))
+
+    self.assertEqual(dict(required=True), spec['name'])
+    for option in CLIENT_ARGUMENT_SPEC:
+      self.assertIn(option, spec)
+
+  def test_client_config_is_none_without_options(self):
+    self.assertIsNone(client_config({}))
+    self.assertIsNone(client_config({'region': 'us-west-2', 'concurrency': 4}))
+
+  def test_client_config_sets_retries_timeouts_and_pool(self):
+    config = client_config({
+      'retry_mode': 'adaptive', 'max_attempts': 8, 'connect_timeout': 2.0, 'read_timeout': 30.0, 'max_pool_connections': 32,
+    })
+
+    self.assertEqual({'mode': 'adaptive', 'max_attempts': 8}, config.retries)
+    self.assertEqual(2.0, config.connect_timeout)
+    self.assertEqual(30.0, config.read_timeout)
+    self.assertEqual(32, config.max_pool_connections)
+
+  def test_client_config_sizes_pool_for_large_concurrency(self):
+    self.assertEqual(24, client_config({'concurrency': 24}).max_pool_connections)
+    self.assertEqual(12, client_config({'concurrency': 24, 'max_pool_connections': 12}).max_pool_connections)
+
+  @patch('boto3.client')
+  def test_create_client_keeps_boto3_defaults_without_options(self, mock_client):
+    client = create_client(module({}))
+
+    mock_client.assert_called_once_with('apigateway')
+    self.assertIsInstance(client, RetryingClient)
+    self.assertIs(mock_client.return_value, client.client)
+    self.assertIsNone(client.retry_args['deadline'])
+    self.assertIsNone(client.limiter)
+    self.assertIsNone(client.write_lock)
+
+  @patch('boto3.client')
+  def test_create_client_paces_calls_with_the_default_budgets_when_a_rate_limit_file_is_set(self, mock_client):
+    client = create_client(module({'rate_limit_file': DEFAULT_STATE_FILE}))
+
+    self.assertEqual(DEFAULT_STATE_FILE, client.limiter.path)
+    self.assertEqual(dict(rate=10.0, burst=40.0), client.limiter.budgets['*'])
+
+  @patch('boto3.client')
+  def test_create_client_paces_only_the_module_budgets_when_no_rate_limits_are_set(self, mock_client):
+    mock_client.return_value.meta.region_name = 'us-east-1'
+    client = create_client(module({}), rate_limits={'*_usage_plan_key': 5})
+
+    self.assertEqual({'*_usage_plan_key': dict(rate=5.0, burst=5.0)}, client.limiter.budgets)
+    self.assertEqual([], client.limiter.buckets('get_usage_plan_keys'))
+
+  @patch('boto3.client')
+  def test_create_client_lets_rate_limits_override_the_module_budgets(self, mock_client):
+    mock_client.return_value.meta.region_name = 'us-east-1'
+    client = create_client(module({'rate_limits': {'*_usage_plan_key': 2}}), rate_limits={'*_usage_plan_key': 5})
+
+    self.assertEqual(dict(rate=2.0, burst=2.0), client.limiter.budgets['*_usage_plan_key'])
+    self.assertEqual(dict(rate=10.0, burst=40.0), client.limiter.budgets['*'])
+
+  @patch('boto3.client')
+  def test_create_client_takes_the_write_lock_on_request(self, mock_client):
+    client = create_client(module({'write_lock': 'resource'}))
+
+    self.assertEqual('resource', client.write_lock.scope)
+
+  @patch('boto3.client')
+  def test_create_client_shares_rate_limits_per_region(self, mock_client):
+    mock_client.return_value.meta.region_name = 'eu-west-1'
+
+    client = create_client(module({'rate_limits': {'put_*': 2}, 'rate_limit_file': '/tmp/limits.json'}))
+
+    self.assertEqual('/tmp/limits.json', client.limiter.path)
+    self.assertEqual('eu-west-1:', client.limiter.prefix)
+    self.assertEqual(dict(rate=2.0, burst=2.0), client.limiter.budgets['put_*'])
+    self.assertEqual(dict(rate=10.0, burst=40.0), client.limiter.budgets['*'])
+
+  @patch('boto3.client')
+  def test_create_client_passes_retry_deadline(self, mock_client):
+    client = create_client(module({'retry_deadline': 30.0}))
+
+    self.assertEqual(30.0, client.retry_args['deadline'])
+
+  @patch('boto3.client')
+  def test_create_client_passes_region_endpoint_and_config(self, mock_client):
+    create_client(module({'region': 'eu-west-1', 'endpoint_url': 'http://localhost:4566', 'max_attempts': 3}))
+
+    mock_client.assert_called_once_with(
+      'apigateway', region_name='eu-west-1', endpoint_url='http://localhost:4566', config=mock.ANY
+    )
+    self.assertEqual({'max_attempts': 3}, mock_client.call_args[1]['config'].retries)
+
+  @patch('boto3.session.Session')
+  @patch('boto3.client')
+  def test_create_client_uses_a_session_for_profiles(self, mock_client, mock_session):
+    create_client(module({'profile': 'staging', 'region': 'us-west-2'}))
+
+    mock_session.assert_called_once_with(profile_name='staging')
+    mock_session.return_value.client.assert_called_once_with('apigateway', region_name='us-west-2')
+    self.assertEqual(0, mock_client.call_count)
+
+  def test_report_retries_adds_retry_counts_to_results(self):
+    module = mock.MagicMock()
+    exit_json = module.exit_json
+    fail_json = module.fail_json
+    client = RetryingClient(mock.MagicMock())
+
+    report_retries(module, client)
+    module.exit_json(changed=False)
+    client.counts['get_stage'] = 2
+    module.fail_json(msg='boom')
+
+    exit_json.assert_called_once_with(changed=False)
+    fail_json.assert_called_once_with(msg='boom', retries={'get_stage': 2})
+
+  def test_report_retries_ignores_other_clients(self):
+    module = mock.MagicMock()
+    exit_json = module.exit_json
+
+    report_retries(module, mock.MagicMock())
+
+    self.assertIs(exit_json, module.exit_json)
+
+  def test_create_client_fails_the_module_without_boto3(self):
+    import __builtin__ as builtins
+    real_import = builtins.__import__
+
+    def mock_import(name, *args):
+      if name == 'boto3': raise ImportError
+      return real_import(name, *args)
+
+    mod = module({})
+    with mock.patch('__builtin__.__import__', side_effect=mock_import):
+      client = create_client(mod)
+
+    self.assertIsNone(client)
+    mod.fail_json.assert_called_once_with(msg='boto3 is required for this module')
+
+
+if __name__ == '__main__':
+    unittest.main()
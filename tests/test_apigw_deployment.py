@@ -8,13 +8,13 @@ from mock import patch
 from mock import create_autospec
 from mock import ANY
 import unittest
-import boto
 from botocore.exceptions import BotoCoreError
 
 class TestApiGwDeployment(unittest.TestCase):
 
   def setUp(self):
     self.module = mock.MagicMock()
+    self.module.params = {}
     self.module.check_mode = False
     self.module.exit_json = mock.MagicMock()
     self.module.fail_json = mock.MagicMock()
@@ -22,7 +22,7 @@ class TestApiGwDeployment(unittest.TestCase):
     self.deployment.client = mock.MagicMock()
     reload(apigw_deployment)
 
-  def test_boto_module_not_found(self):
+  def test_legacy_boto_module_not_required(self):
     # Setup Mock Import Function
     import __builtin__ as builtins
     real_import = builtins.__import__
@@ -35,7 +35,7 @@ class TestApiGwDeployment(unittest.TestCase):
       reload(apigw_deployment)
       ApiGwDeployment(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.assertEqual(0, self.module.fail_json.call_count)
 
   def test_boto3_module_not_found(self):
     # Setup Mock Import Function
@@ -50,12 +50,12 @@ class TestApiGwDeployment(unittest.TestCase):
       reload(apigw_deployment)
       ApiGwDeployment(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.module.fail_json.assert_called_with(msg='boto3 is required for this module')
 
-  @patch.object(apigw_deployment, 'boto3')
-  def test_boto3_client_properly_instantiated(self, mock_boto):
+  @patch('boto3.client')
+  def test_boto3_client_properly_instantiated(self, mock_client):
     ApiGwDeployment(self.module)
-    mock_boto.client.assert_called_once_with('apigateway')
+    mock_client.assert_called_once_with('apigateway')
 
   def test_define_argument_spec(self):
     result = ApiGwDeployment._define_module_argument_spec()
@@ -8,7 +8,6 @@ from mock import patch
 from mock import create_autospec
 from mock import ANY
 import unittest
-import boto
 from botocore.exceptions import BotoCoreError, ClientError
 import copy
 
@@ -16,6 +15,7 @@ class TestApiGwDomainName(unittest.TestCase):
 
   def setUp(self):
     self.module = mock.MagicMock()
+    self.module.params = {}
     self.module.check_mode = False
     self.module.exit_json = mock.MagicMock()
     self.module.fail_json = mock.MagicMock()
@@ -31,7 +31,7 @@ class TestApiGwDomainName(unittest.TestCase):
     }
     reload(apigw_domain_name)
 
-  def test_boto_module_not_found(self):
+  def test_legacy_boto_module_not_required(self):
     # Setup Mock Import Function
     import __builtin__ as builtins
     real_import = builtins.__import__
@@ -44,7 +44,7 @@ class TestApiGwDomainName(unittest.TestCase):
       reload(apigw_domain_name)
       ApiGwDomainName(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.assertEqual(0, self.module.fail_json.call_count)
 
   def test_boto3_module_not_found(self):
     # Setup Mock Import Function
@@ -59,12 +59,12 @@ class TestApiGwDomainName(unittest.TestCase):
       reload(apigw_domain_name)
       ApiGwDomainName(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.module.fail_json.assert_called_with(msg='boto3 is required for this module')
 
-  @patch.object(apigw_domain_name, 'boto3')
-  def test_boto3_client_properly_instantiated(self, mock_boto):
+  @patch('boto3.client')
+  def test_boto3_client_properly_instantiated(self, mock_client):
     ApiGwDomainName(self.module)
-    mock_boto.client.assert_called_once_with('apigateway')
+    mock_client.assert_called_once_with('apigateway')
 
   @patch.object(ApiGwDomainName, '_update_domain_name', return_value=('hi', 'mom'))
   def test_process_request_calls_get_domain_name_and_stores_result_when_invoked(self, m):
@@ -210,6 +210,32 @@ class TestApiGwDomainName(unittest.TestCase):
       self.assertEqual(0, self.domain_name.client.create_domain_name.call_count)
       self.domain_name.module.fail_json.assert_called_with(msg='All certificate parameters are required to create a domain name')
 
+  @patch.object(ApiGwDomainName, '_retrieve_domain_name', return_value=None)
+  def test_process_request_creates_regional_domain_name_with_regional_certificate(self, m):
+    self.domain_name.module.params = {
+      'name': 'testify',
+      'endpoint_type': 'REGIONAL',
+      'regional_cert_arn': 'arn:cert',
+      'regional_cert_name': 'regional-cert',
+      'state': 'present',
+    }
+    self.domain_name.process_request()
+
+    self.domain_name.client.create_domain_name.assert_called_once_with(
+      domainName='testify',
+      regionalCertificateArn='arn:cert',
+      regionalCertificateName='regional-cert',
+      endpointConfiguration={'types': ['REGIONAL']},
+    )
+
+  @patch.object(ApiGwDomainName, '_retrieve_domain_name', return_value=None)
+  def test_process_request_requires_regional_cert_arn_for_regional_domain_name(self, m):
+    self.domain_name.module.params['endpoint_type'] = 'REGIONAL'
+    self.domain_name.process_request()
+
+    self.assertEqual(0, self.domain_name.client.create_domain_name.call_count)
+    self.domain_name.module.fail_json.assert_called_once_with(msg='regional_cert_arn is required to create a regional domain name')
+
   @patch.object(ApiGwDomainName, '_retrieve_domain_name', return_value=None)
   def test_process_request_skips_create_call_and_returns_changed_True_when_check_mode(self, m):
     self.domain_name.module.check_mode = True
@@ -231,6 +257,31 @@ class TestApiGwDomainName(unittest.TestCase):
       patchOperations=expected_patches
     )
 
+  @patch.object(ApiGwDomainName, '_retrieve_domain_name', return_value={
+    'certificateName': 'cert-name', 'endpointConfiguration': {'types': ['EDGE']}
+  })
+  def test_process_request_switches_domain_name_to_regional_endpoint(self, m):
+    self.domain_name.module.params['endpoint_type'] = 'REGIONAL'
+    self.domain_name.module.params['regional_cert_arn'] = 'arn:cert'
+    self.domain_name.process_request()
+
+    self.domain_name.client.update_domain_name.assert_called_once_with(
+      domainName='testify',
+      patchOperations=[
+        {'op': 'replace', 'path': '/regionalCertificateArn', 'value': 'arn:cert'},
+        {'op': 'replace', 'path': '/endpointConfiguration/types/EDGE', 'value': 'REGIONAL'},
+      ]
+    )
+
+  @patch.object(ApiGwDomainName, '_retrieve_domain_name', return_value={
+    'regionalCertificateArn': 'arn:cert', 'endpointConfiguration': {'types': ['REGIONAL']}
+  })
+  def test_process_request_skips_update_when_regional_domain_name_matches(self, m):
+    self.domain_name.module.params = {'name': 'testify', 'endpoint_type': 'REGIONAL', 'regional_cert_arn': 'arn:cert', 'state': 'present'}
+    self.domain_name.process_request()
+
+    self.assertEqual(0, self.domain_name.client.update_domain_name.call_count)
+
   @patch.object(ApiGwDomainName, '_retrieve_domain_name', return_value={'certificateName': 'cert-name'})
   def test_process_request_skips_update_domain_name_and_replies_false_when_no_changes(self, m):
     self.domain_name.process_request()
@@ -278,6 +329,9 @@ class TestApiGwDomainName(unittest.TestCase):
                      cert_body=dict(required=False),
                      cert_private_key=dict(required=False),
                      cert_chain=dict(required=False),
+                     endpoint_type=dict(required=False, choices=['EDGE', 'REGIONAL']),
+                     regional_cert_arn=dict(required=False),
+                     regional_cert_name=dict(required=False),
                      state=dict(default='present', choices=['present', 'absent']),
     ))
 
@@ -0,0 +1,95 @@
+#!/usr/bin/python
+# TODO: License goes here
+
+from module_utils.apigw_lock import WriteLock
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+class TestApiGwLock(unittest.TestCase):
+
+  def setUp(self):
+    self.tmpdir = tempfile.mkdtemp()
+    self.directory = os.path.join(self.tmpdir, 'locks')
+
+  def tearDown(self):
+    shutil.rmtree(self.tmpdir)
+
+  def _holds_while(self, first, second):
+    """
+    Runs the second hold in a thread while the first is held
+    :return: True when the second hold had to wait for the first
+    """
+    entered = threading.Event()
+    with first:
+      thread = threading.Thread(target=lambda: (second.__enter__(), entered.set(), second.__exit__(None, None, None)))
+      thread.start()
+      waited = not entered.wait(0.3)
+    thread.join(5)
+    self.assertTrue(entered.is_set())
+    return waited
+
+  def test_locks_for_rest_api_scope(self):
+    lock = WriteLock('rest_api', self.directory)
+
+    self.assertEqual([('abc', True)], lock.locks('put_method', {'restApiId': 'abc', 'resourceId': 'r1'}))
+    self.assertEqual([('abc', True)], lock.locks('create_resource', {'restApiId': 'abc', 'parentId': 'r0'}))
+    self.assertEqual([], lock.locks('get_method', {'restApiId': 'abc', 'resourceId': 'r1'}))
+    self.assertEqual([], lock.locks('create_usage_plan', {'name': 'plan'}))
+
+  def test_locks_for_resource_scope(self):
+    lock = WriteLock('resource', self.directory)
+
+    self.assertEqual([('abc', False), ('abc.r1', True)], lock.locks('put_method', {'restApiId': 'abc', 'resourceId': 'r1'}))
+    self.assertEqual([('abc', True)], lock.locks('update_rest_api', {'restApiId': 'abc'}))
+
+  def test_hold_serializes_writes_to_one_rest_api(self):
+    lock = WriteLock('rest_api', self.directory)
+
+    self.assertTrue(self._holds_while(
+      lock.hold('put_method', {'restApiId': 'abc', 'resourceId': 'r1'}),
+      lock.hold('put_integration', {'restApiId': 'abc', 'resourceId': 'r2'})
+    ))
+    self.assertTrue(os.path.exists(os.path.join(self.directory, 'abc.lock')))
+
+  def test_hold_lets_other_rest_apis_and_reads_through(self):
+    lock = WriteLock('rest_api', self.directory)
+
+    self.assertFalse(self._holds_while(
+      lock.hold('put_method', {'restApiId': 'abc'}),
+      lock.hold('put_method', {'restApiId': 'xyz'})
+    ))
+    self.assertFalse(self._holds_while(
+      lock.hold('put_method', {'restApiId': 'abc'}),
+      lock.hold('get_method', {'restApiId': 'abc'})
+    ))
+
+  def test_hold_with_resource_scope_runs_resources_side_by_side(self):
+    lock = WriteLock('resource', self.directory)
+
+    self.assertFalse(self._holds_while(
+      lock.hold('put_method', {'restApiId': 'abc', 'resourceId': 'r1'}),
+      lock.hold('put_method', {'restApiId': 'abc', 'resourceId': 'r2'})
+    ))
+    self.assertTrue(self._holds_while(
+      lock.hold('put_method', {'restApiId': 'abc', 'resourceId': 'r1'}),
+      lock.hold('delete_method', {'restApiId': 'abc', 'resourceId': 'r1'})
+    ))
+    self.assertTrue(self._holds_while(
+      lock.hold('put_method', {'restApiId': 'abc', 'resourceId': 'r1'}),
+      lock.hold('create_resource', {'restApiId': 'abc', 'parentId': 'r1'})
+    ))
+
+  def test_hold_skips_locks_it_cannot_create(self):
+    blocker = os.path.join(self.tmpdir, 'file')
+    open(blocker, 'w').close()
+    lock = WriteLock('rest_api', os.path.join(blocker, 'locks'))
+
+    with lock.hold('put_method', {'restApiId': 'abc'}):
+      pass
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,7 +8,6 @@ from mock import patch
 from mock import create_autospec
 from mock import ANY
 import unittest
-import boto
 from botocore.exceptions import BotoCoreError, ClientError
 import copy
 
@@ -43,6 +42,7 @@ class TestApiGwMethod(unittest.TestCase):
 
   def setUp(self):
     self.module = mock.MagicMock()
+    self.module.params = {}
     self.module.check_mode = False
     self.module.exit_json = mock.MagicMock()
     self.module.fail_json = mock.MagicMock()
@@ -67,7 +67,7 @@ class TestApiGwMethod(unittest.TestCase):
     reload(apigw_method)
 
 ### boto3 tests
-  def test_boto_module_not_found(self):
+  def test_legacy_boto_module_not_required(self):
     # Setup Mock Import Function
     import __builtin__ as builtins
     real_import = builtins.__import__
@@ -80,7 +80,7 @@ class TestApiGwMethod(unittest.TestCase):
       reload(apigw_method)
       ApiGwMethod(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.assertEqual(0, self.module.fail_json.call_count)
 
   def test_boto3_module_not_found(self):
     # Setup Mock Import Function
@@ -95,12 +95,12 @@ class TestApiGwMethod(unittest.TestCase):
       reload(apigw_method)
       ApiGwMethod(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.module.fail_json.assert_called_with(msg='boto3 is required for this module')
 
-  @patch.object(apigw_method, 'boto3')
-  def test_boto3_client_properly_instantiated(self, mock_boto):
+  @patch('boto3.client')
+  def test_boto3_client_properly_instantiated(self, mock_client):
     ApiGwMethod(self.module)
-    mock_boto.client.assert_called_once_with('apigateway')
+    mock_client.assert_called_once_with('apigateway')
 ### end boto3 tests
 
 
@@ -155,8 +155,168 @@ class TestApiGwMethod(unittest.TestCase):
         httpMethod='GET'
     )
     self.method.module.fail_json.assert_called_once_with(msg='Error calling boto3 get_method: An unspecified error occurred')
+
+  @patch.object(ApiGwMethod, '_update_method', return_value=[None, None])
+  def test_process_request_reads_method_from_embedded_resources_when_use_snapshot(self, mock_update):
+    self.method.module.params['use_snapshot'] = True
+    self.method.client.get_resources = mock.MagicMock(return_value={
+      'items': [
+        {'id': 'other', 'path': '/other', 'resourceMethods': {'GET': {'httpMethod': 'GET', 'apiKeyRequired': True}}},
+        {'id': 'rsrcid', 'path': '/mine', 'resourceMethods': {'GET': {'httpMethod': 'GET', 'apiKeyRequired': False}}},
+      ],
+      'position': 'more'
+    })
+    self.method.process_request()
+
+    self.method.client.get_resources.assert_called_once_with(restApiId='restid', limit=500, embed=['methods'])
+    self.assertEqual(0, self.method.client.get_method.call_count)
+    self.assertEqual({'httpMethod': 'GET', 'apiKeyRequired': False}, self.method.method)
+
+  @patch.object(ApiGwMethod, '_create_method', return_value=[None, None])
+  def test_process_request_sets_method_to_None_when_missing_from_snapshot(self, mock_create):
+    self.method.module.params['use_snapshot'] = True
+    self.method.client.get_resources = mock.MagicMock(return_value={'items': [{'id': 'rsrcid', 'path': '/mine'}]})
+    self.method.process_request()
+
+    self.assertEqual(0, self.method.client.get_method.call_count)
+    self.assertIsNone(self.method.method)
+    self.assertEqual(1, mock_create.call_count)
+
+  @patch.object(ApiGwMethod, '_create_method', return_value=[None, None])
+  def test_process_request_calls_fail_json_when_snapshot_get_resources_fails(self, mock_create):
+    self.method.module.params['use_snapshot'] = True
+    self.method.client.get_resources = mock.MagicMock(side_effect=BotoCoreError())
+    self.method.process_request()
+
+    self.method.module.fail_json.assert_called_once_with(msg='Error calling boto3 get_resources: An unspecified error occurred')
 ### End find teste
 
+### Batch tests
+  def test_build_method_params_applies_defaults_and_shared_args(self):
+    self.method.module.params = {'rest_api_id': 'restid', 'methods': [], 'concurrency': 2}
+
+    result = self.method._build_method_params({'resource_id': 'rsrcid', 'method': 'PUT', 'api_key_required': True})
+
+    self.assertEqual('PUT', result['name'])
+    self.assertNotIn('method', result)
+    self.assertNotIn('methods', result)
+    self.assertEqual('restid', result['rest_api_id'])
+    self.assertTrue(result['use_snapshot'])
+    self.assertTrue(result['api_key_required'])
+    self.assertEqual('NONE', result['authorization_type'])
+    self.assertEqual('present', result['state'])
+    self.assertEqual([], result['method_responses'])
+    self.assertEqual(1, result['concurrency'])
+
+  def test_build_method_params_converts_values_like_the_module_does(self):
+    self.method.module.params = {'rest_api_id': 'restid', 'methods': [], 'concurrency': 2}
+
+    result = self.method._build_method_params({'resource_id': 'rsrcid', 'name': 'GET', 'api_key_required': 'yes'})
+
+    self.assertIs(True, result['api_key_required'])
+
+  @patch.object(apigw_method, 'ThreadPool')
+  def test_batch_entries_write_their_responses_without_a_pool_of_their_own(self, mock_pool):
+    self.method.module.params = {'rest_api_id': 'restid', 'methods': [], 'concurrency': 8}
+    worker = copy.copy(self.method)
+    worker.module = apigw_method._MethodSpecModule(self.method.module, self.method._build_method_params({'resource_id': 'r1', 'name': 'GET'}))
+
+    worker._write_responses([
+      ('put_method_response', {'statusCode': '200'}),
+      ('put_method_response', {'statusCode': '400'}),
+    ])
+
+    self.assertEqual(0, mock_pool.call_count)
+    self.assertEqual(2, self.method.client.put_method_response.call_count)
+
+  def test_process_request_rejects_invalid_method_entries_before_writing(self):
+    for (entry, msg) in [
+      ({'resource_id': 'r1', 'name': 'FETCH'}, 'Invalid methods entry 1: value of name must be one of'),
+      ({'resource_id': 'r1', 'name': 'GET', 'state': 'gone'}, 'Invalid methods entry 1: value of state must be one of'),
+      ({'resource_id': 'r1', 'name': 'GET', 'api_key_required': 'maybe'}, 'Invalid methods entry 1: argument api_key_required is of type'),
+      ({'resource_id': 'r1', 'name': 'GET', 'bogus': 1}, 'Invalid methods entry 1: Unsupported parameters: bogus'),
+      ({'name': 'GET'}, 'Invalid methods entry 1: name and resource_id are required'),
+    ]:
+      self.method.module.fail_json.reset_mock()
+      self.method.module.params = {'rest_api_id': 'restid', 'concurrency': 2, 'methods': [{'resource_id': 'r1', 'name': 'GET'}, entry]}
+
+      self.method.process_request()
+
+      self.assertIn(msg, self.method.module.fail_json.call_args[1]['msg'])
+    self.assertEqual(0, self.method.client.get_resources.call_count)
+
+  @patch.object(ApiGwMethod, '_delete_method')
+  @patch.object(ApiGwMethod, '_update_method', return_value=(True, 'updated'))
+  @patch.object(ApiGwMethod, '_create_method', return_value=(True, 'created'))
+  def test_process_request_reconciles_all_methods_from_one_resource_listing(self, mock_create, mock_update, mock_delete):
+    self.method.client.get_resources = mock.MagicMock(return_value={'items': [
+      {'id': 'r1', 'path': '/one', 'resourceMethods': {'GET': {'httpMethod': 'GET'}, 'DELETE': {'httpMethod': 'DELETE'}}},
+      {'id': 'r2', 'path': '/two'},
+    ]})
+    self.method.module.params = {
+      'rest_api_id': 'restid',
+      'concurrency': 3,
+      'methods': [
+        {'resource_id': 'r1', 'name': 'GET'},
+        {'resource_id': 'r2', 'name': 'POST'},
+        {'resource_id': 'r1', 'name': 'DELETE', 'state': 'absent'},
+      ]
+    }
+
+    self.method.process_request()
+
+    self.method.client.get_resources.assert_called_once_with(restApiId='restid', limit=500, embed=['methods'])
+    self.assertEqual(0, self.method.client.get_method.call_count)
+    self.assertEqual(1, mock_create.call_count)
+    self.assertEqual(1, mock_update.call_count)
+    self.assertEqual(1, mock_delete.call_count)
+    self.method.module.exit_json.assert_called_once_with(changed=True, methods=[
+      {'resource_id': 'r1', 'name': 'GET', 'changed': True, 'method': 'updated'},
+      {'resource_id': 'r2', 'name': 'POST', 'changed': True, 'method': 'created'},
+      {'resource_id': 'r1', 'name': 'DELETE', 'changed': True, 'method': None},
+    ])
+
+  def test_process_request_reports_failures_per_method(self):
+    self.method.client.get_resources = mock.MagicMock(return_value={'items': [{'id': 'r1', 'path': '/one'}]})
+    self.method.client.put_method = mock.MagicMock(side_effect=BotoCoreError())
+    self.method.module.params = {
+      'rest_api_id': 'restid',
+      'concurrency': 2,
+      'methods': [
+        {'resource_id': 'r1', 'name': 'GET', 'method_integration': {'integration_type': 'MOCK'}},
+        {'resource_id': 'r1', 'name': 'POST', 'state': 'absent'},
+      ]
+    }
+
+    self.method.process_request()
+
+    self.assertEqual(0, self.method.module.exit_json.call_count)
+    self.method.module.fail_json.assert_called_once_with(
+      msg='Error reconciling 1 of 2 methods',
+      changed=False,
+      methods=[
+        {
+          'resource_id': 'r1',
+          'name': 'GET',
+          'changed': False,
+          'method': None,
+          'failed': True,
+          'msg': 'Error while creating method via boto3: An unspecified error occurred'
+        },
+        {'resource_id': 'r1', 'name': 'POST', 'changed': False, 'method': None},
+      ]
+    )
+
+  def test_process_request_calls_fail_json_when_batch_get_resources_fails(self):
+    self.method.client.get_resources = mock.MagicMock(side_effect=BotoCoreError())
+    self.method.module.params = {'rest_api_id': 'restid', 'concurrency': 2, 'methods': [{'resource_id': 'r1', 'name': 'GET'}]}
+
+    self.method.process_request()
+
+    self.method.module.fail_json.assert_called_once_with(msg='Error calling boto3 get_resources: An unspecified error occurred')
+    self.assertEqual(0, self.method.module.exit_json.call_count)
+### End batch
+
 ### Delete tests
   @patch.object(ApiGwMethod, '_find_method', return_value=True)
   def test_process_request_deletes_method_when_method_is_present(self, mock_find):
@@ -938,6 +1098,7 @@ class TestApiGwMethod(unittest.TestCase):
       },
       'method_responses': [{'status_code': 24601}],
       'integration_responses': [{'status_code': 24601, 'pattern': 'pattern'}],
+      'verify': True,
       'state': 'present'
     }
 
@@ -962,11 +1123,142 @@ class TestApiGwMethod(unittest.TestCase):
 ### Create tests
   @patch.object(ApiGwMethod, '_find_method', side_effect=[None, 'Called post-create'])
   def test_process_request_calls_get_method_and_returns_result_after_create_when_method_is_absent(self, mock_find):
+    self.method.module.params['verify'] = True
 
     self.method.process_request()
 
     self.method.module.exit_json.assert_called_once_with(changed=True, method='Called post-create')
 
+  @patch.object(ApiGwMethod, '_find_method', return_value=None)
+  def test_process_request_builds_method_locally_after_create_when_verify_is_false(self, mock_find):
+    self.method.module.params['request_models'] = [{'content_type': 'application/json', 'model': 'Model'}]
+    self.method.module.params['method_integration'] = {
+      'integration_type': 'AWS',
+      'http_method': 'POST',
+      'uri': 'this-is-uri',
+      'passthrough_behavior': 'when_no_templates',
+    }
+    self.method.module.params['method_responses'] = [{'status_code': 200, 'response_models': [{'content_type': 'application/json'}]}]
+    self.method.module.params['integration_responses'] = [{'status_code': 200, 'is_default': True}]
+
+    self.method.process_request()
+
+    self.assertEqual(1, mock_find.call_count)
+    self.method.module.exit_json.assert_called_once_with(changed=True, method={
+      'httpMethod': 'GET',
+      'authorizationType': 'NONE',
+      'apiKeyRequired': False,
+      'requestParameters': {},
+      'requestModels': {'application/json': 'Model'},
+      'methodIntegration': {
+        'type': 'AWS',
+        'httpMethod': 'POST',
+        'uri': 'this-is-uri',
+        'passthroughBehavior': 'WHEN_NO_TEMPLATES',
+        'requestParameters': {},
+        'requestTemplates': {},
+        'integrationResponses': {
+          '200': {'statusCode': '200', 'selectionPattern': '', 'responseParameters': {}, 'responseTemplates': {}}
+        }
+      },
+      'methodResponses': {
+        '200': {'statusCode': '200', 'responseModels': {'application/json': 'Empty'}, 'responseParameters': {}}
+      }
+    })
+
+  @patch.object(ApiGwMethod, '_find_method')
+  def test_process_request_builds_method_locally_after_update_when_verify_is_false(self, mock_find):
+    mock_find.return_value = {
+      'ResponseMetadata': {'HTTPStatusCode': 200},
+      'apiKeyRequired': False,
+      'authorizationType': 'NONE',
+      'httpMethod': 'GET',
+      'requestParameters': {},
+      'methodResponses': {
+        '200': {'statusCode': '200', 'responseParameters': {'method.response.header.X-Old': True}},
+        '500': {'statusCode': '500'}
+      },
+      'methodIntegration': {
+        'type': 'MOCK',
+        'passthroughBehavior': 'WHEN_NO_TEMPLATES',
+        'requestParameters': {},
+        'requestTemplates': {},
+        'integrationResponses': {'200': {'statusCode': '200', 'selectionPattern': ''}}
+      }
+    }
+    self.method.module.params['api_key_required'] = True
+    self.method.module.params['method_integration'] = {
+      'integration_type': 'MOCK',
+      'passthrough_behavior': 'when_no_templates',
+      'request_templates': [{'content_type': 'application/json', 'template': '{"statusCode": 200}'}]
+    }
+    self.method.module.params['method_responses'] = [{'status_code': 200, 'response_params': [{'name': 'X-New', 'is_required': False}]}]
+    self.method.module.params['integration_responses'] = [{'status_code': 200, 'is_default': True}]
+
+    self.method.process_request()
+
+    self.assertEqual(1, mock_find.call_count)
+    self.method.module.exit_json.assert_called_once_with(changed=True, method={
+      'apiKeyRequired': True,
+      'authorizationType': 'NONE',
+      'httpMethod': 'GET',
+      'requestParameters': {},
+      'methodResponses': {
+        '200': {'statusCode': '200', 'responseParameters': {'method.response.header.X-New': False}}
+      },
+      'methodIntegration': {
+        'type': 'MOCK',
+        'passthroughBehavior': 'WHEN_NO_TEMPLATES',
+        'requestParameters': {},
+        'requestTemplates': {'application/json': '{"statusCode": 200}'},
+        'integrationResponses': {'200': {'statusCode': '200', 'selectionPattern': ''}}
+      }
+    })
+
+  def test_apply_patch_operations_decodes_paths_and_values(self):
+    doc = {'responseModels': {'text/html': 'Empty'}}
+
+    apigw_method.apply_patch_operations(doc, [
+      {'op': 'add', 'path': '/responseModels/application~1json', 'value': 'Error'},
+      {'op': 'remove', 'path': '/responseModels/text~1html'},
+      {'op': 'replace', 'path': '/apiKeyRequired', 'value': 'True'},
+    ])
+
+    self.assertEqual({
+      'responseModels': {'application/json': 'Error'},
+      'apiKeyRequired': True,
+    }, doc)
+
+  def test_update_integration_adds_and_removes_cache_key_parameters_one_by_one(self):
+    method = {'methodIntegration': {'type': 'MOCK', 'passthroughBehavior': 'NEVER', 'cacheKeyParameters': ['old', 'kept']}}
+    params = {
+      'rest_api_id': 'restid', 'resource_id': 'rsrcid', 'name': 'GET',
+      'method_integration': {
+        'integration_type': 'MOCK', 'passthrough_behavior': 'NEVER',
+        'uses_caching': True, 'cache_key_parameters': ['kept', 'method.request.path.id'],
+      },
+    }
+
+    patches = apigw_method.update_integration(method, params)
+
+    self.assertEqual([
+      {'op': 'add', 'path': '/cacheKeyParameters/method.request.path.id'},
+      {'op': 'remove', 'path': '/cacheKeyParameters/old'},
+    ], patches['patchOperations'])
+
+  def test_replay_writes_applies_update_integration_cache_key_parameters(self):
+    method = {'methodIntegration': {'type': 'AWS', 'cacheKeyParameters': ['old', 'kept']}}
+    params = {
+      'rest_api_id': 'restid', 'resource_id': 'rsrcid', 'name': 'GET',
+      'method_integration': {'integration_type': 'AWS', 'uses_caching': True, 'cache_key_parameters': ['kept', 'new']},
+    }
+    patches = apigw_method.update_integration(method, params)
+
+    result = apigw_method.replay_writes(method, [('update_integration', patches)])
+
+    self.assertNotIn('', result['methodIntegration'])
+    self.assertEqual(['kept', 'new'], result['methodIntegration']['cacheKeyParameters'])
+
   @patch.object(ApiGwMethod, '_find_method', return_value=None)
   def test_process_request_calls_put_method_when_method_is_absent(self, mock_find):
     self.method.module.params['request_models'] = [{ 'content_type': 'application/json', 'model': 'ModelName' }]
@@ -1192,6 +1484,59 @@ class TestApiGwMethod(unittest.TestCase):
     self.assertEqual(0, self.method.client.put_integration.call_count)
     self.method.module.exit_json.assert_called_once_with(changed=True, method=None)
 
+  def test_write_responses_keeps_order_per_status_code(self):
+    self.method.module.params['concurrency'] = 4
+    order = []
+    self.method.client.put_method_response.side_effect = lambda **kw: order.append(('mr', kw['statusCode']))
+    self.method.client.put_integration_response.side_effect = lambda **kw: order.append(('ir', kw['statusCode']))
+
+    self.method._write_responses([
+      ('put_method_response', {'statusCode': '200'}),
+      ('put_method_response', {'statusCode': '400'}),
+      ('put_integration_response', {'statusCode': '200'}),
+      ('put_integration_response', {'statusCode': '400'}),
+    ])
+
+    self.assertEqual(4, len(order))
+    for code in ['200', '400']:
+      self.assertLess(order.index(('mr', code)), order.index(('ir', code)))
+
+  def test_write_responses_runs_sequentially_when_concurrency_is_one(self):
+    self.method.module.params['concurrency'] = 1
+    order = []
+    self.method.client.put_method_response.side_effect = lambda **kw: order.append(kw['statusCode'])
+
+    with patch.object(apigw_method, 'ThreadPool') as mock_pool:
+      self.method._write_responses([
+        ('put_method_response', {'statusCode': '200'}),
+        ('put_method_response', {'statusCode': '400'}),
+      ])
+
+    self.assertEqual(0, mock_pool.call_count)
+    self.assertEqual(['200', '400'], order)
+
+  def test_write_responses_retries_throttled_writes(self):
+    throttle = ClientError({'Error': {'Code': 'TooManyRequestsException', 'Message': 'slow down'}}, 'PutMethodResponse')
+    self.method.client.put_method_response.side_effect = [throttle, None]
+
+    with patch('module_utils.apigw_retry.time') as mock_time:
+      self.method._write_responses([('put_method_response', {'statusCode': '200'})])
+
+    self.assertEqual(2, self.method.client.put_method_response.call_count)
+    self.assertEqual(1, mock_time.sleep.call_count)
+
+  def test_write_responses_skips_rest_of_chain_and_raises_first_error(self):
+    self.method.module.params['concurrency'] = 4
+    self.method.client.put_method_response.side_effect = BotoCoreError()
+
+    with self.assertRaises(BotoCoreError):
+      self.method._write_responses([
+        ('put_method_response', {'statusCode': '200'}),
+        ('put_integration_response', {'statusCode': '200'}),
+      ])
+
+    self.assertEqual(0, self.method.client.put_integration_response.call_count)
+
 
 ### End create
 
@@ -1358,12 +1703,14 @@ class TestApiGwMethod(unittest.TestCase):
     self.assertIsInstance(result, dict)
     self.assertEqual(result, dict(
                      name=dict(
-                       required=True,
+                       required=False,
                        choices=['GET', 'PUT', 'POST', 'DELETE', 'PATCH', 'HEAD', 'ANY', 'OPTIONS'],
                        aliases=['method']
                      ),
                      rest_api_id=dict(required=True),
-                     resource_id=dict(required=True),
+                     resource_id=dict(required=False),
+                     methods=dict(required=False, type='list'),
+                     concurrency=dict(required=False, type='int', default=4),
                      authorization_type=dict(required=False, default='NONE'),
                      authorizer_id=dict(required=False),
                      api_key_required=dict(required=False, type='bool', default=False),
@@ -1451,6 +1798,8 @@ class TestApiGwMethod(unittest.TestCase):
                          template=dict(required=True)
                        ),
                      ),
+                     use_snapshot=dict(required=False, type='bool', default=False),
+                     verify=dict(required=False, type='bool', default=False),
                      state=dict(default='present', choices=['present', 'absent'])
                      ))
 
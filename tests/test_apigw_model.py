@@ -1,14 +1,14 @@
 import library.apigw_model as apigw_model
 from library.apigw_model import ApiGwModel
+from module_utils.apigw_client import client_argument_spec
 import mock
 from mock import call, patch
 import unittest
-import boto
 from botocore.exceptions import BotoCoreError, ClientError
-from ansible.module_utils import basic
 
 class TestApiGwModel(unittest.TestCase):
     def setUp(self):
+        reload(apigw_model)
         self.module = mock.MagicMock()
         self.module.check_mode = False
         self.module.params = {
@@ -30,9 +30,7 @@ class TestApiGwModel(unittest.TestCase):
         self.model.client.get_model = mock.MagicMock()
         self.model.model = mock.MagicMock()
 
-        basic.AnsibleModule = mock.MagicMock(return_value=self.module)
-
-    def test_boto_module_not_found(self):
+    def test_legacy_boto_module_not_required(self):
         # Setup Mock Import Function
         import __builtin__ as builtins
         real_import = builtins.__import__
@@ -45,12 +43,27 @@ class TestApiGwModel(unittest.TestCase):
             reload(apigw_model)
             ApiGwModel(self.module)
 
-        self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+        self.assertEqual(0, self.module.fail_json.call_count)
+
+    def test_boto3_module_not_found(self):
+        # Setup Mock Import Function
+        import __builtin__ as builtins
+        real_import = builtins.__import__
+
+        def mock_import(name, *args):
+            if name == 'boto3': raise ImportError
+            return real_import(name, *args)
 
-    @patch.object(apigw_model, 'boto3')
-    def test_boto3_client_properly_instantiated(self, mock_boto):
+        with mock.patch('__builtin__.__import__', side_effect=mock_import):
+            reload(apigw_model)
+            ApiGwModel(self.module)
+
+        self.module.fail_json.assert_called_with(msg='boto3 is required for this module')
+
+    @patch('boto3.client')
+    def test_boto3_client_properly_instantiated(self, mock_client):
         ApiGwModel(self.module)
-        mock_boto.client.assert_called_once_with('apigateway')
+        mock_client.assert_called_once_with('apigateway')
 
     # _define_module_argument_spec test
     def test_define_argument_spec(self):
@@ -344,14 +357,15 @@ class TestApiGwModel(unittest.TestCase):
     @patch.object(apigw_model, 'AnsibleModule')
     @patch.object(apigw_model, 'ApiGwModel')
     def test_main(self, mockApiGwModel, mockAnsibleModule):
-        argumentSpec = mock.MagicMock()
+        argumentSpec = dict(name=dict(required=True))
         apiGwModel = ApiGwModel(self.module)
         apiGwModel.process_request = mock.MagicMock()
         mockApiGwModel._define_module_argument_spec.return_value = argumentSpec
         mockApiGwModel.return_value = apiGwModel
-        
+        mockAnsibleModule.return_value = self.module
+
         apigw_model.main()
 
-        basic.AnsibleModule.assert_called_with(argument_spec=argumentSpec, supports_check_mode=True)
+        mockAnsibleModule.assert_called_with(argument_spec=client_argument_spec(argumentSpec), supports_check_mode=True)
         mockApiGwModel.assert_called_once_with(self.module)
         self.assertEqual(1, apiGwModel.process_request.call_count)
\ No newline at end of file
@@ -0,0 +1,91 @@
+#!/usr/bin/python
+# TODO: License goes here
+
+from module_utils.apigw_openapi import DefinitionError, build_fragment, contains, diff_definition, export_type, has_changes, load_definition
+import unittest
+
+class TestApiGwOpenApi(unittest.TestCase):
+
+  def test_load_definition_parses_json_and_yaml(self):
+    self.assertEqual({'swagger': '2.0'}, load_definition('{"swagger": "2.0"}'))
+    self.assertEqual({'openapi': '3.0.1', 'paths': {}}, load_definition("openapi: 3.0.1\npaths: {}\n"))
+    self.assertEqual({'a': 1}, load_definition({'a': 1}))
+
+  def test_load_definition_rejects_non_objects(self):
+    with self.assertRaises(DefinitionError):
+      load_definition('- just\n- a list\n')
+
+  def test_export_type(self):
+    self.assertEqual('oas30', export_type({'openapi': '3.0.1'}))
+    self.assertEqual('swagger', export_type({'swagger': '2.0'}))
+
+  def test_contains_ignores_extra_keys_but_not_list_differences(self):
+    exported = {'type': 'aws_proxy', 'timeoutInMillis': 29000, 'passthroughBehavior': 'when_no_match', 'list': [1, 2]}
+    self.assertTrue(contains(exported, {'type': 'aws_proxy', 'timeoutInMillis': 29000.0}))
+    self.assertFalse(contains(exported, {'type': 'aws'}))
+    self.assertFalse(contains(exported, {'list': [1]}))
+    self.assertFalse(contains(None, {'type': 'aws'}))
+    self.assertFalse(contains({'a': {'b': 1}}, {'a': 'b'}))
+
+  def test_diff_definition_reports_operations_models_and_settings(self):
+    current = {
+      'swagger': '2.0',
+      'paths': {'/a': {'get': {'x': 1}}, '/gone': {'get': {}}},
+      'definitions': {'Same': {'type': 'object', 'title': 'Same'}, 'Changed': {'type': 'string'}},
+      'x-amazon-apigateway-binary-media-types': ['image/png'],
+    }
+    desired = {
+      'swagger': '2.0',
+      'info': {'title': 'ignored'},
+      'paths': {'/a': {'get': {'x': 1}, 'PUT': {'x': 2}}, '/new': {'get': {}, 'parameters': []}},
+      'definitions': {'Same': {'type': 'object'}, 'Changed': {'type': 'object'}, 'New': {}},
+      'x-amazon-apigateway-binary-media-types': ['image/png', 'image/gif'],
+    }
+
+    changes = diff_definition(current, desired)
+
+    self.assertEqual({
+      'paths': {'/a': ['put'], '/new': ['get']},
+      'models': ['Changed', 'New'],
+      'settings': ['x-amazon-apigateway-binary-media-types'],
+      'stale_paths': ['/gone'],
+    }, changes)
+    self.assertTrue(has_changes(changes))
+    self.assertFalse(has_changes(diff_definition(current, {'swagger': '2.0', 'paths': {'/a': {'get': {'x': 1}}}})))
+
+  def test_build_fragment_keeps_changed_operations_and_referenced_models(self):
+    desired = {
+      'swagger': '2.0',
+      'info': {'title': 't'},
+      'paths': {
+        '/a': {'parameters': [{'name': 'id'}], 'get': {'r': {'$ref': '#/definitions/Out'}}, 'put': {}},
+        '/b': {'get': {}},
+      },
+      'definitions': {'Out': {'items': {'$ref': '#/definitions/Item'}}, 'Item': {}, 'Unused': {}, 'Changed': {}},
+    }
+    changes = {'paths': {'/a': ['get']}, 'models': ['Changed'], 'settings': [], 'stale_paths': []}
+
+    self.assertEqual({
+      'swagger': '2.0',
+      'info': {'title': 't'},
+      'paths': {'/a': {'parameters': [{'name': 'id'}], 'get': {'r': {'$ref': '#/definitions/Out'}}}},
+      'definitions': {'Out': {'items': {'$ref': '#/definitions/Item'}}, 'Item': {}, 'Changed': {}},
+    }, build_fragment(desired, changes))
+
+  def test_build_fragment_reduces_oas3_schemas_and_keeps_other_components(self):
+    desired = {
+      'openapi': '3.0.1',
+      'paths': {'/a': {'get': {}}},
+      'components': {'schemas': {'A': {}, 'B': {}}, 'securitySchemes': {'key': {'type': 'apiKey'}}},
+    }
+    changes = {'paths': {}, 'models': ['B'], 'settings': [], 'stale_paths': []}
+
+    self.assertEqual({
+      'openapi': '3.0.1',
+      'paths': {},
+      'components': {'schemas': {'B': {}}, 'securitySchemes': {'key': {'type': 'apiKey'}}},
+    }, build_fragment(desired, changes))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,26 @@
+#!/usr/bin/python
+# TODO: License goes here
+
+from module_utils.apigw_pages import iter_items, iter_pages
+import mock
+import unittest
+
+class TestApiGwPages(unittest.TestCase):
+
+  def test_iter_pages_follows_position_tokens(self):
+    func = mock.MagicMock(side_effect=[{'items': [1, 2], 'position': 'p'}, {'items': [3]}])
+
+    self.assertEqual([1, 2, 3], list(iter_items(func, nameQuery='x')))
+    func.assert_has_calls([mock.call(nameQuery='x', limit=500), mock.call(nameQuery='x', limit=500, position='p')])
+
+  def test_iter_pages_stops_requesting_when_caller_stops(self):
+    func = mock.MagicMock(return_value={'items': [1], 'position': 'p'})
+
+    for items in iter_pages(func, limit=10):
+      break
+
+    func.assert_called_once_with(limit=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
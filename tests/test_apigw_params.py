@@ -0,0 +1,42 @@
+#!/usr/bin/python
+# TODO: License goes here
+
+from module_utils.apigw_params import check_entry
+import unittest
+
+SPEC = dict(
+  name=dict(required=True, aliases=['method']),
+  limit=dict(type='int', default=-1),
+  rate=dict(type='float'),
+  enabled=dict(type='bool', default=False),
+  period=dict(default='', choices=['', 'DAY']),
+  items=dict(type='list', default=[]),
+)
+
+class TestApiGwParams(unittest.TestCase):
+
+  def test_check_entry_converts_values_and_fills_defaults(self):
+    self.assertEqual(
+      dict(name='a', limit=5, rate=2.0, enabled=True, period='', items=[]),
+      check_entry(SPEC, {'method': 'a', 'limit': '5', 'rate': '2', 'enabled': 'yes'})
+    )
+
+  def test_check_entry_rejects_invalid_entries(self):
+    for (entry, msg) in [
+      ({'name': 'a', 'bogus': 1}, 'Unsupported parameters: bogus'),
+      ({'limit': 1}, 'missing required arguments: name'),
+      ({'name': 'a', 'limit': 'many'}, 'argument limit is of type'),
+      ({'name': 'a', 'period': 'YEAR'}, 'value of period must be one of: , DAY, got: YEAR'),
+    ]:
+      with self.assertRaises(ValueError) as ctx:
+        check_entry(SPEC, entry)
+      self.assertIn(msg, str(ctx.exception))
+
+  def test_check_entry_does_not_share_default_values(self):
+    first = check_entry(SPEC, {'name': 'a'})
+    first['items'].append('x')
+    self.assertEqual([], check_entry(SPEC, {'name': 'b'})['items'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/python
+# TODO: License goes here
+
+from module_utils.apigw_patch import create_patch, diff_endpoint_configuration, diff_fields, diff_list, diff_map, escape_path, values_equal
+import unittest
+
+class TestApiGwPatch(unittest.TestCase):
+
+  def test_escape_path(self):
+    self.assertEqual('application~1json', escape_path('application/json'))
+    self.assertEqual('a~0b~1c', escape_path('a~b/c'))
+    self.assertEqual('plain', escape_path('plain'))
+
+  def test_create_patch_stringifies_values_and_escapes_keys(self):
+    self.assertEqual({'op': 'replace', 'path': '/enabled', 'value': 'True'}, create_patch('replace', 'enabled', value=True))
+    self.assertEqual({'op': 'remove', 'path': '/responseModels/text~1html'}, create_patch('remove', 'text/html', prefix='responseModels'))
+
+  def test_values_equal(self):
+    self.assertTrue(values_equal('abc', 'abc'))
+    self.assertFalse(values_equal('ABC', 'abc'))
+    self.assertTrue(values_equal('ABC', 'abc', ignore_case=True))
+    self.assertTrue(values_equal(u'abc', 'abc'))
+    self.assertTrue(values_equal(True, 'True'))
+    self.assertTrue(values_equal(True, 'true', ignore_case=True))
+    self.assertFalse(values_equal(True, 'true'))
+    self.assertTrue(values_equal(100, 100.0))
+    self.assertFalse(values_equal(True, 1))
+    self.assertTrue(values_equal('1.6', 1.6))
+
+  def test_diff_fields_adds_replaces_and_removes(self):
+    current = {'a': 'same', 'b': 'old', 'c': 'doomed', 'nested': {'x': 1}}
+    params = {'pa': 'same', 'pb': 'new', 'pd': 'added', 'px': 2}
+    fields = [
+      {'ansible': 'pa', 'boto': 'a'},
+      {'ansible': 'pb', 'boto': 'b'},
+      {'ansible': 'pc', 'boto': 'c', 'remove': True},
+      {'ansible': 'pd', 'boto': 'd'},
+      {'ansible': 'px', 'boto': 'nested/x'},
+      {'ansible': 'py', 'boto': 'nested/y'},
+    ]
+
+    self.assertEqual([
+      {'op': 'replace', 'path': '/b', 'value': 'new'},
+      {'op': 'remove', 'path': '/c'},
+      {'op': 'add', 'path': '/d', 'value': 'added'},
+      {'op': 'replace', 'path': '/nested/x', 'value': '2'},
+    ], diff_fields(current, params, fields))
+
+  def test_diff_fields_leaves_field_alone_when_param_is_none(self):
+    fields = [{'ansible': 'authorizer_id', 'boto': 'authorizerId', 'remove': True}]
+
+    self.assertEqual([], diff_fields({'authorizerId': 'abc'}, {'authorizer_id': None}, fields))
+    self.assertEqual(
+      [{'op': 'remove', 'path': '/authorizerId'}],
+      diff_fields({'authorizerId': 'abc'}, {}, fields)
+    )
+
+  def test_diff_fields_honors_op_default_and_keep_empty(self):
+    fields = [
+      {'ansible': 'description', 'boto': 'description', 'op': 'replace', 'keep_empty': True},
+      {'ansible': 'ttl', 'boto': 'ttl', 'op': 'replace', 'default': 0},
+      {'ansible': 'kept', 'boto': 'kept'},
+    ]
+
+    self.assertEqual(
+      [{'op': 'replace', 'path': '/ttl', 'value': '0'}],
+      diff_fields({'kept': 'x'}, {'description': ''}, fields)
+    )
+    self.assertEqual(
+      [{'op': 'replace', 'path': '/description', 'value': ''}],
+      diff_fields({'description': 'old', 'ttl': 0}, {'description': ''}, fields)
+    )
+
+  def test_diff_map_builds_ordered_minimal_ops(self):
+    current = {'b': 'same', 'a': 'old', 'z': 'gone', 'y': 'gone'}
+    wanted = {'b': 'same', 'a': 'new', 'c/d': 'added'}
+
+    self.assertEqual([
+      {'op': 'replace', 'path': '/map/a', 'value': 'new'},
+      {'op': 'add', 'path': '/map/c~1d', 'value': 'added'},
+      {'op': 'remove', 'path': '/map/y'},
+      {'op': 'remove', 'path': '/map/z'},
+    ], diff_map(current, wanted, 'map'))
+
+  def test_diff_map_handles_missing_current_map(self):
+    self.assertEqual([{'op': 'add', 'path': '/map/k', 'value': 'v'}], diff_map(None, {'k': 'v'}, 'map'))
+    self.assertEqual([], diff_map(None, {}, 'map'))
+
+  def test_diff_list_adds_and_removes_members(self):
+    self.assertEqual([
+      {'op': 'add', 'path': '/types/image~1png'},
+      {'op': 'remove', 'path': '/types/*~1*'},
+    ], diff_list(['*/*', 'application/pdf'], ['image/png', 'application/pdf', 'image/png'], 'types'))
+    self.assertEqual([], diff_list(None, [], 'types'))
+
+  def test_diff_endpoint_configuration_replaces_type_between_id_changes(self):
+    self.assertEqual([
+      {'op': 'replace', 'path': '/endpointConfiguration/types/REGIONAL', 'value': 'PRIVATE'},
+      {'op': 'add', 'path': '/endpointConfiguration/vpcEndpointIds', 'value': 'vpce-1'},
+    ], diff_endpoint_configuration({'types': ['REGIONAL']}, 'PRIVATE', ['vpce-1']))
+
+    self.assertEqual([
+      {'op': 'remove', 'path': '/endpointConfiguration/vpcEndpointIds', 'value': 'vpce-1'},
+      {'op': 'replace', 'path': '/endpointConfiguration/types/PRIVATE', 'value': 'REGIONAL'},
+    ], diff_endpoint_configuration({'types': ['PRIVATE'], 'vpcEndpointIds': ['vpce-1']}, 'REGIONAL', []))
+
+    self.assertEqual([
+      {'op': 'remove', 'path': '/endpointConfiguration/vpcEndpointIds', 'value': 'vpce-2'},
+      {'op': 'add', 'path': '/endpointConfiguration/vpcEndpointIds', 'value': 'vpce-3'},
+    ], diff_endpoint_configuration({'types': ['PRIVATE'], 'vpcEndpointIds': ['vpce-1', 'vpce-2']}, 'PRIVATE', ['vpce-1', 'vpce-3']))
+
+  def test_diff_endpoint_configuration_defaults_to_edge_and_skips_unset_values(self):
+    self.assertEqual(
+      [{'op': 'replace', 'path': '/endpointConfiguration/types/EDGE', 'value': 'REGIONAL'}],
+      diff_endpoint_configuration(None, 'REGIONAL')
+    )
+    self.assertEqual([], diff_endpoint_configuration({'types': ['REGIONAL']}, 'REGIONAL'))
+    self.assertEqual([], diff_endpoint_configuration({'types': ['PRIVATE'], 'vpcEndpointIds': ['a']}, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
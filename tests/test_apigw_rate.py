@@ -0,0 +1,115 @@
+#!/usr/bin/python
+# TODO: License goes here
+
+from module_utils.apigw_rate import RateLimiter, SharedRateLimiter, normalize_budgets
+import mock
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+class TestApiGwRate(unittest.TestCase):
+
+  def test_acquire_allows_burst_then_spaces_calls(self):
+    sleep = mock.MagicMock()
+    limiter = RateLimiter(2, burst=2, clock=lambda: 100.0, sleep=sleep)
+
+    self.assertEqual([0.0, 0.0, 0.5, 1.0], [limiter.acquire() for _ in range(4)])
+    sleep.assert_has_calls([mock.call(0.5), mock.call(1.0)])
+
+  def test_acquire_refills_tokens_over_time(self):
+    now = [100.0]
+    sleep = mock.MagicMock()
+    limiter = RateLimiter(1, clock=lambda: now[0], sleep=sleep)
+
+    limiter.acquire()
+    now[0] += 5
+    self.assertEqual(0.0, limiter.acquire())
+    self.assertEqual(1.0, limiter.acquire())
+
+  def test_acquire_never_waits_without_a_rate(self):
+    sleep = mock.MagicMock()
+    limiter = RateLimiter(None, sleep=sleep)
+
+    self.assertEqual([0.0] * 50, [limiter.acquire() for _ in range(50)])
+    self.assertEqual(0, sleep.call_count)
+
+class TestApiGwSharedRate(unittest.TestCase):
+
+  def setUp(self):
+    self.tmpdir = tempfile.mkdtemp()
+    self.path = os.path.join(self.tmpdir, 'rate.json')
+    self.now = [100.0]
+    self.sleep = mock.MagicMock()
+
+  def tearDown(self):
+    shutil.rmtree(self.tmpdir)
+
+  def _limiter(self, budgets):
+    return SharedRateLimiter(self.path, budgets=budgets, clock=lambda: self.now[0], sleep=self.sleep)
+
+  def test_normalize_budgets_accepts_rates_and_dicts(self):
+    self.assertEqual(
+      {'a': dict(rate=0.5, burst=1.0), 'b': dict(rate=4.0, burst=4.0), 'c': dict(rate=4.0, burst=8.0)},
+      normalize_budgets({'a': 0.5, 'b': '4', 'c': dict(rate=4, burst=8)})
+    )
+
+  def test_buckets_prefer_exact_names_then_longest_pattern(self):
+    limiter = self._limiter({'put_*': 5, 'put_method*': 2, 'create_resource': 5})
+
+    self.assertEqual(['*', 'create_resource'], limiter.buckets('create_resource'))
+    self.assertEqual(['*', 'put_method*'], limiter.buckets('put_method_response'))
+    self.assertEqual(['*', 'put_*'], limiter.buckets('put_integration'))
+    self.assertEqual(['*'], limiter.buckets('get_stage'))
+
+  def test_buckets_skip_disabled_budgets(self):
+    limiter = self._limiter({'*': 0, 'get_resources': 0})
+
+    self.assertEqual([], limiter.buckets('get_resources'))
+    self.assertEqual(['create_resource'], limiter.buckets('create_resource'))
+    self.assertEqual(0.0, limiter.acquire('get_stage'))
+    self.assertFalse(os.path.exists(self.path))
+
+  def test_acquire_shares_buckets_between_limiters_on_one_file(self):
+    budgets = {'*': dict(rate=100, burst=100), 'put_*': dict(rate=2, burst=2)}
+    first = self._limiter(budgets)
+    second = self._limiter(budgets)
+
+    waits = [first.acquire('put_method'), second.acquire('put_integration'), first.acquire('put_method'), second.acquire('put_method')]
+
+    self.assertEqual([0.0, 0.0, 0.5, 1.0], waits)
+    self.sleep.assert_has_calls([mock.call(0.5), mock.call(1.0)])
+
+  def test_acquire_waits_for_the_slowest_bucket(self):
+    limiter = self._limiter({'*': dict(rate=1, burst=1), 'create_resource': dict(rate=10, burst=10)})
+
+    self.assertEqual(0.0, limiter.acquire('create_resource'))
+    self.assertEqual(1.0, limiter.acquire('create_resource'))
+
+  def test_acquire_keeps_regions_apart(self):
+    budgets = {'*': dict(rate=1, burst=1)}
+    east = SharedRateLimiter(self.path, budgets=budgets, prefix='us-east-1:', clock=lambda: self.now[0], sleep=self.sleep)
+    west = SharedRateLimiter(self.path, budgets=budgets, prefix='us-west-2:', clock=lambda: self.now[0], sleep=self.sleep)
+
+    self.assertEqual([0.0, 0.0], [east.acquire('get_stage'), west.acquire('get_stage')])
+    with open(self.path) as f:
+      self.assertEqual(['us-east-1:*', 'us-west-2:*'], sorted(json.load(f)))
+
+  def test_acquire_starts_over_from_a_corrupt_state_file(self):
+    with open(self.path, 'w') as f:
+      f.write('not json')
+    limiter = self._limiter({'*': dict(rate=1, burst=1)})
+
+    self.assertEqual(0.0, limiter.acquire('get_stage'))
+    self.assertEqual(1.0, limiter.acquire('get_stage'))
+
+  def test_acquire_does_not_limit_when_the_state_file_is_unusable(self):
+    limiter = SharedRateLimiter(os.path.join(self.tmpdir, 'missing', 'rate.json'), budgets={'*': dict(rate=1, burst=1)}, sleep=self.sleep)
+
+    self.assertEqual([0.0, 0.0], [limiter.acquire('get_stage'), limiter.acquire('get_stage')])
+    self.assertEqual(0, self.sleep.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,18 +3,25 @@
 
 import library.apigw_resource as apigw_resource
 from library.apigw_resource import ApiGwResource
+from module_utils.apigw_resources import PathIndex
 import mock
 from mock import patch
 from mock import create_autospec
 from mock import ANY
 import unittest
-import boto
 from botocore.exceptions import BotoCoreError
 
+def index_of(paths):
+  index = PathIndex()
+  for path, entry in paths.items():
+    index.add(path, entry['id'])
+  return index
+
 class TestApiGwResource(unittest.TestCase):
 
   def setUp(self):
     self.module = mock.MagicMock()
+    self.module.params = {}
     self.module.check_mode = False
     self.module.exit_json = mock.MagicMock()
     self.module.fail_json = mock.MagicMock()
@@ -22,7 +29,7 @@ class TestApiGwResource(unittest.TestCase):
     self.resource.client = mock.MagicMock()
     reload(apigw_resource)
 
-  def test_boto_module_not_found(self):
+  def test_legacy_boto_module_not_required(self):
     # Setup Mock Import Function
     import __builtin__ as builtins
     real_import = builtins.__import__
@@ -35,7 +42,7 @@ class TestApiGwResource(unittest.TestCase):
       reload(apigw_resource)
       ApiGwResource(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.assertEqual(0, self.module.fail_json.call_count)
 
   def test_boto3_module_not_found(self):
     # Setup Mock Import Function
@@ -50,12 +57,12 @@ class TestApiGwResource(unittest.TestCase):
       reload(apigw_resource)
       ApiGwResource(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.module.fail_json.assert_called_with(msg='boto3 is required for this module')
 
-  @patch.object(apigw_resource, 'boto3')
-  def test_boto3_client_properly_instantiated(self, mock_boto):
+  @patch('boto3.client')
+  def test_boto3_client_properly_instantiated(self, mock_client):
     ApiGwResource(self.module)
-    mock_boto.client.assert_called_once_with('apigateway')
+    mock_client.assert_called_once_with('apigateway')
 
   def test_process_request_builds_resources_dictionary(self):
     response = {
@@ -77,18 +84,51 @@ class TestApiGwResource(unittest.TestCase):
     self.resource.client.get_resources = mock.MagicMock(return_value=response)
 
     expected = {
-      'paths': {
-        '/': {'id': 'root'},
-        '/base': {'id': 'abc123', 'parentId': 'root'},
-        '/base/{param}': {'id': 'def456', 'parentId': 'abc123'},
-      }
+      '/': 'root',
+      '/base': 'abc123',
+      '/base/{param}': 'def456',
     }
 
     self.resource.module.params = {'name': '/base/{param}', 'rest_api_id': 'rest_id'}
 
     self.resource.process_request()
     self.resource.client.get_resources.assert_called_once_with(restApiId='rest_id', limit=500)
-    self.assertEqual(self.resource.path_map, expected)
+    self.assertEqual(dict(self.resource.path_index.items()), expected)
+
+  def test_process_request_follows_position_tokens_when_paging_resources(self):
+    responses = [
+      {'items': [{'id': 'root', 'path': '/'}], 'position': 'page2'},
+      {'items': [{'id': 'abc123', 'parentId': 'root', 'path': '/base', 'pathPart': 'base'}], 'position': 'page3'},
+      {'items': [{'id': 'def456', 'parentId': 'root', 'path': '/other', 'pathPart': 'other'}]},
+    ]
+    self.resource.client.get_resources = mock.MagicMock(side_effect=responses)
+    self.resource.client.create_resource = mock.MagicMock(return_value={'id': 'new'})
+
+    self.resource.module.params = {'name': '/missing', 'rest_api_id': 'rest_id'}
+    self.resource.process_request()
+
+    self.assertEqual(3, self.resource.client.get_resources.call_count)
+    self.resource.client.get_resources.assert_any_call(restApiId='rest_id', limit=500)
+    self.resource.client.get_resources.assert_any_call(restApiId='rest_id', limit=500, position='page2')
+    self.resource.client.get_resources.assert_called_with(restApiId='rest_id', limit=500, position='page3')
+    self.assertIn('/other', self.resource.path_index)
+    self.resource.client.create_resource.assert_called_once_with(restApiId='rest_id', parentId='root', pathPart='missing')
+
+  def test_process_request_stops_paging_once_requested_path_is_resolved(self):
+    responses = [
+      {'items': [{'id': 'root', 'path': '/'}, {'id': 'abc123', 'parentId': 'root', 'path': '/base'}], 'position': 'page2'},
+      {'items': [{'id': 'def456', 'parentId': 'root', 'path': '/other'}]},
+    ]
+    self.resource.client.get_resources = mock.MagicMock(side_effect=responses)
+
+    self.resource.module.params = {'name': '/base', 'rest_api_id': 'rest_id'}
+    self.resource.process_request()
+
+    self.resource.client.get_resources.assert_called_once_with(restApiId='rest_id', limit=500)
+    self.resource.module.exit_json.assert_called_once_with(
+      changed=False,
+      resource={'id': 'abc123', 'parentId': 'root', 'path': '/base'}
+    )
 
   @patch.object(ApiGwResource, '_create_resource', return_value=(None, None))
   def test_process_request_calls_fail_json_when_get_resources_fails(self, mock_create):
@@ -101,7 +141,7 @@ class TestApiGwResource(unittest.TestCase):
   @patch.object(ApiGwResource, '_build_resource_dictionary')
   def test_process_request_creates_resource_when_resource_is_completely_new(self, mock_build_dict):
     mock_response = {'id': 'hurray'}
-    self.resource.path_map = { 'paths': {'/': {'id': 'root'}} }
+    self.resource.path_index = index_of({'/': {'id': 'root'}})
     self.resource.client.create_resource = mock.MagicMock(return_value=mock_response)
 
     self.resource.module.params = {'name': '/resource1', 'rest_api_id': 'mock'}
@@ -112,7 +152,7 @@ class TestApiGwResource(unittest.TestCase):
 
   @patch.object(ApiGwResource, '_build_resource_dictionary')
   def test_process_request_creates_missing_resources_when_resource_partially_exists(self, mock_build_dict):
-    self.resource.path_map = { 'paths': {'/': {'id': 'root'}, '/res1': {'id': 'abc', 'parentId': 'root'}} }
+    self.resource.path_index = index_of({'/': {'id': 'root'}, '/res1': {'id': 'abc', 'parentId': 'root'}})
 
     responses = [{'id': 'param_id', 'path': '/res1/{param}'}, {'id': 'res2_id', 'path': '/res1/{param}/res2'}]
     self.resource.client.create_resource = mock.MagicMock(side_effect=responses)
@@ -129,7 +169,7 @@ class TestApiGwResource(unittest.TestCase):
 
   @patch.object(ApiGwResource, '_build_resource_dictionary')
   def test_process_request_calls_fail_json_when_create_resource_fails(self, mock_build_dict):
-    self.resource.path_map = { 'paths': {'/': {'id': 'root'}} }
+    self.resource.path_index = index_of({'/': {'id': 'root'}})
     self.resource.client.create_resource = mock.MagicMock(side_effect=BotoCoreError())
 
     self.resource.module.params = {'name': '/resource1', 'rest_api_id': 'mock'}
@@ -141,7 +181,7 @@ class TestApiGwResource(unittest.TestCase):
 
   @patch.object(ApiGwResource, '_build_resource_dictionary')
   def test_process_skips_create_and_returns_existing_data_when_resource_exists(self, mock_build_dict):
-    self.resource.path_map = { 'paths': {'/': {'id': 'root'}, '/resource1': {'id': 'abc', 'parentId': 'root'}} }
+    self.resource.path_index = index_of({'/': {'id': 'root'}, '/resource1': {'id': 'abc', 'parentId': 'root'}})
     self.resource.client.create_resource = mock.MagicMock()
 
     expected = {'id': 'abc', 'parentId': 'root', 'path': '/resource1'}
@@ -154,7 +194,7 @@ class TestApiGwResource(unittest.TestCase):
 
   @patch.object(ApiGwResource, '_build_resource_dictionary')
   def test_process_skips_create_when_check_mode_enabled(self, mock_build_dict):
-    self.resource.path_map = { 'paths': {'/': {'id': 'root'}} }
+    self.resource.path_index = index_of({'/': {'id': 'root'}})
     self.resource.client.create_resource = mock.MagicMock()
 
     self.resource.module.check_mode = True
@@ -167,7 +207,7 @@ class TestApiGwResource(unittest.TestCase):
 
   @patch.object(ApiGwResource, '_build_resource_dictionary')
   def test_process_request_deletes_resource_when_resource_is_present(self, mock_build_dict):
-    self.resource.path_map = { 'paths': {'/': {'id': 'root'}, '/resource1': {'id': 'abc', 'parentId': 'root'}} }
+    self.resource.path_index = index_of({'/': {'id': 'root'}, '/resource1': {'id': 'abc', 'parentId': 'root'}})
     self.resource.client.delete_resource = mock.MagicMock()
 
     self.resource.module.params = {'name': '/resource1', 'rest_api_id': 'mock', 'state': 'absent'}
@@ -178,7 +218,7 @@ class TestApiGwResource(unittest.TestCase):
 
   @patch.object(ApiGwResource, '_build_resource_dictionary')
   def test_process_request_calls_fail_json_when_delete_resource_fails(self, mock_build_dict):
-    self.resource.path_map = { 'paths': {'/': {'id': 'root'}, '/resource1': {'id': 'abc', 'parentId': 'root'}} }
+    self.resource.path_index = index_of({'/': {'id': 'root'}, '/resource1': {'id': 'abc', 'parentId': 'root'}})
     self.resource.client.delete_resource = mock.MagicMock(side_effect=BotoCoreError())
 
     self.resource.module.params = {'name': '/resource1', 'rest_api_id': 'mock', 'state': 'absent'}
@@ -190,7 +230,7 @@ class TestApiGwResource(unittest.TestCase):
 
   @patch.object(ApiGwResource, '_build_resource_dictionary')
   def test_process_request_skips_delete_when_resource_is_missing(self, mock_build_dict):
-    self.resource.path_map = { 'paths': {'/': {'id': 'root'}} }
+    self.resource.path_index = index_of({'/': {'id': 'root'}})
     self.resource.client.delete_resource = mock.MagicMock()
 
     self.resource.module.params = {'name': '/resource1', 'rest_api_id': 'mock', 'state': 'absent'}
@@ -201,7 +241,7 @@ class TestApiGwResource(unittest.TestCase):
 
   @patch.object(ApiGwResource, '_build_resource_dictionary')
   def test_process_request_skips_delete_when_check_mode_enabled(self, mock_build_dict):
-    self.resource.path_map = { 'paths': {'/': {'id': 'root'}, '/del': {'id': 'abc'}} }
+    self.resource.path_index = index_of({'/': {'id': 'root'}, '/del': {'id': 'abc'}})
     self.resource.client.delete_resource = mock.MagicMock()
 
     self.resource.module.check_mode=True
@@ -211,15 +251,178 @@ class TestApiGwResource(unittest.TestCase):
     self.assertEqual(0, self.resource.client.delete_resource.call_count)
     self.resource.module.exit_json.assert_called_once_with(changed=True, resource=None)
 
+  def test_build_delete_resources_list_keeps_only_top_most_existing_paths(self):
+    path_index = index_of({
+      '/': {'id': 'root'},
+      '/a': {'id': 'a'},
+      '/a/b': {'id': 'b'},
+      '/a/b/c': {'id': 'c'},
+      '/d': {'id': 'd'},
+      '/d/e': {'id': 'e'},
+    })
+
+    result = ApiGwResource._build_delete_resources_list(path_index, ['/a/b/c', '/a', '/d/e', '/missing', '/'])
+
+    self.assertEqual(['/a', '/d/e'], result)
+
+  def test_build_prune_resources_list_returns_top_most_undeclared_paths(self):
+    path_index = index_of({
+      '/': {'id': 'root'},
+      '/a': {'id': 'a'},
+      '/a/b': {'id': 'b'},
+      '/a/b/c': {'id': 'c'},
+      '/a/x': {'id': 'x'},
+      '/a/x/y': {'id': 'y'},
+      '/d': {'id': 'd'},
+      '/d/e': {'id': 'e'},
+    })
+
+    result = ApiGwResource._build_prune_resources_list(path_index, ['/a/b', '/new/thing'])
+
+    self.assertEqual(['/a/b/c', '/a/x', '/d'], result)
+
+  @patch.object(ApiGwResource, '_build_resource_dictionary')
+  def test_process_request_deletes_only_top_most_paths_when_paths_are_absent(self, mock_build_dict):
+    self.resource.path_index = index_of({
+      '/': {'id': 'root'},
+      '/a': {'id': 'a_id'},
+      '/a/b': {'id': 'b_id'},
+      '/c': {'id': 'c_id'},
+    })
+
+    self.resource.module.params = {'paths': ['/a', '/a/b', '/c', '/nope'], 'rest_api_id': 'mock', 'state': 'absent', 'concurrency': 2}
+    self.resource.process_request()
+
+    self.assertEqual(2, self.resource.client.delete_resource.call_count)
+    self.resource.client.delete_resource.assert_any_call(restApiId='mock', resourceId='a_id')
+    self.resource.client.delete_resource.assert_any_call(restApiId='mock', resourceId='c_id')
+    self.assertEqual([('/', 'root')], list(self.resource.path_index.items()))
+    self.resource.module.exit_json.assert_called_once_with(changed=True, resources=None, deleted=['/a', '/c'])
+
+  @patch.object(ApiGwResource, '_build_resource_dictionary')
+  def test_process_request_skips_delete_of_paths_when_check_mode_enabled(self, mock_build_dict):
+    self.resource.path_index = index_of({'/': {'id': 'root'}, '/a': {'id': 'a_id'}})
+    self.resource.module.check_mode = True
+
+    self.resource.module.params = {'paths': ['/a'], 'rest_api_id': 'mock', 'state': 'absent', 'concurrency': 2}
+    self.resource.process_request()
+
+    self.assertEqual(0, self.resource.client.delete_resource.call_count)
+    self.resource.module.exit_json.assert_called_once_with(changed=True, resources=None, deleted=['/a'])
+
+  @patch.object(ApiGwResource, '_build_resource_dictionary')
+  def test_process_request_calls_fail_json_when_deleting_paths_fails(self, mock_build_dict):
+    self.resource.path_index = index_of({'/': {'id': 'root'}, '/a': {'id': 'a_id'}})
+    self.resource.client.delete_resource = mock.MagicMock(side_effect=BotoCoreError())
+
+    self.resource.module.params = {'paths': ['/a'], 'rest_api_id': 'mock', 'state': 'absent', 'concurrency': 2}
+    self.resource.process_request()
+
+    self.resource.module.fail_json.assert_called_once_with(
+        msg='Error calling boto3 delete_resource: An unspecified error occurred')
+
+  def test_process_request_prunes_undeclared_branches_when_exclusive(self):
+    self.resource.client.get_resources = mock.MagicMock(return_value={'items': [
+      {'id': 'root', 'path': '/'},
+      {'id': 'a_id', 'parentId': 'root', 'path': '/a'},
+      {'id': 'old_id', 'parentId': 'root', 'path': '/old'},
+      {'id': 'older_id', 'parentId': 'old_id', 'path': '/old/older'},
+    ]})
+    self.resource.client.create_resource = mock.MagicMock(return_value={'id': 'b_id', 'parentId': 'a_id'})
+
+    self.resource.module.params = {'paths': ['/a/b'], 'rest_api_id': 'mock', 'exclusive': True, 'concurrency': 2}
+    self.resource.process_request()
+
+    self.resource.client.delete_resource.assert_called_once_with(restApiId='mock', resourceId='old_id')
+    self.resource.client.create_resource.assert_called_once_with(restApiId='mock', parentId='a_id', pathPart='b')
+    self.resource.module.exit_json.assert_called_once_with(
+      changed=True,
+      resources=[{'id': 'b_id', 'parentId': 'a_id', 'path': '/a/b'}],
+      deleted=['/old']
+    )
+
   def test_define_argument_spec(self):
     result = ApiGwResource._define_module_argument_spec()
     self.assertIsInstance(result, dict)
     self.assertEqual(result, dict(
-                     name=dict(required=True),
+                     name=dict(required=False),
+                     paths=dict(required=False, type='list'),
                      rest_api_id=dict(required=True),
+                     exclusive=dict(required=False, type='bool', default=False),
+                     concurrency=dict(required=False, type='int', default=4),
                      state=dict(default='present', choices=['present', 'absent'])
     ))
 
+  def test_build_create_resources_trie_merges_shared_prefixes(self):
+    path_index = index_of({'/': {'id': 'root'}, '/a': {'id': 'a_id'}})
+
+    result = ApiGwResource._build_create_resources_trie(path_index, ['/a/b/c', '/a/b/d', '/x', '/a'])
+
+    self.assertEqual(['/a/b', '/x'], sorted(result.keys()))
+    self.assertEqual({'part': 'b', 'path': '/a/b', 'parent': '/a'}, result['/a/b']['op'])
+    self.assertEqual(['/a/b/c', '/a/b/d'], sorted(result['/a/b']['children'].keys()))
+    self.assertEqual({}, result['/x']['children'])
+
+  def test_process_request_creates_all_paths_in_topological_order(self):
+    self.resource.client.get_resources = mock.MagicMock(return_value={'items': [{'id': 'root', 'path': '/'}]})
+
+    calls = []
+    def create_resource(restApiId, parentId, pathPart):
+      calls.append((parentId, pathPart))
+      return {'id': "{}_id".format(pathPart), 'parentId': parentId}
+    self.resource.client.create_resource = mock.MagicMock(side_effect=create_resource)
+
+    self.resource.module.params = {'paths': ['/a/b', '/a/c', '/d'], 'rest_api_id': 'rest_id', 'concurrency': 3}
+    self.resource.process_request()
+
+    self.assertEqual(4, self.resource.client.create_resource.call_count)
+    self.assertLess(calls.index(('root', 'a')), calls.index(('a_id', 'b')))
+    self.assertLess(calls.index(('root', 'a')), calls.index(('a_id', 'c')))
+    self.assertIn(('root', 'd'), calls)
+    self.resource.module.exit_json.assert_called_once_with(changed=True, resources=[
+      {'id': 'b_id', 'parentId': 'a_id', 'path': '/a/b'},
+      {'id': 'c_id', 'parentId': 'a_id', 'path': '/a/c'},
+      {'id': 'd_id', 'parentId': 'root', 'path': '/d'},
+    ], deleted=[])
+
+  def test_process_request_lists_resources_once_and_skips_create_when_all_paths_exist(self):
+    self.resource.client.get_resources = mock.MagicMock(return_value={'items': [
+      {'id': 'root', 'path': '/'},
+      {'id': 'a_id', 'parentId': 'root', 'path': '/a'},
+    ]})
+
+    self.resource.module.params = {'paths': ['/a'], 'rest_api_id': 'rest_id', 'concurrency': 4}
+    self.resource.process_request()
+
+    self.resource.client.get_resources.assert_called_once_with(restApiId='rest_id', limit=500)
+    self.assertEqual(0, self.resource.client.create_resource.call_count)
+    self.resource.module.exit_json.assert_called_once_with(changed=False, resources=[
+      {'id': 'a_id', 'parentId': 'root', 'path': '/a'},
+    ], deleted=[])
+
+  @patch.object(ApiGwResource, '_build_resource_dictionary')
+  def test_process_request_skips_create_of_paths_when_check_mode_enabled(self, mock_build_dict):
+    self.resource.path_index = index_of({'/': {'id': 'root'}})
+    self.resource.module.check_mode = True
+
+    self.resource.module.params = {'paths': ['/a'], 'rest_api_id': 'rest_id', 'concurrency': 4}
+    self.resource.process_request()
+
+    self.assertEqual(0, self.resource.client.create_resource.call_count)
+    self.resource.module.exit_json.assert_called_once_with(changed=True, resources=[{'id': None, 'path': '/a'}], deleted=[])
+
+  @patch.object(ApiGwResource, '_build_resource_dictionary')
+  def test_process_request_stops_creating_paths_and_fails_when_create_resource_fails(self, mock_build_dict):
+    self.resource.path_index = index_of({'/': {'id': 'root'}})
+    self.resource.client.create_resource = mock.MagicMock(side_effect=BotoCoreError())
+
+    self.resource.module.params = {'paths': ['/a/b/c'], 'rest_api_id': 'rest_id', 'concurrency': 4}
+    self.resource.process_request()
+
+    self.resource.client.create_resource.assert_called_once_with(restApiId='rest_id', parentId='root', pathPart='a')
+    self.resource.module.fail_json.assert_called_once_with(
+        msg='Error calling boto3 create_resource: An unspecified error occurred')
+
 
   @patch.object(apigw_resource, 'AnsibleModule')
   @patch.object(apigw_resource, 'ApiGwResource')
@@ -0,0 +1,164 @@
+#!/usr/bin/python
+# TODO: License goes here
+
+from module_utils.apigw_resources import iter_resources, ResourceSnapshot, PathIndex
+import mock
+import unittest
+from botocore.exceptions import BotoCoreError
+
+class TestApiGwResources(unittest.TestCase):
+
+  def setUp(self):
+    self.client = mock.MagicMock()
+
+  def test_iter_resources_follows_position_tokens(self):
+    self.client.get_resources = mock.MagicMock(side_effect=[
+      {'items': [{'id': 'a'}, {'id': 'b'}], 'position': 'next'},
+      {'items': [{'id': 'c'}]},
+    ])
+
+    result = [r['id'] for r in iter_resources(self.client, 'api')]
+
+    self.assertEqual(['a', 'b', 'c'], result)
+    self.client.get_resources.assert_any_call(restApiId='api', limit=500)
+    self.client.get_resources.assert_called_with(restApiId='api', limit=500, position='next')
+
+  def test_iter_resources_passes_embed(self):
+    self.client.get_resources = mock.MagicMock(return_value={'items': []})
+
+    list(iter_resources(self.client, 'api', embed=['methods']))
+
+    self.client.get_resources.assert_called_once_with(restApiId='api', limit=500, embed=['methods'])
+
+  def test_iter_resources_raises_boto_errors(self):
+    self.client.get_resources = mock.MagicMock(side_effect=BotoCoreError())
+
+    with self.assertRaises(BotoCoreError):
+      list(iter_resources(self.client, 'api'))
+
+  def test_snapshot_loads_every_page_and_indexes_by_id_and_path(self):
+    self.client.get_resources = mock.MagicMock(side_effect=[
+      {'items': [{'id': 'root', 'path': '/'}], 'position': 'next'},
+      {'items': [{'id': 'a', 'path': '/a', 'resourceMethods': {'GET': {'httpMethod': 'GET'}}}]},
+    ])
+
+    snapshot = ResourceSnapshot(self.client, 'api', embed_methods=True).load()
+
+    self.assertTrue(snapshot.complete)
+    self.assertEqual(['/', '/a'], sorted(snapshot.by_path.keys()))
+    self.assertEqual({'httpMethod': 'GET'}, snapshot.get_method('a', 'GET'))
+    self.assertIsNone(snapshot.get_method('a', 'POST'))
+    self.assertIsNone(snapshot.get_method('missing', 'GET'))
+    self.client.get_resources.assert_any_call(restApiId='api', limit=500, embed=['methods'])
+
+  def test_snapshot_stops_once_requested_resource_ids_are_seen(self):
+    self.client.get_resources = mock.MagicMock(side_effect=[
+      {'items': [{'id': 'a', 'path': '/a'}, {'id': 'b', 'path': '/b'}], 'position': 'next'},
+      {'items': [{'id': 'c', 'path': '/c'}]},
+    ])
+
+    snapshot = ResourceSnapshot(self.client, 'api').load(resource_ids=['b'])
+    snapshot.load(resource_ids=['a'])
+
+    self.assertFalse(snapshot.complete)
+    self.client.get_resources.assert_called_once_with(restApiId='api', limit=500)
+
+  def test_snapshot_resumes_paging_where_previous_load_stopped(self):
+    self.client.get_resources = mock.MagicMock(side_effect=[
+      {'items': [{'id': 'a', 'path': '/a'}], 'position': 'next'},
+      {'items': [{'id': 'b', 'path': '/b'}]},
+    ])
+
+    snapshot = ResourceSnapshot(self.client, 'api').load(resource_ids=['a'])
+    snapshot.load(resource_ids=['b'])
+
+    self.assertEqual(2, self.client.get_resources.call_count)
+    self.client.get_resources.assert_called_with(restApiId='api', limit=500, position='next')
+    self.assertEqual(['/a', '/b'], sorted(snapshot.by_path.keys()))
+
+
+  def build_index(self):
+    index = PathIndex()
+    for path, resource_id in [('/a/b/c', 'c'), ('/', 'root'), ('/a', 'a'), ('/a/b', 'b'), ('/a/x', 'x'), ('/d', 'd')]:
+      index.add(path, resource_id)
+    return index
+
+  def test_path_index_looks_up_resources_by_path(self):
+    index = self.build_index()
+
+    self.assertEqual(6, len(index))
+    self.assertIn('/a/b', index)
+    self.assertNotIn('/a/b/missing', index)
+    self.assertEqual('c', index.get_id('/a/b/c'))
+    self.assertIsNone(index.get_id('/nope'))
+    self.assertEqual({'id': 'b', 'parentId': 'a', 'path': '/a/b'}, index.describe('/a/b'))
+    self.assertEqual({'id': 'root', 'path': '/'}, index.describe('/'))
+    self.assertEqual({'id': None, 'path': '/nope'}, index.describe('/nope'))
+
+  def test_path_index_placeholder_nodes_are_not_resources(self):
+    index = PathIndex()
+    index.add('/a/b', 'b')
+
+    self.assertEqual(1, len(index))
+    self.assertNotIn('/a', index)
+    self.assertEqual({'id': 'b', 'path': '/a/b'}, index.describe('/a/b'))
+
+    index.add('/a', 'a')
+    self.assertEqual(2, len(index))
+    self.assertEqual('a', index.describe('/a/b')['parentId'])
+
+  def test_path_index_keeps_the_listed_parent_id(self):
+    index = PathIndex()
+    index.add('/a/b', 'b', 'a')
+
+    self.assertEqual({'id': 'b', 'parentId': 'a', 'path': '/a/b'}, index.describe('/a/b'))
+
+  def test_path_index_keeps_empty_path_parts(self):
+    index = PathIndex()
+    index.add('/a', 'a')
+    index.add('/a/b', 'b')
+
+    self.assertNotIn('/a//b', index)
+    self.assertNotIn('/a/', index)
+    self.assertEqual(['/a//b', '/a/'], [path for (path, _) in index.ancestors('/a//b/')][:2])
+
+  def test_path_index_interns_repeated_parts(self):
+    index = PathIndex()
+    index.add('/one/{id}', '1')
+    index.add('/two/' + ''.join(['{', 'id', '}']), '2')
+
+    first = index.root.children['one'].children['{id}'].part
+    second = index.root.children['two'].children['{id}'].part
+    self.assertIs(first, second)
+
+  def test_path_index_walks_ancestors_nearest_first(self):
+    index = self.build_index()
+
+    self.assertEqual([('/a/b', 'b'), ('/a', 'a'), ('/', 'root')], list(index.ancestors('/a/b/c')))
+    self.assertEqual([], list(index.ancestors('/')))
+
+  def test_path_index_enumerates_subtrees(self):
+    index = self.build_index()
+
+    self.assertEqual([('/a', 'a'), ('/a/b', 'b'), ('/a/b/c', 'c'), ('/a/x', 'x')], sorted(index.items('/a')))
+    self.assertEqual(6, len(list(index.items())))
+    self.assertEqual([], list(index.items('/nope')))
+
+  def test_path_index_removes_whole_subtrees(self):
+    index = self.build_index()
+
+    self.assertEqual(3, index.remove('/a/b') + index.remove('/a/x'))
+    self.assertEqual(0, index.remove('/a/b'))
+    self.assertEqual(0, index.remove('/'))
+    self.assertEqual([('/', 'root'), ('/a', 'a'), ('/d', 'd')], sorted(index.items()))
+    self.assertEqual(3, len(index))
+
+  def test_path_index_prunes_top_most_undeclared_resources(self):
+    index = self.build_index()
+
+    self.assertEqual(['/a/b/c', '/a/x', '/d'], index.prune(['/a/b']))
+    self.assertEqual(['/a', '/d'], index.prune([]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,18 +3,23 @@
 
 import library.apigw_rest_api as apigw_rest_api
 from library.apigw_rest_api import ApiGwRestApi
+from module_utils.apigw_cache import NameCache
 import mock
 from mock import patch
 from mock import create_autospec
 from mock import ANY
 import unittest
-import boto
-from botocore.exceptions import BotoCoreError
+import json
+import os
+import shutil
+import tempfile
+from botocore.exceptions import BotoCoreError, ClientError
 
 class TestApiGwRestApi(unittest.TestCase):
 
   def setUp(self):
     self.module = mock.MagicMock()
+    self.module.params = {}
     self.module.check_mode = False
     self.module.exit_json = mock.MagicMock()
     self.module.fail_json = mock.MagicMock()
@@ -22,7 +27,7 @@ class TestApiGwRestApi(unittest.TestCase):
     self.restapi.client = mock.MagicMock()
     reload(apigw_rest_api)
 
-  def test_boto_module_not_found(self):
+  def test_legacy_boto_module_not_required(self):
     # Setup Mock Import Function
     import __builtin__ as builtins
     real_import = builtins.__import__
@@ -35,7 +40,7 @@ class TestApiGwRestApi(unittest.TestCase):
       reload(apigw_rest_api)
       ApiGwRestApi(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.assertEqual(0, self.module.fail_json.call_count)
 
   def test_boto3_module_not_found(self):
     # Setup Mock Import Function
@@ -50,18 +55,105 @@ class TestApiGwRestApi(unittest.TestCase):
       reload(apigw_rest_api)
       ApiGwRestApi(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.module.fail_json.assert_called_with(msg='boto3 is required for this module')
 
-  @patch.object(apigw_rest_api, 'boto3')
-  def test_boto3_client_properly_instantiated(self, mock_boto):
+  @patch('boto3.client')
+  def test_boto3_client_properly_instantiated(self, mock_client):
     ApiGwRestApi(self.module)
-    mock_boto.client.assert_called_once_with('apigateway')
+    mock_client.assert_called_once_with('apigateway')
 
   def test_process_request_calls_boto3_get_rest_apis(self):
     self.restapi.module.params = { 'name': 'whatever' }
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value={'items': []})
+    self.restapi.process_request()
+
+    self.restapi.client.get_rest_apis.assert_called_once_with(limit=500)
+
+  def test_process_request_pages_through_every_rest_api(self):
+    self.restapi.module.params = { 'name': 'whatever', 'state': 'present' }
+    self.restapi.client.get_rest_apis = mock.MagicMock(side_effect=[
+      {'items': [{'id': 1, 'name': 'other'}], 'position': 'p2'},
+      {'items': [{'id': 2, 'name': 'whatever'}, {'id': 3, 'name': 'more'}], 'position': 'p3'},
+      {'items': [{'id': 4, 'name': 'last'}]},
+    ])
     self.restapi.process_request()
 
-    self.restapi.client.get_rest_apis.assert_called_once_with()
+    self.assertEqual(3, self.restapi.client.get_rest_apis.call_count)
+    self.restapi.client.get_rest_apis.assert_called_with(limit=500, position='p3')
+    self.restapi.module.exit_json.assert_called_once_with(changed=False, api={'id': 2, 'name': 'whatever'})
+
+  def test_process_request_fails_when_name_repeats_on_a_later_page(self):
+    self.restapi.module.params = { 'name': 'whatever', 'state': 'present' }
+    self.restapi.client.get_rest_apis = mock.MagicMock(side_effect=[
+      {'items': [{'id': 'a1', 'name': 'whatever'}], 'position': 'p2'},
+      {'items': [{'id': 'b2', 'name': 'whatever'}]},
+    ])
+    self.restapi.process_request()
+
+    self.restapi.module.fail_json.assert_called_once_with(msg='Found 2 rest apis named whatever: a1, b2')
+
+  def test_process_request_fails_when_name_is_not_unique(self):
+    self.restapi.module.params = { 'name': 'whatever', 'state': 'present' }
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value={
+      'items': [{'id': 'a1', 'name': 'whatever'}, {'id': 'b2', 'name': 'whatever'}]
+    })
+    self.restapi.process_request()
+
+    self.restapi.module.fail_json.assert_called_once_with(msg='Found 2 rest apis named whatever: a1, b2')
+
+  def _with_cache(self, params, entries=None):
+    tmpdir = tempfile.mkdtemp()
+    self.addCleanup(shutil.rmtree, tmpdir)
+    params['lookup_cache'] = os.path.join(tmpdir, 'cache.json')
+    cache = NameCache(params['lookup_cache'], 'rest_apis:us-east-1')
+    for (name, ids) in (entries or {}).items():
+      cache.put(name, ids)
+    cache.save()
+    self.restapi.module.params = params
+    self.restapi.client.meta.region_name = 'us-east-1'
+    return self.restapi
+
+  def test_process_request_records_listed_names_in_lookup_cache(self):
+    restapi = self._with_cache({ 'name': 'whatever', 'state': 'present' })
+    restapi.client.get_rest_apis = mock.MagicMock(return_value={
+      'items': [{'id': 'a1', 'name': 'whatever'}, {'id': 'b2', 'name': 'other'}]
+    })
+    restapi.process_request()
+
+    with open(restapi.module.params['lookup_cache']) as f:
+      self.assertEqual({'rest_apis:us-east-1': {'whatever': ['a1'], 'other': ['b2']}}, json.load(f))
+
+  def test_process_request_drops_cached_names_missing_from_the_listing(self):
+    restapi = self._with_cache({ 'name': 'whatever', 'state': 'present' }, {'gone': ['g1'], 'dup': ['d1', 'd2']})
+    restapi.client.get_rest_apis = mock.MagicMock(return_value={
+      'items': [{'id': 'a1', 'name': 'whatever'}, {'id': 'd2', 'name': 'dup'}]
+    })
+    restapi.process_request()
+
+    with open(restapi.module.params['lookup_cache']) as f:
+      self.assertEqual({'rest_apis:us-east-1': {'whatever': ['a1'], 'dup': ['d2']}}, json.load(f))
+
+  def test_process_request_uses_lookup_cache_instead_of_listing(self):
+    restapi = self._with_cache({ 'name': 'whatever', 'state': 'present' }, {'whatever': ['a1']})
+    restapi.client.get_rest_apis = mock.MagicMock()
+    restapi.client.get_rest_api = mock.MagicMock(return_value={'id': 'a1', 'name': 'whatever', 'ResponseMetadata': {}})
+
+    restapi.process_request()
+
+    restapi.client.get_rest_api.assert_called_once_with(restApiId='a1')
+    self.assertEqual(0, restapi.client.get_rest_apis.call_count)
+    restapi.module.exit_json.assert_called_once_with(changed=False, api={'id': 'a1', 'name': 'whatever'})
+
+  def test_process_request_lists_when_cached_api_is_gone(self):
+    restapi = self._with_cache({ 'name': 'whatever', 'state': 'absent' }, {'whatever': ['a1']})
+    restapi.client.get_rest_api = mock.MagicMock(
+      side_effect=ClientError({'Error': {'Code': 'NotFoundException', 'Message': 'gone'}}, 'GetRestApi'))
+    restapi.client.get_rest_apis = mock.MagicMock(return_value={'items': [{'id': 'c3', 'name': 'whatever'}]})
+
+    restapi.process_request()
+
+    restapi.client.delete_rest_api.assert_called_once_with(restApiId='c3')
+    self.assertIsNone(NameCache(restapi.module.params['lookup_cache'], 'rest_apis:us-east-1').get('whatever'))
 
   def test_process_request_fails_when_get_rest_apis_returns_error(self):
     self.restapi.module.params = { 'name': 'whatever' }
@@ -107,6 +199,45 @@ class TestApiGwRestApi(unittest.TestCase):
     self.restapi.client.create_rest_api.assert_called_once_with(name='whatever', description='very awesome')
     self.restapi.module.exit_json.assert_called_once_with(changed=True, api=create_response)
 
+  def test_process_request_clones_api_by_id_when_missing(self):
+    self.restapi.module.params = { 'name': 'whatever', 'state': 'present', 'clone_from': 'abcde12345' }
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value={'items': []})
+    self.restapi.client.get_rest_api = mock.MagicMock(return_value={'id': 'abcde12345', 'name': 'source'})
+    self.restapi.client.create_rest_api = mock.MagicMock(return_value={'id': 'new'})
+    self.restapi.process_request()
+
+    self.restapi.client.get_rest_api.assert_called_once_with(restApiId='abcde12345')
+    self.restapi.client.create_rest_api.assert_called_once_with(name='whatever', cloneFrom='abcde12345')
+    self.restapi.module.exit_json.assert_called_once_with(changed=True, api={'id': 'new'})
+
+  def test_process_request_clones_api_by_name_when_missing(self):
+    self.restapi.module.params = { 'name': 'whatever', 'state': 'present', 'clone_from': 'source.example.io' }
+    self.restapi.client.get_rest_apis = mock.MagicMock(side_effect=[
+      {'items': [{'id': 'src', 'name': 'source.example.io'}]},
+      {'items': [{'id': 'src', 'name': 'source.example.io'}]},
+    ])
+    self.restapi.client.create_rest_api = mock.MagicMock(return_value={'id': 'new'})
+    self.restapi.process_request()
+
+    self.assertEqual(0, self.restapi.client.get_rest_api.call_count)
+    self.restapi.client.create_rest_api.assert_called_once_with(name='whatever', cloneFrom='src')
+
+  def test_process_request_fails_when_clone_source_is_missing(self):
+    self.restapi.module.params = { 'name': 'whatever', 'state': 'present', 'clone_from': 'nope' }
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value={'items': []})
+    self.restapi.process_request()
+
+    self.restapi.module.fail_json.assert_called_once_with(msg='Unable to find rest api nope to clone from')
+
+  def test_process_request_ignores_clone_from_when_api_exists(self):
+    self.restapi.module.params = { 'name': 'whatever', 'state': 'present', 'clone_from': 'abcde12345' }
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value={'items': [{'id': 1, 'name': 'whatever'}]})
+    self.restapi.process_request()
+
+    self.assertEqual(0, self.restapi.client.get_rest_api.call_count)
+    self.assertEqual(0, self.restapi.client.create_rest_api.call_count)
+    self.restapi.module.exit_json.assert_called_once_with(changed=False, api={'id': 1, 'name': 'whatever'})
+
   def test_process_request_fails_when_create_rest_api_throws_error(self):
     self.restapi.module.params = { 'name': 'whatever', 'state': 'present' }
     self.restapi.client.get_rest_apis = mock.MagicMock(return_value={'items': []})
@@ -155,6 +286,111 @@ class TestApiGwRestApi(unittest.TestCase):
     ])
     self.restapi.module.exit_json.assert_called_once_with(changed=True, api='TotallyUpdated')
 
+  def test_process_request_creates_api_with_compression_and_binary_media_types(self):
+    self.restapi.module.params = {
+      'name': 'whatever', 'state': 'present', 'minimum_compression_size': 0, 'binary_media_types': ['image/png']
+    }
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value={'items': []})
+    self.restapi.client.create_rest_api = mock.MagicMock(return_value={'id': 'new'})
+    self.restapi.process_request()
+
+    self.restapi.client.create_rest_api.assert_called_once_with(
+      name='whatever', minimumCompressionSize=0, binaryMediaTypes=['image/png'])
+
+  def test_process_request_patches_only_changed_compression_and_binary_media_types(self):
+    get_response = {
+      'items': [{
+        'id': 12345,
+        'name': 'whatever',
+        'minimumCompressionSize': 512,
+        'binaryMediaTypes': ['*/*', 'image/png']
+      }]
+    }
+    self.restapi.module.params = {
+      'name': 'whatever', 'state': 'present', 'minimum_compression_size': 1024,
+      'binary_media_types': ['image/png', 'application/octet-stream']
+    }
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value=get_response)
+    self.restapi.client.update_rest_api = mock.MagicMock(return_value='TotallyUpdated')
+    self.restapi.process_request()
+
+    self.restapi.client.update_rest_api.assert_called_once_with(restApiId=12345, patchOperations=[
+        {'op': 'replace', 'path': '/minimumCompressionSize', 'value': '1024'},
+        {'op': 'add', 'path': '/binaryMediaTypes/application~1octet-stream'},
+        {'op': 'remove', 'path': '/binaryMediaTypes/*~1*'},
+    ])
+    self.restapi.module.exit_json.assert_called_once_with(changed=True, api='TotallyUpdated')
+
+  def test_process_request_disables_compression_with_negative_size(self):
+    get_response = {'items': [{'id': 12345, 'name': 'whatever', 'minimumCompressionSize': 512}]}
+    self.restapi.module.params = {'name': 'whatever', 'state': 'present', 'minimum_compression_size': -1}
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value=get_response)
+    self.restapi.client.update_rest_api = mock.MagicMock(return_value='TotallyUpdated')
+    self.restapi.process_request()
+
+    self.restapi.client.update_rest_api.assert_called_once_with(restApiId=12345, patchOperations=[
+        {'op': 'replace', 'path': '/minimumCompressionSize', 'value': ''},
+    ])
+
+  def test_process_request_leaves_matching_compression_and_binary_media_types_alone(self):
+    get_response = {
+      'items': [{'id': 12345, 'name': 'whatever', 'binaryMediaTypes': ['image/png', 'image/gif']}]
+    }
+    self.restapi.module.params = {
+      'name': 'whatever', 'state': 'present', 'minimum_compression_size': -1,
+      'binary_media_types': ['image/gif', 'image/png']
+    }
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value=get_response)
+    self.restapi.process_request()
+
+    self.assertEqual(0, self.restapi.client.update_rest_api.call_count)
+    self.restapi.module.exit_json.assert_called_once_with(changed=False, api=get_response['items'][0])
+
+  def test_process_request_fails_when_compression_size_is_too_large(self):
+    self.restapi.module.params = {'name': 'whatever', 'state': 'present', 'minimum_compression_size': 10485761}
+    self.restapi.process_request()
+
+    self.assertEqual(0, self.restapi.client.get_rest_apis.call_count)
+    self.restapi.module.fail_json.assert_called_once_with(msg='minimum_compression_size must be at most 10485760')
+
+  def test_process_request_creates_private_api_with_vpc_endpoints(self):
+    self.restapi.module.params = {
+      'name': 'whatever', 'state': 'present', 'endpoint_type': 'PRIVATE', 'vpc_endpoint_ids': ['vpce-1']
+    }
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value={'items': []})
+    self.restapi.client.create_rest_api = mock.MagicMock(return_value={'id': 'new'})
+    self.restapi.process_request()
+
+    self.restapi.client.create_rest_api.assert_called_once_with(
+      name='whatever', endpointConfiguration={'types': ['PRIVATE'], 'vpcEndpointIds': ['vpce-1']})
+
+  def test_process_request_switches_endpoint_type_of_existing_api(self):
+    get_response = {'items': [{'id': 12345, 'name': 'whatever', 'endpointConfiguration': {'types': ['EDGE']}}]}
+    self.restapi.module.params = {'name': 'whatever', 'state': 'present', 'endpoint_type': 'REGIONAL'}
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value=get_response)
+    self.restapi.client.update_rest_api = mock.MagicMock(return_value='TotallyUpdated')
+    self.restapi.process_request()
+
+    self.restapi.client.update_rest_api.assert_called_once_with(restApiId=12345, patchOperations=[
+        {'op': 'replace', 'path': '/endpointConfiguration/types/EDGE', 'value': 'REGIONAL'},
+    ])
+
+  def test_process_request_leaves_matching_endpoint_configuration_alone(self):
+    get_response = {'items': [{
+      'id': 12345, 'name': 'whatever', 'endpointConfiguration': {'types': ['PRIVATE'], 'vpcEndpointIds': ['vpce-1']}
+    }]}
+    self.restapi.module.params = {'name': 'whatever', 'state': 'present', 'endpoint_type': 'PRIVATE', 'vpc_endpoint_ids': ['vpce-1']}
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value=get_response)
+    self.restapi.process_request()
+
+    self.assertEqual(0, self.restapi.client.update_rest_api.call_count)
+
+  def test_process_request_fails_when_vpc_endpoint_ids_are_set_on_a_public_api(self):
+    self.restapi.module.params = {'name': 'whatever', 'state': 'present', 'endpoint_type': 'REGIONAL', 'vpc_endpoint_ids': ['vpce-1']}
+    self.restapi.process_request()
+
+    self.restapi.module.fail_json.assert_called_once_with(msg='vpc_endpoint_ids can only be set when endpoint_type is PRIVATE')
+
   def test_process_request_fails_when_update_rest_api_throws_exception(self):
     get_response = {
       'items': [{
@@ -214,6 +450,17 @@ class TestApiGwRestApi(unittest.TestCase):
     self.assertEqual(result, dict(
                      name=dict(required=True),
                      description=dict(required=False),
+                     minimum_compression_size=dict(required=False, type='int'),
+                     binary_media_types=dict(required=False, type='list'),
+                     endpoint_type=dict(required=False, choices=['EDGE', 'REGIONAL', 'PRIVATE']),
+                     vpc_endpoint_ids=dict(required=False, type='list'),
+                     clone_from=dict(required=False),
+                     swagger_file=dict(required=False, type='path'),
+                     swagger=dict(required=False, type='raw'),
+                     import_mode=dict(default='merge', choices=['merge', 'overwrite', 'incremental']),
+                     export_stage=dict(required=False),
+                     fail_on_warnings=dict(required=False, type='bool', default=False),
+                     lookup_cache=dict(required=False, type='path'),
                      state=dict(default='present', choices=['present', 'absent'])
     ))
 
@@ -260,6 +507,187 @@ class TestApiGwRestApi(unittest.TestCase):
     self.restapi.module.exit_json.assert_called_with(changed=True, api=ANY)
 
 
+  def test_process_request_imports_inline_definition_when_api_is_missing(self):
+    definition = {'swagger': '2.0', 'info': {'title': 'whatever'}, 'paths': {}}
+    self.restapi.module.params = {'name': 'whatever', 'state': 'present', 'swagger': definition, 'fail_on_warnings': True}
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value={'items': []})
+    self.restapi.client.import_rest_api = mock.MagicMock(return_value={'id': 'abc', 'name': 'whatever'})
+
+    self.restapi.process_request()
+
+    self.restapi.client.import_rest_api.assert_called_once_with(failOnWarnings=True, body=json.dumps(definition))
+    self.assertEqual(0, self.restapi.client.put_rest_api.call_count)
+    self.assertEqual(0, self.restapi.client.update_rest_api.call_count)
+    self.restapi.module.exit_json.assert_called_once_with(changed=True, api={'id': 'abc', 'name': 'whatever'})
+
+  def test_process_request_restores_name_when_imported_title_differs(self):
+    self.restapi.module.params = {'name': 'whatever', 'state': 'present', 'description': 'desc', 'swagger': '{"swagger": "2.0"}'}
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value={'items': []})
+    self.restapi.client.import_rest_api = mock.MagicMock(return_value={'id': 'abc', 'name': 'title'})
+    self.restapi.client.update_rest_api = mock.MagicMock(return_value={'id': 'abc', 'name': 'whatever', 'description': 'desc'})
+
+    self.restapi.process_request()
+
+    self.restapi.client.update_rest_api.assert_called_once_with(restApiId='abc', patchOperations=[
+      {'op': 'replace', 'path': '/name', 'value': 'whatever'},
+      {'op': 'replace', 'path': '/description', 'value': 'desc'},
+    ])
+    self.restapi.module.exit_json.assert_called_once_with(changed=True, api={'id': 'abc', 'name': 'whatever', 'description': 'desc'})
+
+  def test_process_request_streams_definition_file_to_put_rest_api_when_api_exists(self):
+    tmpdir = tempfile.mkdtemp()
+    self.addCleanup(shutil.rmtree, tmpdir)
+    path = os.path.join(tmpdir, 'api.json')
+    with open(path, 'w') as f:
+      f.write('{"swagger": "2.0"}')
+
+    bodies = []
+    def put_rest_api(**kwargs):
+      bodies.append((kwargs['body'], kwargs['body'].read()))
+      return {'id': 12345, 'name': 'whatever'}
+
+    self.restapi.module.params = {'name': 'whatever', 'state': 'present', 'swagger_file': path, 'import_mode': 'overwrite'}
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value={'items': [{'id': 12345, 'name': 'whatever'}]})
+    self.restapi.client.put_rest_api = mock.MagicMock(side_effect=put_rest_api)
+
+    self.restapi.process_request()
+
+    self.restapi.client.put_rest_api.assert_called_once_with(restApiId=12345, mode='overwrite', failOnWarnings=False, body=ANY)
+    self.assertEqual('{"swagger": "2.0"}', bodies[0][1])
+    self.assertTrue(bodies[0][0].closed)
+    self.assertEqual(0, self.restapi.client.import_rest_api.call_count)
+    self.restapi.module.exit_json.assert_called_once_with(changed=True, api={'id': 12345, 'name': 'whatever'})
+
+  def test_process_request_fails_when_definition_file_is_unreadable(self):
+    self.restapi.module.params = {'name': 'whatever', 'state': 'present', 'swagger_file': '/nonexistent/api.json'}
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value={'items': []})
+
+    self.restapi.process_request()
+
+    self.assertEqual(0, self.restapi.client.import_rest_api.call_count)
+    self.restapi.module.fail_json.assert_called_once_with(msg=ANY)
+    self.assertIn('Error reading OpenAPI definition', self.restapi.module.fail_json.call_args[1]['msg'])
+
+  def test_process_request_fails_when_put_rest_api_rejects_definition(self):
+    self.restapi.module.params = {'name': 'whatever', 'state': 'present', 'swagger': '{}'}
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value={'items': [{'id': 12345, 'name': 'whatever'}]})
+    self.restapi.client.put_rest_api = mock.MagicMock(
+      side_effect=ClientError({'Error': {'Code': 'BadRequestException', 'Message': 'bad'}}, 'PutRestApi'))
+
+    self.restapi.process_request()
+
+    self.restapi.client.put_rest_api.assert_called_once_with(restApiId=12345, mode='merge', failOnWarnings=False, body='{}')
+    self.assertIn('Encountered fatal error calling boto3 put_rest_api function', self.restapi.module.fail_json.call_args[1]['msg'])
+
+  def test_process_request_skips_import_when_check_mode(self):
+    self.restapi.module.check_mode = True
+    self.restapi.module.params = {'name': 'whatever', 'state': 'present', 'swagger': '{}'}
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value={'items': []})
+
+    self.restapi.process_request()
+
+    self.assertEqual(0, self.restapi.client.import_rest_api.call_count)
+    self.assertEqual(0, self.restapi.client.put_rest_api.call_count)
+    self.restapi.module.exit_json.assert_called_once_with(changed=True, api=None)
+
+  def _incremental(self, desired, exported):
+    self.restapi.module.params = {
+      'name': 'whatever', 'state': 'present', 'swagger': desired,
+      'import_mode': 'incremental', 'export_stage': 'prod'
+    }
+    self.restapi.client.get_rest_apis = mock.MagicMock(return_value={'items': [{'id': 12345, 'name': 'whatever'}]})
+    body = mock.MagicMock()
+    body.read.return_value = json.dumps(exported)
+    self.restapi.client.get_export = mock.MagicMock(return_value={'body': body})
+    self.restapi.client.put_rest_api = mock.MagicMock(return_value={'id': 12345, 'name': 'whatever'})
+
+  def test_process_request_incremental_skips_write_when_definition_is_deployed(self):
+    desired = {'swagger': '2.0', 'info': {'title': 'whatever'}, 'paths': {'/a': {'get': {'responses': {'200': {}}}}}}
+    exported = {'swagger': '2.0', 'info': {'title': 'whatever', 'version': '2019'}, 'host': 'x',
+                'paths': {'/a': {'get': {'responses': {'200': {'description': '200 response'}}}}}}
+    self._incremental(desired, exported)
+
+    self.restapi.process_request()
+
+    self.restapi.client.get_export.assert_called_once_with(
+      restApiId=12345, stageName='prod', exportType='swagger', parameters={'extensions': 'apigateway'}, accepts='application/json')
+    self.assertEqual(0, self.restapi.client.put_rest_api.call_count)
+    self.restapi.module.exit_json.assert_called_once_with(
+      changed=False, api={'id': 12345, 'name': 'whatever'}, changes={'paths': {}, 'models': [], 'settings': [], 'stale_paths': []})
+
+  def test_process_request_incremental_updates_description_when_definition_is_deployed(self):
+    desired = {'swagger': '2.0', 'paths': {'/a': {'get': {}}}}
+    self._incremental(desired, desired)
+    self.restapi.module.params['description'] = 'new description'
+    self.restapi.client.update_rest_api = mock.MagicMock(return_value={'id': 12345, 'name': 'whatever', 'description': 'new description'})
+
+    self.restapi.process_request()
+
+    self.assertEqual(0, self.restapi.client.put_rest_api.call_count)
+    self.restapi.client.update_rest_api.assert_called_once_with(
+      restApiId=12345, patchOperations=[
+        {'op': 'replace', 'path': '/name', 'value': 'whatever'},
+        {'op': 'replace', 'path': '/description', 'value': 'new description'}
+      ])
+    self.restapi.module.exit_json.assert_called_once_with(
+      changed=True, api={'id': 12345, 'name': 'whatever', 'description': 'new description'},
+      changes={'paths': {}, 'models': [], 'settings': [], 'stale_paths': []})
+
+  def test_process_request_incremental_merges_only_changed_operations(self):
+    desired = {
+      'swagger': '2.0',
+      'info': {'title': 'whatever'},
+      'paths': {
+        '/a': {'get': {'responses': {'200': {}}}, 'post': {'responses': {'201': {}}}},
+        '/b': {'get': {'responses': {'200': {}}}},
+      },
+    }
+    exported = {
+      'swagger': '2.0',
+      'info': {'title': 'whatever'},
+      'paths': {'/a': {'get': {'responses': {'200': {}}}}, '/b': {'get': {'responses': {'200': {}}}}, '/old': {}},
+    }
+    self._incremental(desired, exported)
+
+    self.restapi.process_request()
+
+    self.restapi.client.put_rest_api.assert_called_once_with(restApiId=12345, mode='merge', failOnWarnings=False, body=ANY)
+    self.assertEqual({
+      'swagger': '2.0',
+      'info': {'title': 'whatever'},
+      'paths': {'/a': {'post': {'responses': {'201': {}}}}},
+    }, json.loads(self.restapi.client.put_rest_api.call_args[1]['body']))
+    self.restapi.module.exit_json.assert_called_once_with(
+      changed=True, api={'id': 12345, 'name': 'whatever'},
+      changes={'paths': {'/a': ['post']}, 'models': [], 'settings': [], 'stale_paths': ['/old']})
+
+  def test_process_request_incremental_merges_whole_definition_when_stage_is_missing(self):
+    desired = {'swagger': '2.0', 'paths': {'/a': {'get': {}}}}
+    self._incremental(desired, {})
+    self.restapi.client.get_export.side_effect = ClientError({'Error': {'Code': 'NotFoundException', 'Message': 'Invalid stage identifier specified'}}, 'GetExport')
+
+    self.restapi.process_request()
+
+    self.assertEqual(desired, json.loads(self.restapi.client.put_rest_api.call_args[1]['body']))
+
+  def test_process_request_incremental_requires_export_stage(self):
+    self._incremental({'swagger': '2.0'}, {})
+    self.restapi.module.params['export_stage'] = None
+
+    self.restapi.process_request()
+
+    self.assertEqual(0, self.restapi.client.get_export.call_count)
+    self.restapi.module.fail_json.assert_called_once_with(msg="export_stage is required when import_mode is 'incremental'")
+
+  def test_process_request_incremental_does_not_write_in_check_mode(self):
+    self._incremental({'swagger': '2.0', 'paths': {'/a': {'get': {}}}}, {'swagger': '2.0', 'paths': {}})
+    self.restapi.module.check_mode = True
+
+    self.restapi.process_request()
+
+    self.assertEqual(0, self.restapi.client.put_rest_api.call_count)
+    self.assertTrue(self.restapi.module.exit_json.call_args[1]['changed'])
+
   @patch.object(apigw_rest_api, 'AnsibleModule')
   @patch.object(apigw_rest_api, 'ApiGwRestApi')
   def test_main(self, mock_ApiGwRestApi, mock_AnsibleModule):
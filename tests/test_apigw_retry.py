@@ -0,0 +1,141 @@
+#!/usr/bin/python
+# TODO: License goes here
+
+from module_utils.apigw_retry import RetryingClient, call_with_retry, classify_error, is_throttle_error, error_code
+import mock
+import unittest
+from botocore.exceptions import BotoCoreError, ClientError, EndpointConnectionError
+
+def client_error(code, message='msg', status=400):
+  return ClientError({'Error': {'Code': code, 'Message': message}, 'ResponseMetadata': {'HTTPStatusCode': status}}, 'op')
+
+class TestApiGwRetry(unittest.TestCase):
+
+  def test_error_code_reads_client_errors_only(self):
+    self.assertEqual('NotFoundException', error_code(client_error('NotFoundException')))
+    self.assertIsNone(error_code(BotoCoreError()))
+
+  def test_is_throttle_error(self):
+    self.assertTrue(is_throttle_error(client_error('TooManyRequestsException')))
+    self.assertFalse(is_throttle_error(client_error('ConflictException')))
+    self.assertFalse(is_throttle_error(BotoCoreError()))
+
+  def test_call_with_retry_retries_throttled_calls(self):
+    func = mock.MagicMock(side_effect=[client_error('TooManyRequestsException'), client_error('TooManyRequestsException'), 'ok'])
+    sleep = mock.MagicMock()
+
+    result = call_with_retry(func, {'a': 1}, base_delay=1.0, sleep=sleep)
+
+    self.assertEqual('ok', result)
+    self.assertEqual(3, func.call_count)
+    func.assert_called_with(a=1)
+    self.assertEqual(2, sleep.call_count)
+    first, second = [c[0][0] for c in sleep.call_args_list]
+    self.assertTrue(1.0 <= first <= 3.0)
+    self.assertTrue(1.0 <= second <= first * 3)
+
+  def test_call_with_retry_raises_last_throttle_after_max_attempts(self):
+    func = mock.MagicMock(side_effect=client_error('TooManyRequestsException'))
+    sleep = mock.MagicMock()
+
+    with self.assertRaises(ClientError):
+      call_with_retry(func, {}, max_attempts=3, sleep=sleep)
+
+    self.assertEqual(3, func.call_count)
+    self.assertEqual(2, sleep.call_count)
+
+  def test_call_with_retry_raises_other_errors_immediately(self):
+    func = mock.MagicMock(side_effect=BotoCoreError())
+    sleep = mock.MagicMock()
+
+    with self.assertRaises(BotoCoreError):
+      call_with_retry(func, {}, sleep=sleep)
+
+    self.assertEqual(1, func.call_count)
+    self.assertEqual(0, sleep.call_count)
+
+  def test_classify_error(self):
+    self.assertEqual('throttle', classify_error(client_error('TooManyRequestsException')))
+    self.assertEqual('conflict', classify_error(client_error('ConflictException', 'Unable to complete operation due to concurrent modification. Please try again later.')))
+    self.assertIsNone(classify_error(client_error('ConflictException', 'Usage plan key already exists')))
+    self.assertEqual('transient', classify_error(client_error('ServiceUnavailableException')))
+    self.assertEqual('transient', classify_error(client_error('Whatever', status=502)))
+    self.assertEqual('transient', classify_error(EndpointConnectionError(endpoint_url='https://x')))
+    self.assertIsNone(classify_error(client_error('NotFoundException', status=404)))
+    self.assertIsNone(classify_error(BotoCoreError()))
+
+  def test_call_with_retry_caps_delays_at_max_delay(self):
+    func = mock.MagicMock(side_effect=[client_error('TooManyRequestsException')] * 4 + ['ok'])
+    sleep = mock.MagicMock()
+
+    call_with_retry(func, {}, base_delay=1.0, max_delay=2.0, sleep=sleep)
+
+    for c in sleep.call_args_list:
+      self.assertTrue(1.0 <= c[0][0] <= 2.0)
+
+  def test_call_with_retry_stops_retrying_at_the_deadline(self):
+    func = mock.MagicMock(side_effect=client_error('ServiceUnavailableException'))
+    sleep = mock.MagicMock()
+    clock = mock.MagicMock(side_effect=[100.0, 100.0, 104.5])
+
+    with self.assertRaises(ClientError):
+      call_with_retry(func, {}, base_delay=1.0, max_delay=1.0, deadline=5.0, sleep=sleep, clock=clock)
+
+    self.assertEqual(2, func.call_count)
+    self.assertEqual(1, sleep.call_count)
+
+  def test_call_with_retry_reports_each_retry(self):
+    throttle = client_error('TooManyRequestsException')
+    func = mock.MagicMock(side_effect=[throttle, 'ok'])
+    on_retry = mock.MagicMock()
+
+    call_with_retry(func, {}, sleep=mock.MagicMock(), on_retry=on_retry)
+
+    on_retry.assert_called_once_with(throttle)
+
+  def test_retrying_client_retries_and_counts_api_calls(self):
+    client = mock.MagicMock()
+    client.get_rest_api.side_effect = [client_error('TooManyRequestsException'), client_error('TooManyRequestsException'), {'id': 'a'}]
+    wrapped = RetryingClient(client, sleep=mock.MagicMock())
+
+    self.assertEqual({'id': 'a'}, wrapped.get_rest_api(restApiId='a'))
+
+    client.get_rest_api.assert_called_with(restApiId='a')
+    self.assertEqual({'get_rest_api': 2}, wrapped.retry_counts())
+    self.assertIs(client.meta, wrapped.meta)
+
+  def test_call_with_retry_does_not_retry_retrying_client_calls_again(self):
+    client = mock.MagicMock()
+    client.create_usage_plan_key.side_effect = client_error('TooManyRequestsException')
+    wrapped = RetryingClient(client, max_attempts=2, sleep=mock.MagicMock())
+
+    with self.assertRaises(ClientError):
+      call_with_retry(wrapped.create_usage_plan_key, {'keyId': 'k'}, sleep=mock.MagicMock())
+
+    self.assertEqual(2, client.create_usage_plan_key.call_count)
+
+  def test_retrying_client_paces_every_attempt_with_the_limiter(self):
+    client = mock.MagicMock()
+    client.put_method.side_effect = [client_error('TooManyRequestsException'), {}]
+    limiter = mock.MagicMock()
+    wrapped = RetryingClient(client, limiter=limiter, sleep=mock.MagicMock())
+
+    wrapped.put_method(restApiId='a')
+
+    limiter.acquire.assert_has_calls([mock.call('put_method'), mock.call('put_method')])
+    self.assertEqual(2, limiter.acquire.call_count)
+
+  def test_retrying_client_holds_the_write_lock_during_each_attempt(self):
+    client = mock.MagicMock()
+    lock = mock.MagicMock()
+    client.put_method.side_effect = lambda **kwargs: self.assertEqual(1, lock.hold.return_value.__enter__.call_count)
+    wrapped = RetryingClient(client, write_lock=lock)
+
+    wrapped.put_method(restApiId='a', resourceId='r')
+
+    lock.hold.assert_called_once_with('put_method', {'restApiId': 'a', 'resourceId': 'r'})
+    self.assertEqual(1, lock.hold.return_value.__exit__.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,13 +8,13 @@ from mock import patch
 from mock import create_autospec
 from mock import ANY
 import unittest
-import boto
-from botocore.exceptions import BotoCoreError
+from botocore.exceptions import BotoCoreError, ClientError
 
 class TestApiGwUsagePlan(unittest.TestCase):
 
   def setUp(self):
     self.module = mock.MagicMock()
+    self.module.params = {}
     self.module.check_mode = False
     self.module.exit_json = mock.MagicMock()
     self.module.fail_json = mock.MagicMock()
@@ -33,7 +33,7 @@ class TestApiGwUsagePlan(unittest.TestCase):
     }
     reload(apigw_usage_plan)
 
-  def test_boto_module_not_found(self):
+  def test_legacy_boto_module_not_required(self):
     # Setup Mock Import Function
     import __builtin__ as builtins
     real_import = builtins.__import__
@@ -46,7 +46,7 @@ class TestApiGwUsagePlan(unittest.TestCase):
       reload(apigw_usage_plan)
       ApiGwUsagePlan(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.assertEqual(0, self.module.fail_json.call_count)
 
   def test_boto3_module_not_found(self):
     # Setup Mock Import Function
@@ -61,12 +61,12 @@ class TestApiGwUsagePlan(unittest.TestCase):
       reload(apigw_usage_plan)
       ApiGwUsagePlan(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.module.fail_json.assert_called_with(msg='boto3 is required for this module')
 
-  @patch.object(apigw_usage_plan, 'boto3')
-  def test_boto3_client_properly_instantiated(self, mock_boto):
+  @patch('boto3.client')
+  def test_boto3_client_properly_instantiated(self, mock_client):
     ApiGwUsagePlan(self.module)
-    mock_boto.client.assert_called_once_with('apigateway')
+    mock_client.assert_called_once_with('apigateway')
 
   @patch.object(ApiGwUsagePlan, '_update_usage_plan', return_value=('hi', 'mom'))
   def test_process_request_calls_get_usage_plans_and_stores_result_when_invoked(self, m):
@@ -81,7 +81,7 @@ class TestApiGwUsagePlan(unittest.TestCase):
     self.usage_plan.process_request()
 
     self.assertEqual(resp['items'][1], self.usage_plan.me)
-    self.usage_plan.client.get_usage_plans.assert_called_once_with()
+    self.usage_plan.client.get_usage_plans.assert_called_once_with(limit=500)
 
   def test_process_request_stores_None_result_when_not_found_in_get_usage_plans_result(self):
     resp = {
@@ -95,14 +95,14 @@ class TestApiGwUsagePlan(unittest.TestCase):
     self.usage_plan.process_request()
 
     self.assertEqual(None, self.usage_plan.me)
-    self.usage_plan.client.get_usage_plans.assert_called_once_with()
+    self.usage_plan.client.get_usage_plans.assert_called_once_with(limit=500)
 
   def test_process_request_calls_fail_json_when_get_usage_plans_raises_exception(self):
     self.usage_plan.client.get_usage_plans = mock.MagicMock(side_effect=BotoCoreError())
 
     self.usage_plan.process_request()
 
-    self.usage_plan.client.get_usage_plans.assert_called_once_with()
+    self.usage_plan.client.get_usage_plans.assert_called_once_with(limit=500)
     self.usage_plan.module.fail_json.assert_called_once_with(
       msg='Error when getting usage_plans from boto3: An unspecified error occurred'
     )
@@ -368,15 +368,71 @@ class TestApiGwUsagePlan(unittest.TestCase):
     )
 
   @patch('library.apigw_usage_plan.ApiGwUsagePlan._create_patches', return_value=['patches!'])
-  @patch.object(ApiGwUsagePlan, '_retrieve_usage_plan', side_effect=[{'id': 'hi'}, 'second call'])
-  def test_process_request_returns_result_of_find_when_update_is_successful(self, m, mcp):
+  @patch.object(ApiGwUsagePlan, '_retrieve_usage_plan', return_value={'id': 'hi'})
+  def test_process_request_returns_result_of_update_when_update_is_successful(self, m, mcp):
+    self.usage_plan.client.update_usage_plan = mock.MagicMock(return_value='updated')
     self.usage_plan.process_request()
 
     self.usage_plan.client.update_usage_plan.assert_called_once_with(
       usagePlanId='hi',
       patchOperations=['patches!']
     )
-    self.usage_plan.module.exit_json.assert_called_once_with(changed=True, usage_plan='second call')
+    self.assertEqual(1, m.call_count)
+    self.usage_plan.module.exit_json.assert_called_once_with(changed=True, usage_plan='updated')
+
+  def test_process_request_stops_paging_at_first_name_match(self):
+    self.usage_plan.module.params['lookup_key_id'] = 'key1'
+    self.usage_plan.client.get_usage_plans = mock.MagicMock(return_value={
+      'items': [{'id': 'a', 'name': 'other'}, {'id': 'b', 'name': 'testify'}], 'position': 'more'
+    })
+    self.usage_plan.process_request()
+
+    self.usage_plan.client.get_usage_plans.assert_called_once_with(keyId='key1', limit=500)
+    self.assertEqual('b', self.usage_plan.me['id'])
+
+  def test_process_request_finds_plan_not_linked_to_lookup_key_instead_of_creating_it(self):
+    self.usage_plan.module.params['lookup_key_id'] = 'key1'
+    self.usage_plan.client.get_usage_plans = mock.MagicMock(side_effect=[
+      {'items': [{'id': 'a', 'name': 'other'}]},
+      {'items': [{'id': 'b', 'name': 'testify'}]},
+    ])
+    self.usage_plan.process_request()
+
+    self.usage_plan.client.get_usage_plans.assert_has_calls([mock.call(keyId='key1', limit=500), mock.call(limit=500)])
+    self.assertEqual('b', self.usage_plan.me['id'])
+    self.assertEqual(0, self.usage_plan.client.create_usage_plan.call_count)
+
+  @patch('library.apigw_usage_plan.ApiGwUsagePlan._create_patches', return_value=[])
+  def test_process_request_reads_plan_by_id_and_renames_it(self, mcp):
+    self.usage_plan.module.params['usage_plan_id'] = 'plan1'
+    self.usage_plan.client.get_usage_plan = mock.MagicMock(return_value={'id': 'plan1', 'name': 'old', 'ResponseMetadata': {}})
+    self.usage_plan.process_request()
+
+    self.assertEqual(0, self.usage_plan.client.get_usage_plans.call_count)
+    self.usage_plan.client.get_usage_plan.assert_called_once_with(usagePlanId='plan1')
+    self.usage_plan.client.update_usage_plan.assert_called_once_with(
+      usagePlanId='plan1',
+      patchOperations=[{'op': 'replace', 'path': '/name', 'value': 'testify'}]
+    )
+
+  def test_process_request_fails_when_usage_plan_id_is_not_found(self):
+    self.usage_plan.module.params['usage_plan_id'] = 'plan1'
+    self.usage_plan.client.get_usage_plan = mock.MagicMock(
+      side_effect=ClientError({'Error': {'Code': 'NotFoundException', 'Message': 'NotFoundException'}}, 'GetUsagePlan'))
+    self.usage_plan.process_request()
+
+    self.assertEqual(0, self.usage_plan.client.create_usage_plan.call_count)
+    self.usage_plan.module.fail_json.assert_called_once_with(msg='Unable to find usage_plan plan1')
+
+  def test_process_request_skips_delete_when_usage_plan_id_is_not_found(self):
+    self.usage_plan.module.params['usage_plan_id'] = 'plan1'
+    self.usage_plan.module.params['state'] = 'absent'
+    self.usage_plan.client.get_usage_plan = mock.MagicMock(
+      side_effect=ClientError({'Error': {'Code': 'NotFoundException', 'Message': 'NotFoundException'}}, 'GetUsagePlan'))
+    self.usage_plan.process_request()
+
+    self.assertEqual(0, self.usage_plan.client.delete_usage_plan.call_count)
+    self.usage_plan.module.exit_json.assert_called_once_with(changed=False, usage_plan=None)
 
   @patch('library.apigw_usage_plan.ApiGwUsagePlan._create_patches', return_value=['patches!'])
   @patch.object(ApiGwUsagePlan, '_retrieve_usage_plan', return_value={'something': 'here'})
@@ -392,6 +448,8 @@ class TestApiGwUsagePlan(unittest.TestCase):
     self.assertIsInstance(result, dict)
     self.assertEqual(result, dict(
                      name=dict(required=True),
+                     usage_plan_id=dict(required=False),
+                     lookup_key_id=dict(required=False),
                      description=dict(required=False, default=''),
                      api_stages=dict(
                        type='list',
@@ -8,13 +8,13 @@ from mock import patch
 from mock import create_autospec
 from mock import ANY
 import unittest
-import boto
-from botocore.exceptions import BotoCoreError
+from botocore.exceptions import BotoCoreError, ClientError
 
 class TestApiGwUsagePlanKey(unittest.TestCase):
 
   def setUp(self):
     self.module = mock.MagicMock()
+    self.module.params = {}
     self.module.check_mode = False
     self.module.exit_json = mock.MagicMock()
     self.module.fail_json = mock.MagicMock()
@@ -28,7 +28,7 @@ class TestApiGwUsagePlanKey(unittest.TestCase):
     }
     reload(apigw_usage_plan_key)
 
-  def test_boto_module_not_found(self):
+  def test_legacy_boto_module_not_required(self):
     # Setup Mock Import Function
     import __builtin__ as builtins
     real_import = builtins.__import__
@@ -41,7 +41,7 @@ class TestApiGwUsagePlanKey(unittest.TestCase):
       reload(apigw_usage_plan_key)
       ApiGwUsagePlanKey(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.assertEqual(0, self.module.fail_json.call_count)
 
   def test_boto3_module_not_found(self):
     # Setup Mock Import Function
@@ -56,12 +56,12 @@ class TestApiGwUsagePlanKey(unittest.TestCase):
       reload(apigw_usage_plan_key)
       ApiGwUsagePlanKey(self.module)
 
-    self.module.fail_json.assert_called_with(msg='boto and boto3 are required for this module')
+    self.module.fail_json.assert_called_with(msg='boto3 is required for this module')
 
-  @patch.object(apigw_usage_plan_key, 'boto3')
-  def test_boto3_client_properly_instantiated(self, mock_boto):
+  @patch('boto3.client')
+  def test_boto3_client_properly_instantiated(self, mock_client):
     ApiGwUsagePlanKey(self.module)
-    mock_boto.client.assert_called_once_with('apigateway')
+    mock_client.assert_called_once_with('apigateway')
 
   def test_process_request_calls_get_usage_plan_keys_and_stores_result_when_invoked(self):
     resp = {
@@ -75,7 +75,7 @@ class TestApiGwUsagePlanKey(unittest.TestCase):
     self.usage_plan_key.process_request()
 
     self.assertEqual(resp['items'][1], self.usage_plan_key.me)
-    self.usage_plan_key.client.get_usage_plan_keys.assert_called_once_with(usagePlanId='upid')
+    self.usage_plan_key.client.get_usage_plan_keys.assert_called_once_with(usagePlanId='upid', limit=500)
 
   def test_process_request_stores_None_result_when_not_found_in_get_usage_plan_keys_result(self):
     resp = {
@@ -89,14 +89,14 @@ class TestApiGwUsagePlanKey(unittest.TestCase):
     self.usage_plan_key.process_request()
 
     self.assertEqual(None, self.usage_plan_key.me)
-    self.usage_plan_key.client.get_usage_plan_keys.assert_called_once_with(usagePlanId='upid')
+    self.usage_plan_key.client.get_usage_plan_keys.assert_called_once_with(usagePlanId='upid', limit=500)
 
   def test_process_request_calls_fail_json_when_get_usage_plan_keys_raises_exception(self):
     self.usage_plan_key.client.get_usage_plan_keys = mock.MagicMock(side_effect=BotoCoreError())
 
     self.usage_plan_key.process_request()
 
-    self.usage_plan_key.client.get_usage_plan_keys.assert_called_once_with(usagePlanId='upid')
+    self.usage_plan_key.client.get_usage_plan_keys.assert_called_once_with(usagePlanId='upid', limit=500)
     self.usage_plan_key.module.fail_json.assert_called_once_with(
       msg='Error when getting usage_plan_keys from boto3: An unspecified error occurred'
     )
@@ -223,12 +223,110 @@ class TestApiGwUsagePlanKey(unittest.TestCase):
     self.usage_plan_key.module.exit_json.assert_called_once_with(changed=False, usage_plan_key='something')
 
 
+  def test_process_request_stops_paging_at_matching_key(self):
+    self.usage_plan_key.client.get_usage_plan_keys = mock.MagicMock(return_value={'items': [{'id': 'akid'}], 'position': 'more'})
+
+    self.usage_plan_key.process_request()
+
+    self.assertEqual({'id': 'akid'}, self.usage_plan_key.me)
+    self.assertEqual(1, self.usage_plan_key.client.get_usage_plan_keys.call_count)
+
+  def _bulk(self, existing, **params):
+    self.usage_plan_key.module.params = dict({
+      'usage_plan_id': 'upid', 'key_type': 'API_KEY', 'state': 'present', 'concurrency': 4, 'rate_limit': 0,
+    }, **params)
+    self.usage_plan_key.client.get_usage_plan_keys = mock.MagicMock(side_effect=[
+      {'items': [{'id': k} for k in existing[:2]], 'position': 'p'},
+      {'items': [{'id': k} for k in existing[2:]]},
+    ])
+    self.usage_plan_key.process_request()
+
+  def test_process_request_bulk_streams_existing_keys_and_adds_missing_ones(self):
+    self._bulk(['a', 'b', 'c'], api_key_ids=['d', 'b', 'e'])
+
+    self.usage_plan_key.client.get_usage_plan_keys.assert_has_calls([
+      mock.call(usagePlanId='upid', limit=500),
+      mock.call(usagePlanId='upid', limit=500, position='p'),
+    ])
+    self.assertEqual(0, self.usage_plan_key.client.delete_usage_plan_key.call_count)
+    self.assertEqual(
+      [mock.call(usagePlanId='upid', keyId='d', keyType='API_KEY'), mock.call(usagePlanId='upid', keyId='e', keyType='API_KEY')],
+      sorted(self.usage_plan_key.client.create_usage_plan_key.call_args_list)
+    )
+    self.usage_plan_key.module.exit_json.assert_called_once_with(changed=True, usage_plan_keys=dict(added=['d', 'e'], removed=[]))
+
+  def test_process_request_bulk_purges_keys_missing_from_the_list(self):
+    self._bulk(['a', 'b', 'c'], api_key_ids=['b', 'c'], purge_keys=True)
+
+    self.usage_plan_key.client.delete_usage_plan_key.assert_called_once_with(usagePlanId='upid', keyId='a')
+    self.assertEqual(0, self.usage_plan_key.client.create_usage_plan_key.call_count)
+    self.usage_plan_key.module.exit_json.assert_called_once_with(changed=True, usage_plan_keys=dict(added=[], removed=['a']))
+
+  def test_process_request_bulk_removes_only_listed_keys_when_absent(self):
+    self._bulk(['a', 'b', 'c'], api_key_ids=['c', 'z'], state='absent')
+
+    self.usage_plan_key.client.delete_usage_plan_key.assert_called_once_with(usagePlanId='upid', keyId='c')
+    self.assertEqual(0, self.usage_plan_key.client.create_usage_plan_key.call_count)
+    self.usage_plan_key.module.exit_json.assert_called_once_with(changed=True, usage_plan_keys=dict(added=[], removed=['c']))
+
+  def test_process_request_bulk_reports_no_change_when_keys_match(self):
+    self._bulk(['a', 'b'], api_key_ids=['b', 'a'])
+
+    self.assertEqual(0, self.usage_plan_key.client.create_usage_plan_key.call_count)
+    self.usage_plan_key.module.exit_json.assert_called_once_with(changed=False, usage_plan_keys=dict(added=[], removed=[]))
+
+  def test_process_request_bulk_skips_writes_in_check_mode(self):
+    self.usage_plan_key.module.check_mode = True
+    self._bulk(['a'], api_key_ids=['b'], purge_keys=True)
+
+    self.assertEqual(0, self.usage_plan_key.client.create_usage_plan_key.call_count)
+    self.assertEqual(0, self.usage_plan_key.client.delete_usage_plan_key.call_count)
+    self.usage_plan_key.module.exit_json.assert_called_once_with(changed=True, usage_plan_keys=dict(added=['b'], removed=['a']))
+
+  def test_process_request_bulk_reports_failures(self):
+    conflict = ClientError({'Error': {'Code': 'ConflictException'}}, 'CreateUsagePlanKey')
+    self.usage_plan_key.client.create_usage_plan_key = mock.MagicMock(side_effect=[{}, conflict])
+
+    self._bulk([], api_key_ids=['a', 'b'], concurrency=1)
+
+    self.assertEqual(2, self.usage_plan_key.client.create_usage_plan_key.call_count)
+    self.usage_plan_key.module.fail_json.assert_called_once_with(
+      msg='Error when creating usage_plan_keys via boto3: 1 of 2 calls failed, first for key b: {}'.format(conflict),
+      changed=True, usage_plan_keys=dict(added=['a'], removed=[])
+    )
+    self.assertEqual(0, self.usage_plan_key.module.exit_json.call_count)
+
+  def test_process_request_bulk_reports_no_change_when_every_delete_fails(self):
+    self.usage_plan_key.client.delete_usage_plan_key = mock.MagicMock(side_effect=BotoCoreError())
+
+    self._bulk(['a'], api_key_ids=['b'], purge_keys=True)
+
+    self.assertEqual(0, self.usage_plan_key.client.create_usage_plan_key.call_count)
+    self.usage_plan_key.module.fail_json.assert_called_once_with(
+      msg=ANY, changed=False, usage_plan_keys=dict(added=[], removed=[])
+    )
+
+  @patch.object(apigw_usage_plan_key, 'create_client')
+  def test_rate_limit_sets_the_usage_plan_key_budget_of_the_client(self, mock_create_client):
+    self.module.params = {'usage_plan_id': 'upid', 'api_key_ids': ['a'], 'rate_limit': 5.0}
+    apigw_usage_plan_key.ApiGwUsagePlanKey(self.module)
+    mock_create_client.assert_called_once_with(self.module, rate_limits={'*_usage_plan_key': 5.0})
+
+    mock_create_client.reset_mock()
+    self.module.params['rate_limit'] = 0
+    apigw_usage_plan_key.ApiGwUsagePlanKey(self.module)
+    mock_create_client.assert_called_once_with(self.module, rate_limits=None)
+
   def test_define_argument_spec(self):
     result = ApiGwUsagePlanKey._define_module_argument_spec()
     self.assertIsInstance(result, dict)
     self.assertEqual(result, dict(
                      usage_plan_id=dict(required=True),
-                     api_key_id=dict(required=True),
+                     api_key_id=dict(required=False),
+                     api_key_ids=dict(required=False, type='list'),
+                     purge_keys=dict(required=False, type='bool', default=False),
+                     concurrency=dict(required=False, type='int', default=4),
+                     rate_limit=dict(required=False, type='float', default=10),
                      key_type=dict(required=False, default='API_KEY', choices=['API_KEY']),
                      state=dict(default='present', choices=['present', 'absent']),
     ))
@@ -0,0 +1,37 @@
+#!/usr/bin/python
+# TODO: License goes here
+
+from module_utils.apigw_usage_plan_spec import create_args, create_patches, is_default_value
+import unittest
+
+class TestApiGwUsagePlanSpec(unittest.TestCase):
+
+  def test_is_default_value(self):
+    self.assertTrue(is_default_value('quota_limit', -1))
+    self.assertTrue(is_default_value('quota_limit', None))
+    self.assertFalse(is_default_value('quota_offset', 0))
+    self.assertTrue(is_default_value('quota_period', ''))
+    self.assertFalse(is_default_value('description', 'd'))
+
+  def test_create_args_nests_throttle_quota_and_stages(self):
+    self.assertEqual(dict(
+      name='p',
+      description='d',
+      throttle={'burstLimit': 1, 'rateLimit': 2.0},
+      apiStages=[{'apiId': 'api', 'stage': 'live'}],
+    ), create_args(dict(
+      name='p', description='d', throttle_burst_limit=1, throttle_rate_limit=2.0,
+      quota_limit=-1, quota_offset=-1, quota_period='', api_stages=[{'rest_api_id': 'api', 'stage': 'live'}],
+    )))
+
+  def test_create_patches_tolerates_sparse_specs(self):
+    me = {'id': 'x', 'quota': {'limit': 1, 'period': 'DAY'}, 'apiStages': [{'apiId': 'api', 'stage': 'live'}]}
+
+    self.assertEqual([
+      {'op': 'remove', 'path': '/quota'},
+      {'op': 'remove', 'path': '/apiStages', 'value': 'api:live'},
+    ], create_patches({'name': 'x'}, me))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+#!/usr/bin/python
+# TODO: License goes here
+
+import library.apigw_usage_plans as apigw_usage_plans
+from library.apigw_usage_plans import ApiGwUsagePlans
+import mock
+from mock import patch
+import unittest
+from botocore.exceptions import BotoCoreError, ClientError
+
+class TestApiGwUsagePlans(unittest.TestCase):
+
+  def setUp(self):
+    self.module = mock.MagicMock()
+    self.module.params = {}
+    self.module.check_mode = False
+    self.module.exit_json = mock.MagicMock()
+    self.module.fail_json = mock.MagicMock()
+    self.usage_plans  = ApiGwUsagePlans(self.module)
+    self.usage_plans.client = mock.MagicMock()
+    self.usage_plans.client.get_usage_plans = mock.MagicMock(side_effect=[
+      {'items': [
+        {'id': 'id-same', 'name': 'same', 'description': 'd', 'throttle': {'burstLimit': 10, 'rateLimit': 5.0}},
+        {'id': 'id-changed', 'name': 'changed', 'throttle': {'burstLimit': 10, 'rateLimit': 5.0}},
+      ], 'position': 'p'},
+      {'items': [
+        {'id': 'id-gone', 'name': 'gone', 'apiStages': [{'apiId': 'api', 'stage': 'live'}]},
+        {'id': 'id-dupe', 'name': 'same'},
+      ]},
+    ])
+    # The pool threads share these mocks, so they must exist before it starts
+    self.usage_plans.client.create_usage_plan = mock.MagicMock(return_value={'id': 'id-new'})
+    self.usage_plans.client.update_usage_plan = mock.MagicMock()
+    self.usage_plans.client.delete_usage_plan = mock.MagicMock()
+    self.usage_plans.module.params = {
+      'usage_plans': [
+        {'name': 'same', 'description': 'd', 'throttle_burst_limit': 10, 'throttle_rate_limit': 5.0},
+        {'name': 'changed', 'throttle_burst_limit': 20, 'throttle_rate_limit': 5.0},
+        {'name': 'new', 'quota_limit': 100, 'quota_period': 'DAY', 'quota_offset': 0},
+        {'name': 'gone', 'state': 'absent'},
+        {'name': 'never-there', 'state': 'absent'},
+      ],
+      'concurrency': 4,
+    }
+    reload(apigw_usage_plans)
+
+  def test_legacy_boto_module_not_required(self):
+    # Setup Mock Import Function
+    import __builtin__ as builtins
+    real_import = builtins.__import__
+
+    def mock_import(name, *args):
+      if name == 'boto': raise ImportError
+      return real_import(name, *args)
+
+    with mock.patch('__builtin__.__import__', side_effect=mock_import):
+      reload(apigw_usage_plans)
+      ApiGwUsagePlans(self.module)
+
+    self.assertEqual(0, self.module.fail_json.call_count)
+
+  def test_boto3_module_not_found(self):
+    # Setup Mock Import Function
+    import __builtin__ as builtins
+    real_import = builtins.__import__
+
+    def mock_import(name, *args):
+      if name == 'boto3': raise ImportError
+      return real_import(name, *args)
+
+    with mock.patch('__builtin__.__import__', side_effect=mock_import):
+      reload(apigw_usage_plans)
+      ApiGwUsagePlans(self.module)
+
+    self.module.fail_json.assert_called_with(msg='boto3 is required for this module')
+
+  @patch('boto3.client')
+  def test_boto3_client_properly_instantiated(self, mock_client):
+    ApiGwUsagePlans(self.module)
+    mock_client.assert_called_once_with('apigateway')
+
+  def test_process_request_lists_plans_once_and_applies_each_change(self):
+    self.usage_plans.process_request()
+
+    self.assertEqual(2, self.usage_plans.client.get_usage_plans.call_count)
+    self.usage_plans.client.create_usage_plan.assert_called_once_with(
+      name='new', quota={'limit': 100, 'period': 'DAY', 'offset': 0}
+    )
+    self.usage_plans.client.update_usage_plan.assert_has_calls([
+      mock.call(usagePlanId='id-changed', patchOperations=[{'op': 'replace', 'path': '/throttle/burstLimit', 'value': '20'}]),
+      mock.call(usagePlanId='id-gone', patchOperations=[{'op': 'remove', 'path': '/apiStages', 'value': 'api:live'}]),
+    ], any_order=True)
+    self.assertEqual(2, self.usage_plans.client.update_usage_plan.call_count)
+    self.usage_plans.client.delete_usage_plan.assert_called_once_with(usagePlanId='id-gone')
+    self.usage_plans.module.exit_json.assert_called_once_with(changed=True, usage_plans=[
+      dict(name='same', id='id-same', action='unchanged', patches=[]),
+      dict(name='changed', id='id-changed', action='updated', patches=[{'op': 'replace', 'path': '/throttle/burstLimit', 'value': '20'}]),
+      dict(name='new', id='id-new', action='created', patches=[]),
+      dict(name='gone', id='id-gone', action='deleted', patches=[]),
+      dict(name='never-there', id=None, action='unchanged', patches=[]),
+    ])
+
+  def test_process_request_reports_changes_without_writing_in_check_mode(self):
+    self.usage_plans.module.check_mode = True
+    self.usage_plans.process_request()
+
+    self.assertEqual(0, self.usage_plans.client.create_usage_plan.call_count)
+    self.assertEqual(0, self.usage_plans.client.update_usage_plan.call_count)
+    self.assertEqual(0, self.usage_plans.client.delete_usage_plan.call_count)
+    report = self.usage_plans.module.exit_json.call_args[1]['usage_plans']
+    self.assertEqual(['unchanged', 'updated', 'created', 'deleted', 'unchanged'], [r['action'] for r in report])
+
+  def test_process_request_replies_false_when_nothing_changes(self):
+    self.usage_plans.module.params['usage_plans'] = self.usage_plans.module.params['usage_plans'][:1]
+    self.usage_plans.process_request()
+
+    self.assertEqual(0, self.usage_plans.client.update_usage_plan.call_count)
+    self.usage_plans.module.exit_json.assert_called_once_with(changed=False, usage_plans=[
+      dict(name='same', id='id-same', action='unchanged', patches=[]),
+    ])
+
+  def test_process_request_reports_failed_plans_and_keeps_going(self):
+    self.usage_plans.client.create_usage_plan = mock.MagicMock(side_effect=BotoCoreError())
+    self.usage_plans.process_request()
+
+    self.usage_plans.client.delete_usage_plan.assert_called_once_with(usagePlanId='id-gone')
+    self.assertEqual(0, self.usage_plans.module.exit_json.call_count)
+    kwargs = self.usage_plans.module.fail_json.call_args[1]
+    self.assertEqual('Error when reconciling usage_plans via boto3: 1 of 3 plans failed: new', kwargs['msg'])
+    self.assertEqual('An unspecified error occurred', kwargs['usage_plans'][2]['error'])
+    self.assertTrue(kwargs['changed'])
+    self.assertEqual('deleted', kwargs['usage_plans'][3]['action'])
+    self.assertNotIn('error', kwargs['usage_plans'][3])
+
+  def test_process_request_reports_no_change_when_every_write_fails(self):
+    self.usage_plans.module.params['usage_plans'] = [{'name': 'new'}]
+    self.usage_plans.client.create_usage_plan = mock.MagicMock(side_effect=BotoCoreError())
+    self.usage_plans.process_request()
+
+    self.assertFalse(self.usage_plans.module.fail_json.call_args[1]['changed'])
+
+  def test_process_request_calls_fail_json_when_get_usage_plans_raises_exception(self):
+    self.usage_plans.client.get_usage_plans = mock.MagicMock(side_effect=BotoCoreError())
+    self.usage_plans.process_request()
+
+    self.usage_plans.module.fail_json.assert_called_once_with(
+      msg='Error when getting usage_plans from boto3: An unspecified error occurred'
+    )
+
+  def test_process_request_validates_specs(self):
+    for (plans, msg) in [
+      ([{'description': 'no name'}], 'Every usage_plans entry needs a name'),
+      ([{'name': 'a', 'throttle': 1}], 'Invalid usage plan a: Unsupported parameters: throttle'),
+      ([{'name': 'a'}, {'name': 'a'}], 'usage_plans lists a more than once'),
+      ([{'name': 'a', 'quota_period': 'YEAR'}], 'Invalid usage plan a: value of quota_period must be one of: , DAY, WEEK, MONTH, got: YEAR'),
+    ]:
+      self.usage_plans.module.fail_json.reset_mock()
+      self.usage_plans.module.params['usage_plans'] = plans
+      self.usage_plans.process_request()
+      self.usage_plans.module.fail_json.assert_called_once_with(msg=msg)
+
+    self.assertEqual(0, self.usage_plans.client.get_usage_plans.call_count)
+
+  def test_process_request_converts_spec_values_before_comparing(self):
+    self.usage_plans.module.params['usage_plans'] = [
+      {'name': 'same', 'description': 'd', 'throttle_burst_limit': '10', 'throttle_rate_limit': '5'},
+    ]
+    self.usage_plans.process_request()
+
+    self.assertEqual(0, self.usage_plans.client.update_usage_plan.call_count)
+    self.usage_plans.module.exit_json.assert_called_once_with(changed=False, usage_plans=[
+      dict(name='same', id='id-same', action='unchanged', patches=[]),
+    ])
+
+  def test_process_request_rejects_spec_values_of_the_wrong_type(self):
+    self.usage_plans.module.params['usage_plans'] = [{'name': 'a', 'quota_limit': 'lots'}]
+    self.usage_plans.process_request()
+
+    self.assertIn('Invalid usage plan a: argument quota_limit is of type', self.usage_plans.module.fail_json.call_args[1]['msg'])
+    self.assertEqual(0, self.usage_plans.client.get_usage_plans.call_count)
+
+  def test_define_argument_spec(self):
+    result = ApiGwUsagePlans._define_module_argument_spec()
+    self.assertIsInstance(result, dict)
+    self.assertEqual(result, dict(
+                     usage_plans=dict(required=True, type='list'),
+                     concurrency=dict(required=False, type='int', default=4),
+    ))
+
+  @patch.object(apigw_usage_plans, 'AnsibleModule')
+  @patch.object(apigw_usage_plans, 'ApiGwUsagePlans')
+  def test_main(self, mock_ApiGwUsagePlans, mock_AnsibleModule):
+    mock_ApiGwUsagePlans_instance      = mock.MagicMock()
+    mock_AnsibleModule_instance     = mock.MagicMock()
+    mock_ApiGwUsagePlans.return_value  = mock_ApiGwUsagePlans_instance
+    mock_AnsibleModule.return_value = mock_AnsibleModule_instance
+
+    apigw_usage_plans.main()
+
+    mock_ApiGwUsagePlans.assert_called_once_with(mock_AnsibleModule_instance)
+    assert mock_ApiGwUsagePlans_instance.process_request.call_count == 1
+
+
+if __name__ == '__main__':
+    unittest.main()